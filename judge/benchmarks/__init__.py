@@ -0,0 +1,8 @@
+"""
+Synthetic benchmarks of rule engine throughput and latency.
+
+Run with:
+    python -m judge.benchmarks --records 10000 --output results.jsonl
+"""
+from judge.benchmarks.synthetic import build_engine, generate_records, generate_dataframe
+from judge.benchmarks.runner import run_benchmark, save_results
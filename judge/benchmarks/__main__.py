@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Run a synthetic benchmark from the command line:
+    python -m judge.benchmarks --records 10000 --tables 5 --rules 50 --output results.jsonl
+"""
+import argparse
+import json
+
+from judge.benchmarks.runner import run_benchmark, save_results
+
+
+###############################################################################
+#function to run benchmark
+###############################################################################
+
+def main(args=None):
+    """
+    DESCRIPTION:
+    This function is the command line entry point of the benchmarks. The
+    results are printed as JSON and added to the output file when supplied.
+
+    PARAMETERS:
+    args (list; optional; default:Nonetype) - The command line arguments.
+
+    OUTPUT/RESULT:
+    The result of this function will be the results of the benchmark.
+    """
+    parser = argparse.ArgumentParser(prog='python -m judge.benchmarks', description='Benchmark synthetic rule engines.')
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--modes', nargs='+', choices=['dict', 'dataframe'], default=['dict', 'dataframe'])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--attributes', type=int, default=10)
+    parser.add_argument('--expressions', type=int, default=2)
+    parser.add_argument('--tables', type=int, default=5)
+    parser.add_argument('--rules', type=int, default=20)
+    parser.add_argument('--conditions', type=int, default=3)
+    parser.add_argument('--hit-rate', type=float, default=0.1)
+    parser.add_argument('--collections', type=int, default=2)
+    parser.add_argument('--run-all', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='file to add the results to as a line of JSON')
+    args = parser.parse_args(args)
+    results = run_benchmark(records=args.records, modes=args.modes, batch_size=args.batch_size, seed=args.seed,
+                            attributes=args.attributes, expressions=args.expressions, tables=args.tables,
+                            rules=args.rules, conditions=args.conditions, hit_rate=args.hit_rate,
+                            collections=args.collections, run_all=args.run_all)
+    print(json.dumps(results, indent=2))
+    if args.output is not None:
+        save_results(results, args.output)
+    return results
+
+if __name__ == '__main__':
+    main()
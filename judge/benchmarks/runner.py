@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput and latency measurements of synthetic rule engines.
+"""
+import datetime
+import json
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from judge.benchmarks.synthetic import build_engine, generate_records
+
+
+###############################################################################
+#function to summarize latencies
+###############################################################################
+
+def summarize(latencies, records, seconds):
+    """
+    DESCRIPTION:
+    This function is to summarize the latencies of a benchmark.
+
+    PARAMETERS:
+    latencies (list; required) - The latency of each call in seconds.
+
+    records (int; required) - The number of records scored.
+
+    seconds (float; required) - The total time spent scoring.
+
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of the records per
+    second and the p50, p99 and maximum latency in milliseconds.
+    """
+    latencies = np.array(latencies) * 1000
+    return {'records':records,
+            'seconds':seconds,
+            'records_per_second':records / seconds if seconds > 0 else None,
+            'p50_ms':float(np.percentile(latencies, 50)) if len(latencies) > 0 else None,
+            'p99_ms':float(np.percentile(latencies, 99)) if len(latencies) > 0 else None,
+            'max_ms':float(latencies.max()) if len(latencies) > 0 else None}
+
+###############################################################################
+#functions to measure rule engine
+###############################################################################
+
+def measure_dict(engine, records, warmup=100):
+    """
+    DESCRIPTION:
+    This function is to measure a rule engine which expects a dictionary.
+    The latency of each record is measured.
+
+    PARAMETERS:
+    engine (rule engine; required) - The rule engine.
+
+    records (list; required) - A list of records as dictionaries.
+
+    warmup (int; optional; default:100) - The number of records scored before
+    measuring.
+
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of the measurements,
+    along with the rate records hit each decision table.
+    """
+    for record in records[:warmup]:
+        engine.run(record)
+    latencies = []
+    table_hits = 0
+    tables = 0
+    start = time.perf_counter()
+    for record in records:
+        record_start = time.perf_counter()
+        output = engine.run(record)
+        latencies.append(time.perf_counter() - record_start)
+        for result in (output or {}).values():
+            table_hits = table_hits + result['collection_hits']
+            tables = tables + result['collection_tables']
+    seconds = time.perf_counter() - start
+    results = summarize(latencies, len(records), seconds)
+    results['hit_rate'] = table_hits / tables if tables > 0 else None
+    return results
+
+def measure_dataframe(engine, records, batch_size=1000, warmup=1):
+    """
+    DESCRIPTION:
+    This function is to measure a rule engine which expects a dataframe. The
+    records are scored in batches and the latency of each batch is measured.
+
+    PARAMETERS:
+    engine (rule engine; required) - The rule engine.
+
+    records (list; required) - A list of records as dictionaries.
+
+    batch_size (int; optional; default:1000) - The number of records in each
+    batch.
+
+    warmup (int; optional; default:1) - The number of batches scored before
+    measuring.
+
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of the measurements.
+    """
+    batches = [pd.DataFrame(records[i:i + batch_size]) for i in range(0, len(records), batch_size)]
+    for batch in batches[:warmup]:
+        engine.run(batch)
+    latencies = []
+    start = time.perf_counter()
+    for batch in batches:
+        batch_start = time.perf_counter()
+        engine.run(batch)
+        latencies.append(time.perf_counter() - batch_start)
+    seconds = time.perf_counter() - start
+    results = summarize(latencies, len(records), seconds)
+    results['batch_size'] = batch_size
+    return results
+
+###############################################################################
+#function to run benchmark
+###############################################################################
+
+def run_benchmark(records=10000, modes=('dict', 'dataframe'), batch_size=1000, seed=0, **scale):
+    """
+    DESCRIPTION:
+    This function is to build synthetic rule engines and measure their
+    throughput and latency.
+
+    PARAMETERS:
+    records (int; optional; default:10000) - The number of records scored in
+    each mode.
+
+    modes (list; optional; default:('dict', 'dataframe')) - The modes to
+    measure. 'dict' scores one record at a time and 'dataframe' scores
+    batches of records.
+
+    batch_size (int; optional; default:1000) - The number of records in each
+    batch in 'dataframe' mode.
+
+    seed (int; optional; default:0) - The seed of the random number
+    generators.
+
+    scale (optional) - The scale of the synthetic rule engine, passed to
+    'build_engine': attributes, expressions, tables, rules, conditions,
+    hit_rate, collections and run_all.
+
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of the environment, the
+    scale and the measurements of each mode, which can be saved as JSON.
+    """
+    data = generate_records(records, scale.get('attributes', 10), seed + 1)
+    results = []
+    for mode in modes:
+        build_start = time.perf_counter()
+        engine = build_engine(dataframe=mode == 'dataframe', seed=seed, **scale)
+        build_seconds = time.perf_counter() - build_start
+        if mode == 'dataframe':
+            result = measure_dataframe(engine, data, batch_size)
+        else:
+            result = measure_dict(engine, data)
+        result['mode'] = mode
+        result['build_seconds'] = build_seconds
+        results.append(result)
+    return {'timestamp':datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'environment':environment(),
+            'scale':dict(scale, records=records, seed=seed),
+            'results':results}
+
+###############################################################################
+#function to describe environment
+###############################################################################
+
+def environment():
+    """
+    DESCRIPTION:
+    This function is to describe the environment a benchmark runs in so
+    results of different versions can be compared.
+
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of versions and the
+    machine.
+    """
+    try:
+        from importlib.metadata import version
+        judge_version = version('judge')
+    except Exception:
+        judge_version = None
+    return {'judge':judge_version,
+            'python':platform.python_version(),
+            'pandas':pd.__version__,
+            'numpy':np.__version__,
+            'machine':platform.machine(),
+            'processor':platform.processor(),
+            'system':platform.system()}
+
+###############################################################################
+#function to save results
+###############################################################################
+
+def save_results(results, filename):
+    """
+    DESCRIPTION:
+    This function is to save the results of benchmarks as JSON lines, adding
+    to the file if it exists so results of each version can be kept together.
+
+    PARAMETERS:
+    results (dict; required) - The results of 'run_benchmark'.
+
+    filename (str; required) - The file to save the results to.
+
+    OUTPUT/RESULT:
+    The result of this function is the results added to the file.
+    """
+    with open(filename, 'a') as f:
+        f.write(json.dumps(results) + '\n')
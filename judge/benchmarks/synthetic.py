@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic rule engines and records for benchmarking.
+
+Engines are built the same way users build them: create_rule_engine,
+add_attribute, add_expression, decision table CSVs in the 'decision_tables'
+directory and configuration tables for each collection.
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+
+import pandas as pd
+
+from judge import rule_engine
+
+
+###############################################################################
+#range of attribute values
+###############################################################################
+
+#attribute values are integers from 0 up to but not including value_range
+value_range = 1000
+
+###############################################################################
+#function to get pass rate of condition
+###############################################################################
+
+def condition_pass_rate(rules, conditions, hit_rate):
+    """
+    DESCRIPTION:
+    This function is to get the rate each condition needs to pass at for a
+    decision table to hit at the hit rate, when every rule has the same number
+    of conditions on independent attributes.
+
+    PARAMETERS:
+    rules (int; required) - The number of rules in each decision table.
+
+    conditions (int; required) - The number of conditions in each rule.
+
+    hit_rate (float; required) - The rate records should hit each decision
+    table.
+
+    OUTPUT/RESULT:
+    The result of this function will be the pass rate of each condition.
+    """
+    rule_rate = 1 - (1 - hit_rate) ** (1 / rules)
+    return rule_rate ** (1 / conditions)
+
+###############################################################################
+#function to create decision table
+###############################################################################
+
+def create_decision_table(variables, rules, conditions, hit_rate, rnd):
+    """
+    DESCRIPTION:
+    This function is to create a synthetic decision table with range
+    conditions, such as 'X >= 120 and X < 480', on the variables.
+
+    PARAMETERS:
+    variables (list; required) - The attributes and expressions the
+    conditions can use.
+
+    rules (int; required) - The number of rules.
+
+    conditions (int; required) - The number of conditions in each rule.
+
+    hit_rate (float; required) - The rate records should hit the decision
+    table.
+
+    rnd (random; required) - The random number generator.
+
+    OUTPUT/RESULT:
+    The result of this function will be the decision table as a dataframe.
+    """
+    conditions = min(conditions, len(variables))
+    columns = rnd.sample(variables, min(len(variables), conditions * 2))
+    width = max(int(round(condition_pass_rate(rules, conditions, hit_rate) * value_range)), 1)
+    table = []
+    for rule in range(rules):
+        row = {column:None for column in columns}
+        for column in rnd.sample(columns, conditions):
+            lower = rnd.randrange(0, value_range - width + 1)
+            row[column] = 'X >= ' + str(lower) + ' and X < ' + str(lower + width)
+        row['Rule Name'] = 'rule_' + str(rule)
+        row['Rule Score'] = rnd.randint(1, 10)
+        table.append(row)
+    return pd.DataFrame(table, columns=columns + ['Rule Name', 'Rule Score'])
+
+###############################################################################
+#function to build synthetic rule engine
+###############################################################################
+
+def build_engine(directory=None, attributes=10, expressions=2, tables=5, rules=20, conditions=3,
+                 hit_rate=0.1, collections=2, run_all=False, dataframe=False, seed=0):
+    """
+    DESCRIPTION:
+    This function is to build a synthetic rule engine. Attributes 'a0', 'a1',
+    ... are read from the top level of each record, expressions 'e0', 'e1',
+    ... combine two attributes, and decision tables of range conditions on the
+    attributes and expressions are split across the collections.
+
+    PARAMETERS:
+    directory (str; optional; default:Nonetype) - The directory to create the
+    rule engine in. A temporary directory is created when not supplied.
+
+    attributes (int; optional; default:10) - The number of attributes.
+
+    expressions (int; optional; default:2) - The number of expressions.
+
+    tables (int; optional; default:5) - The number of decision tables.
+
+    rules (int; optional; default:20) - The number of rules in each decision
+    table.
+
+    conditions (int; optional; default:3) - The number of conditions in each
+    rule.
+
+    hit_rate (float; optional; default:0.1) - The rate records hit each
+    decision table.
+
+    collections (int; optional; default:2) - The number of collections.
+
+    run_all (bool; optional; default:False) - Whether or not decision tables
+    execute all rules.
+
+    dataframe (bool; optional; default:False) - Whether or not the rule engine
+    expects a dataframe.
+
+    seed (int; optional; default:0) - The seed of the random number generator.
+
+    OUTPUT/RESULT:
+    The result of this function will be the rule engine object.
+    """
+    rnd = random.Random(seed)
+    directory = directory if directory is not None else tempfile.mkdtemp(prefix='judge_benchmark_')
+    variables = ['a' + str(i) for i in range(attributes)] + ['e' + str(i) for i in range(expressions)]
+    #rule engine setup prints each step
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = rule_engine.create_rule_engine(directory, name='benchmark', dataframe=dataframe)
+        engine._verbose = False
+        for i in range(attributes):
+            engine.add_attribute('a' + str(i), ['a' + str(i)], int, default=0)
+        for i in range(expressions):
+            left, right = rnd.sample(range(attributes), 2) if attributes > 1 else (0, 0)
+            engine.add_expression('e' + str(i), "data['e" + str(i) + "'] = (data['a" + str(left) + "'] + data['a"
+                                  + str(right) + "']) % " + str(value_range))
+        table_names = []
+        for i in range(tables):
+            table_name = 'table_' + str(i) + '.csv'
+            create_decision_table(variables, rules, conditions, hit_rate, rnd).to_csv(
+                os.path.join(directory, 'decision_tables', table_name), index=False)
+            table_names.append(table_name)
+        engine.import_decision_tables()
+        for i in range(collections):
+            engine.add_collection('collection_' + str(i), i + 1)
+            collection_tables = table_names[i::collections]
+            pd.DataFrame({'Decision Table Filename':collection_tables,
+                          'Priority':list(range(1, len(collection_tables) + 1)),
+                          'Active':[True] * len(collection_tables),
+                          'Execute All Rules':[run_all] * len(collection_tables),
+                          'Score Override':[None] * len(collection_tables),
+                          'Manual Flag':[None] * len(collection_tables)}
+                         ).to_csv(engine._collections[-1]._directory + 'configuration_table.csv', index=False)
+        engine.import_configurations()
+    return engine
+
+###############################################################################
+#functions to generate records
+###############################################################################
+
+def generate_records(n, attributes=10, seed=1):
+    """
+    DESCRIPTION:
+    This function is to generate synthetic records for a synthetic rule
+    engine.
+
+    PARAMETERS:
+    n (int; required) - The number of records.
+
+    attributes (int; optional; default:10) - The number of attributes of the
+    rule engine.
+
+    seed (int; optional; default:1) - The seed of the random number generator.
+
+    OUTPUT/RESULT:
+    The result of this function will be a list of dictionaries.
+    """
+    rnd = random.Random(seed)
+    names = ['a' + str(i) for i in range(attributes)]
+    return [{name:rnd.randrange(value_range) for name in names} for record in range(n)]
+
+def generate_dataframe(n, attributes=10, seed=1):
+    """
+    DESCRIPTION:
+    This function is to generate a synthetic dataframe for a synthetic rule
+    engine.
+
+    PARAMETERS:
+    n (int; required) - The number of rows.
+
+    attributes (int; optional; default:10) - The number of attributes of the
+    rule engine.
+
+    seed (int; optional; default:1) - The seed of the random number generator.
+
+    OUTPUT/RESULT:
+    The result of this function will be a pandas dataframe.
+    """
+    return pd.DataFrame(generate_records(n, attributes, seed))
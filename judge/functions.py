@@ -1,6 +1,491 @@
 """
 - This file is intended to store custom functions to be utilized by the rule engine.
 - These functions can be utilized within the rule engine components, such as, decision tables, data attributes, and elsewhere.
-- These functions are imported whenever the rule engine is imported with the module name 'function' and can be called like a function from any other module
-    Example: function.length(string)
-"""
\ No newline at end of file
+- These functions are imported whenever the rule engine is imported with the module name 'functions' and can be called like a function from any other module
+    Example: functions.length(string)
+- Each function has a scalar implementation, called with a single value, and a vectorized implementation, called with a
+  pandas series of values. Rule engines expecting a dataframe apply the vectorized implementation to whole columns when
+  extracting attributes. Both implementations return Nonetype for null values, Nonetype or NaN, except 'coalesce'.
+- Pandas and NumPy are only imported by the vectorized implementations, so scoring dictionaries does not import them.
+- Custom functions with both implementations are added with the 'register' decorator
+    Example:
+        @functions.register()
+        def double(value):
+            return value * 2
+
+        @double.vectorize
+        def double(series):
+            return series * 2
+"""
+import bisect
+import datetime
+import functools
+import math
+import re
+
+
+###############################################################################
+#dual function class
+###############################################################################
+
+class dual_function():
+    """
+    DESCRIPTION:
+    This class creates 'dual function' objects, which are called like the
+    scalar function they wrap and hold a vectorized implementation of the
+    same function. The vectorized implementation takes a pandas series in
+    place of the value, along with the same parameters, and returns a series
+    of the same length. Dual functions are pickled by name, like functions.
+
+    ATTRIBUTES:
+    scalar (function; required) - The scalar implementation.
+
+    vectorized (function; optional; default:Nonetype) - The vectorized
+    implementation.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, scalar, vectorized=None):
+        functools.update_wrapper(self, scalar)
+        self._scalar = scalar
+        self.vectorized = vectorized
+
+    ###########################################################################
+    #function to call scalar implementation
+    ###########################################################################
+
+    def __call__(self, value, *args, **kwargs):
+        return self._scalar(value, *args, **kwargs)
+
+    ###########################################################################
+    #function to set vectorized implementation
+    ###########################################################################
+
+    def vectorize(self, vectorized):
+        """
+        DESCRIPTION:
+        This function is used as a decorator to set the vectorized
+        implementation of the function. The dual function is returned, so the
+        vectorized implementation can be defined with the same name.
+
+        PARAMETERS:
+        vectorized (function; required) - The vectorized implementation.
+
+        OUTPUT/RESULT:
+        The result of this function will be the dual function.
+        """
+        self.vectorized = vectorized
+        return self
+
+    ###########################################################################
+    #functions to represent and pickle dual function
+    ###########################################################################
+
+    def __repr__(self):
+        return '<function ' + self.__qualname__ + ' at ' + hex(id(self)) + '>'
+
+    def __reduce__(self):
+        return self.__qualname__
+
+###############################################################################
+#function registry
+###############################################################################
+
+#registered dual functions by name
+registry = {}
+
+def register(vectorized=None):
+    """
+    DESCRIPTION:
+    This function is a decorator to register a scalar function as a dual
+    function. The vectorized implementation is supplied here or set
+    afterwards with the 'vectorize' decorator of the dual function. Functions
+    registered outside of this module are also added to it, so they can be
+    called as 'functions.<name>' in decision tables and expressions.
+
+    PARAMETERS:
+    vectorized (function; optional; default:Nonetype) - The vectorized
+    implementation.
+
+    OUTPUT/RESULT:
+    The result of this function will be a decorator which returns the dual
+    function.
+    """
+    def decorator(scalar):
+        function = dual_function(scalar, vectorized)
+        name = function.__name__
+        previous = registry.get(name)
+        if previous is not None and previous.__module__ != function.__module__:
+            raise ValueError("function '" + name + "' is already registered by module '" + previous.__module__ + "'")
+        if function.__module__ != __name__:
+            #functions registered again, e.g. redefined in a notebook, replace 
+            #the function decision tables and expressions call
+            if previous is None and name in globals():
+                raise ValueError("name '" + name + "' is already used by module '" + __name__ + "'")
+            globals()[name] = function
+        registry[name] = function
+        return function
+    return decorator
+
+###############################################################################
+#function to check null values
+###############################################################################
+
+def is_null(value):
+    """
+    DESCRIPTION:
+    This function is to check whether a single value is Nonetype, NaN or a
+    missing datetime, such as NaT.
+
+    PARAMETERS:
+    value (varies; required) - The value to check.
+
+    OUTPUT/RESULT:
+    The result of this function will be a boolean.
+    """
+    return value is None or (isinstance(value, (float, datetime.datetime)) and value != value)
+
+###############################################################################
+#function to apply vectorized implementation to values which are not null
+###############################################################################
+
+def map_not_null(series, transform):
+    """
+    DESCRIPTION:
+    This function is to apply a vectorized transformation to the values of a
+    series which are not null, keeping null values as Nonetype, the same as
+    the scalar implementations. Null values returned by the transformation
+    are Nonetype as well.
+
+    PARAMETERS:
+    series (series; required) - The values.
+
+    transform (function; required) - The transformation, which takes and 
+    returns a series of the values which are not null.
+
+    OUTPUT/RESULT:
+    The result of this function will be a series of objects with the same 
+    index as the values.
+    """
+    import numpy as np
+    import pandas as pd
+    not_null = series.notna().to_numpy()
+    output = np.empty(len(series), dtype=object)
+    output[:] = None
+    if not_null.any():
+        transformed = transform(series[not_null])
+        output[not_null] = transformed.astype(object).where(transformed.notna(), None).to_numpy(dtype=object)
+    return pd.Series(output, index=series.index, dtype=object)
+
+###############################################################################
+#string functions
+###############################################################################
+
+@register()
+def upper(value):
+    """
+    DESCRIPTION:
+    This function is to convert a value to an upper case string.
+
+    PARAMETERS:
+    value (varies; required) - The value to convert.
+
+    OUTPUT/RESULT:
+    The result of this function will be a string.
+    """
+    if is_null(value):
+        return None
+    return str(value).upper()
+
+@upper.vectorize
+def upper(series):
+    return map_not_null(series, lambda values: values.astype(str).str.upper())
+
+@register()
+def lower(value):
+    """
+    DESCRIPTION:
+    This function is to convert a value to a lower case string.
+
+    PARAMETERS:
+    value (varies; required) - The value to convert.
+
+    OUTPUT/RESULT:
+    The result of this function will be a string.
+    """
+    if is_null(value):
+        return None
+    return str(value).lower()
+
+@lower.vectorize
+def lower(series):
+    return map_not_null(series, lambda values: values.astype(str).str.lower())
+
+@register()
+def strip(value, characters=None):
+    """
+    DESCRIPTION:
+    This function is to remove leading and trailing characters from a value
+    as a string.
+
+    PARAMETERS:
+    value (varies; required) - The value to strip.
+
+    characters (str; optional; default:Nonetype) - The characters to remove.
+    Whitespace is removed when not supplied.
+
+    OUTPUT/RESULT:
+    The result of this function will be a string.
+    """
+    if is_null(value):
+        return None
+    return str(value).strip(characters)
+
+@strip.vectorize
+def strip(series, characters=None):
+    return map_not_null(series, lambda values: values.astype(str).str.strip(characters))
+
+@register()
+def length(value):
+    """
+    DESCRIPTION:
+    This function is to get the length of a string, or of a list or other
+    sized value.
+
+    PARAMETERS:
+    value (str/list; required) - The value to measure.
+
+    OUTPUT/RESULT:
+    The result of this function will be an integer.
+    """
+    if is_null(value):
+        return None
+    return len(value)
+
+@length.vectorize
+def length(series):
+    def lengths(values):
+        output = values.str.len()
+        if output.isna().any():
+            #values without a length raise an error, the same as 'len'
+            raise TypeError('object has no len()')
+        return output
+    return map_not_null(series, lengths)
+
+@register()
+def substring(value, start=0, end=None):
+    """
+    DESCRIPTION:
+    This function is to get part of a value as a string, the same as slicing
+    the string.
+
+    PARAMETERS:
+    value (varies; required) - The value to take part of.
+
+    start (int; optional; default:0) - The position to start at.
+
+    end (int; optional; default:Nonetype) - The position to end before. The
+    rest of the string is kept when not supplied.
+
+    OUTPUT/RESULT:
+    The result of this function will be a string.
+    """
+    if is_null(value):
+        return None
+    return str(value)[start:end]
+
+@substring.vectorize
+def substring(series, start=0, end=None):
+    return map_not_null(series, lambda values: values.astype(str).str.slice(start, end))
+
+@register()
+def concat(value, prefix='', suffix=''):
+    """
+    DESCRIPTION:
+    This function is to add a prefix and suffix to a value as a string.
+
+    PARAMETERS:
+    value (varies; required) - The value to add to.
+
+    prefix (str; optional; default:'') - The string added before the value.
+
+    suffix (str; optional; default:'') - The string added after the value.
+
+    OUTPUT/RESULT:
+    The result of this function will be a string.
+    """
+    if is_null(value):
+        return None
+    return prefix + str(value) + suffix
+
+@concat.vectorize
+def concat(series, prefix='', suffix=''):
+    return map_not_null(series, lambda values: prefix + values.astype(str) + suffix)
+
+@register()
+def regex_extract(value, pattern, group=0):
+    """
+    DESCRIPTION:
+    This function is to extract the first match of a regular expression from
+    a value as a string.
+
+    PARAMETERS:
+    value (varies; required) - The value to search.
+
+    pattern (str; required) - The regular expression.
+
+    group (int/str; optional; default:0) - The number or name of the group
+    to extract. The whole match is extracted by default.
+
+    OUTPUT/RESULT:
+    The result of this function will be a string, or Nonetype when the
+    regular expression does not match.
+    """
+    if is_null(value):
+        return None
+    match = re.search(pattern, str(value))
+    return match.group(group) if match is not None else None
+
+@regex_extract.vectorize
+def regex_extract(series, pattern, group=0):
+    #the pattern is compiled once, keeping its inline flags
+    compiled = re.compile(pattern)
+    if group == 0:
+        #'extract' only returns groups, so the whole match is searched for
+        def whole_match(value):
+            match = compiled.search(value)
+            return match.group(0) if match is not None else None
+        return map_not_null(series, lambda values: values.astype(str).map(whole_match))
+    #columns are named after named groups and numbered from 0 otherwise
+    if isinstance(group, int):
+        if group < 0 or group > compiled.groups:
+            raise IndexError('no such group')
+        names = {number:name for name, number in compiled.groupindex.items()}
+        column = names.get(group, group - 1)
+    elif group in compiled.groupindex:
+        column = group
+    else:
+        raise IndexError('no such group')
+    return map_not_null(series, lambda values: values.astype(str).str.extract(compiled, expand=True)[column])
+
+###############################################################################
+#date functions
+###############################################################################
+
+#parts of a date 'date_part' can get
+date_parts = ('year', 'month', 'day', 'hour', 'minute', 'second', 'weekday')
+
+@register()
+def date_part(value, part='year', format=None):
+    """
+    DESCRIPTION:
+    This function is to get part of a date, such as the year or the day of
+    the week.
+
+    PARAMETERS:
+    value (str/datetime; required) - The date, as a datetime or a string.
+
+    part (str; optional; default:'year') - The part of the date: 'year',
+    'month', 'day', 'hour', 'minute', 'second' or 'weekday', where Monday is
+    0.
+
+    format (str; optional; default:Nonetype) - The format of date strings,
+    as used by 'strptime'. Strings are read as ISO 8601 dates when not
+    supplied.
+
+    OUTPUT/RESULT:
+    The result of this function will be an integer.
+    """
+    if part not in date_parts:
+        raise ValueError("part must be one of " + ', '.join(date_parts))
+    if is_null(value):
+        return None
+    if not isinstance(value, (datetime.date, datetime.datetime)):
+        value = datetime.datetime.strptime(str(value), format) if format is not None else datetime.datetime.fromisoformat(str(value))
+    return value.weekday() if part == 'weekday' else getattr(value, part)
+
+@date_part.vectorize
+def date_part(series, part='year', format=None):
+    if part not in date_parts:
+        raise ValueError("part must be one of " + ', '.join(date_parts))
+    import pandas as pd
+    def parts(values):
+        dates = pd.to_datetime(values, format=format if format is not None else 'ISO8601')
+        return dates.dt.weekday if part == 'weekday' else getattr(dates.dt, part)
+    return map_not_null(series, parts)
+
+###############################################################################
+#numeric functions
+###############################################################################
+
+@register()
+def bucket(value, bins, labels=None, right=False):
+    """
+    DESCRIPTION:
+    This function is to find the bucket a number falls in.
+
+    PARAMETERS:
+    value (int/float; required) - The number.
+
+    bins (list; required) - The edges of the buckets in ascending order.
+
+    labels (list; optional; default:Nonetype) - The label of each bucket,
+    one fewer than the edges. The position of the bucket is returned when
+    not supplied.
+
+    right (bool; optional; default:False) - Whether or not buckets include
+    their right edge instead of their left edge.
+
+    OUTPUT/RESULT:
+    The result of this function will be the position or label of the bucket,
+    or Nonetype when the number is outside of the buckets.
+    """
+    if is_null(value):
+        return None
+    value = float(value)
+    position = (bisect.bisect_left(bins, value) if right == True else bisect.bisect_right(bins, value)) - 1
+    if position < 0 or position >= len(bins) - 1 or math.isnan(value):
+        return None
+    return labels[position] if labels is not None else position
+
+@bucket.vectorize
+def bucket(series, bins, labels=None, right=False):
+    import numpy as np
+    import pandas as pd
+    values = series.astype(float).to_numpy()
+    positions = np.searchsorted(np.asarray(bins, dtype=float), values, side='left' if right == True else 'right') - 1
+    inside = (positions >= 0) & (positions < len(bins) - 1) & ~np.isnan(values)
+    output = np.empty(len(values), dtype=object)
+    output[:] = None
+    output[inside] = np.asarray(labels, dtype=object)[positions[inside]] if labels is not None else positions[inside].tolist()
+    return pd.Series(output, index=series.index, dtype=object)
+
+###############################################################################
+#null functions
+###############################################################################
+
+@register()
+def coalesce(value, default=None):
+    """
+    DESCRIPTION:
+    This function is to replace a null value, Nonetype or NaN, with a
+    default value. Useful after functions which return Nonetype, such as
+    'regex_extract'.
+
+    PARAMETERS:
+    value (varies; required) - The value.
+
+    default (varies; optional; default:Nonetype) - The value used in place of
+    a null value.
+
+    OUTPUT/RESULT:
+    The result of this function will be the value, or the default value when
+    the value is null.
+    """
+    return default if is_null(value) else value
+
+@coalesce.vectorize
+def coalesce(series, default=None):
+    return series.astype(object).where(series.notna(), default)
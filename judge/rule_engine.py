@@ -4,22 +4,93 @@ Created on Wed Mar 11 13:47:21 2020
 
 @author: tjones727
 """
-#for dataframe handling
-import pandas as pd
 #for file and directory handling
 import os
 #for string replacement
 import re
 #for apply rules
 import operator
-from functools import reduce
+from functools import reduce, partial
 from ast import literal_eval
+import inspect
+#for vectorized decision tables
+import ast
+import numbers
 #for saving objects
 import _pickle as pickle
+#for snapshots
+import marshal
+import mmap
+import struct
+import types
+import io
+import datetime
+import importlib.util
+#for import cache
+import hashlib
+#for parallel batches and streams
+import time
+import json
+import itertools
+import heapq
+import bisect
+import array
+import copyreg
+#for hot reload
+import threading
+import copy
+#for tracing and errors
+import logging
+import sys
+from collections import deque, OrderedDict
+from collections.abc import Mapping
 #external functions for rule engine
 from judge import functions
 
 
+###############################################################################
+#lazy module class
+###############################################################################
+
+class lazy_module():
+    """
+    DESCRIPTION:
+    This class creates 'lazy module' objects which import a module the first
+    time one of its attributes is used. Pandas and NumPy are only needed for
+    dataframes, importing CSV files and large decision table indexes, so a 
+    rule engine scoring dictionaries starts without importing them.
+    
+    ATTRIBUTES:
+    module_name (str; required) - The name of the module.
+    """
+    def __init__(self, module_name):
+        self._module_name = module_name
+
+    def __getattr__(self, attribute):
+        value = getattr(importlib.import_module(self._module_name), attribute)
+        #later uses of the attribute do not go through __getattr__
+        setattr(self, attribute, value)
+        return value
+
+#for dataframe handling
+pd = lazy_module('pandas')
+np = lazy_module('numpy')
+
+def is_dataframe(obj):
+    """
+    DESCRIPTION:
+    This function is to check whether an object is a pandas dataframe without
+    importing pandas.
+    
+    PARAMETERS:
+    obj (object; required) - The object to check.
+    
+    OUTPUT/RESULT:
+    The result of this function is True if the object is a dataframe.
+    """
+    return 'pandas' in sys.modules and isinstance(obj, sys.modules['pandas'].DataFrame)
+
+
 ###############################################################################
 #attribute class
 ###############################################################################
@@ -51,8 +122,15 @@ class attribute():
     should be a dictionary of parameters and their values. If there are no 
     parameters for the function a Nonetype value should be supplied.
         EXAMPLE (with no parameters): {functions.upper:None}
-        EXAMPLE (with parameters supplied): {functions.concat: {'key':'price'}} 
+        EXAMPLE (with parameters supplied): {functions.concat: {'suffix':'_price'}} 
+    
+    function_chain (function chain) - The functions of the function 
+    dictionary with their parameters bound, or Nonetype without a function
+    dictionary. Parameters which do not match a function raise an error when
+    the attribute is created.
     """
+    __slots__ = ('_name', '_attribute_path', '_dtype', '_default', '_priority', '_function_dictionary', '_function_chain')
+
     ###########################################################################
     #initiate self
     ###########################################################################
@@ -64,6 +142,129 @@ class attribute():
         self._default = default
         self._priority = priority
         self._function_dictionary = function_dictionary
+        self._function_chain = function_chain(function_dictionary) if function_dictionary != None else None
+
+    ###########################################################################
+    #functions to convert and pickle attribute
+    ###########################################################################
+
+    def to_dict(self):
+        """
+        DESCRIPTION:
+        This function is used to get the attributes of the attribute as a 
+        dictionary.
+
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of the attributes.
+        """
+        return {name:getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __getstate__(self):
+        state = self.to_dict()
+        state.pop('_function_chain', None)
+        return state
+
+    def __setstate__(self, state):
+        set_slots(self, state)
+        try:
+            self._function_chain = function_chain(self._function_dictionary) if self._function_dictionary != None else None
+        except Exception:
+            #attributes saved with invalid parameters record the error when applied
+            self._function_chain = self._function_dictionary
+
+###############################################################################
+#function chain class
+###############################################################################
+
+class function_chain():
+    """
+    DESCRIPTION:
+    This class creates 'function chain' objects utilized by the attribute 
+    class. The functions of a function dictionary are bound to their 
+    parameters a single time, when the attribute is created, so the 
+    parameters are not parsed again for every value. The parameters are 
+    checked against the signature of each function, so parameters a function
+    does not accept raise an error when the chain is created instead of when
+    attributes are extracted.
+    
+    ATTRIBUTES:
+    function_dictionary (dict; required) - A dictionary of functions and 
+    their parameters, or Nonetype for functions without parameters.
+    
+    functions (tuple) - A tuple with a tuple for each function of the 
+    function, its parameters and the function bound to its parameters.
+    
+    vectorized (tuple) - The vectorized implementations of the functions 
+    bound to their parameters, used to apply the chain to whole columns of a
+    dataframe, or Nonetype when any function does not have one. Functions 
+    have a vectorized implementation when they are dual functions from the 
+    'functions' module, or have a 'vectorized' attribute of their own.
+    """
+    __slots__ = ('_functions', '_vectorized')
+
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, function_dictionary):
+        functions = []
+        vectorized = []
+        for function, parameters in function_dictionary.items():
+            if not callable(function):
+                raise TypeError("function '" + str(function) + "' is not callable")
+            if parameters == None:
+                functions.append((function, None, function))
+                vectorized.append(getattr(function, 'vectorized', None))
+                continue
+            parameters = literal_eval(str(parameters))
+            if not isinstance(parameters, dict):
+                raise TypeError("parameters of function '" + getattr(function, '__name__', str(function)) 
+                                + "' must be a dictionary")
+            try:
+                signature = inspect.signature(function)
+            except (TypeError, ValueError):
+                #builtins without a signature are checked when applied
+                signature = None
+            if signature is not None:
+                try:
+                    signature.bind(None, **parameters)
+                except TypeError as e:
+                    raise TypeError("parameters of function '" + getattr(function, '__name__', str(function)) 
+                                    + "' do not match its signature: " + str(e))
+            functions.append((function, parameters, partial(function, **parameters)))
+            vectorized.append(partial(function.vectorized, **parameters) if getattr(function, 'vectorized', None) is not None else None)
+        self._functions = tuple(functions)
+        self._vectorized = tuple(vectorized) if None not in vectorized else None
+
+    ###########################################################################
+    #function to apply chain
+    ###########################################################################
+
+    def __call__(self, value):
+        for function, parameters, bound in self._functions:
+            value = bound(value)
+        return value
+
+    ###########################################################################
+    #function to apply vectorized chain
+    ###########################################################################
+
+    def apply_vectorized(self, series):
+        """
+        DESCRIPTION:
+        This function is used to apply the vectorized implementations of the
+        functions to a series of values.
+
+        PARAMETERS:
+        series (series; required) - The values to apply the functions to.
+
+        OUTPUT/RESULT:
+        The result of this function will be a list of the output values, with
+        null values as Nonetype.
+        """
+        for bound in self._vectorized:
+            series = bound(series)
+        return series.astype(object).where(series.notna(), None).tolist()
 
 ###############################################################################
 #expression class
@@ -84,7 +285,13 @@ class expression():
     priority (int or float; optional; default:Nonetype) - The priority used 
     when applying expressions. The expression with the lowest priority will be 
     applied first.
+    
+    code (code) - The expression compiled to a code object. The expression is
+    executed against a namespace holding the attributes as 'data' and the 
+    'functions' module.
     """
+    __slots__ = ('_name', '_expression', '_priority', '_code')
+
     ###########################################################################
     #initiate self
     ###########################################################################
@@ -92,7 +299,166 @@ class expression():
         self._name = name
         self._expression = expression
         self._priority = priority
+        self._code = compile(expression, '<expression:' + str(name) + '>', 'exec')
+
+    ###########################################################################
+    #functions to convert and pickle expression without code object
+    ###########################################################################
+
+    def to_dict(self):
+        """
+        DESCRIPTION:
+        This function is used to get the attributes of the expression as a 
+        dictionary.
+
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of the attributes.
+        """
+        return {name:getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __getstate__(self):
+        state = self.to_dict()
+        state.pop('_code', None)
+        return state
+
+    def __setstate__(self, state):
+        set_slots(self, state)
+        self._code = compile(self._expression, '<expression:' + str(self._name) + '>', 'exec')
         
+###############################################################################
+#lazy attributes class
+###############################################################################
+
+class lazy_attributes(dict):
+    """
+    DESCRIPTION:
+    This class creates 'lazy attributes' objects, the dictionary of the 
+    attributes of a single record when attributes are extracted as they are
+    first read. An attribute is extracted, with its functions applied and 
+    cast to its datatype, the first time a condition or expression reads it,
+    and is kept for the rest of the record. Reading every attribute, such as
+    by iterating over the dictionary, extracts the rest.
+
+    ATTRIBUTES:
+    data (dict; required) - Input data to extract the attributes from.
+
+    steps (dict; required) - The steps of the extraction plan by attribute 
+    name.
+
+    data_structure (data structure; required) - The data structure extracting
+    the attributes.
+
+    trace (tracer; required) - The tracer details are traced to.
+
+    errors (error channel; required) - The error channel errors are recorded
+    to.
+    """
+    __slots__ = ('_data', '_steps', '_data_structure', '_trace', '_errors')
+
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, data, steps, data_structure, trace, errors):
+        dict.__init__(self)
+        self._data = data
+        self._steps = steps
+        self._data_structure = data_structure
+        self._trace = trace
+        self._errors = errors
+
+    ###########################################################################
+    #functions to extract attributes when first read
+    ###########################################################################
+
+    def __missing__(self, key):
+        step = self._steps.get(key)
+        if step is None:
+            raise KeyError(key)
+        value = self._data_structure.extract_attribute(self._data, step, self._trace, self._errors)
+        dict.__setitem__(self, key, value)
+        return value
+
+    def extract_all(self):
+        """
+        DESCRIPTION:
+        This function is used to extract the attributes which have not been 
+        read yet.
+
+        OUTPUT/RESULT:
+        The result of this function is every attribute extracted.
+        """
+        for key in self._steps:
+            if not dict.__contains__(self, key):
+                self[key]
+        return self
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._steps
+
+    def __delitem__(self, key):
+        self[key]
+        dict.__delitem__(self, key)
+        #deleted attributes are not extracted again
+        self._steps = {name:step for name, step in self._steps.items() if name != key}
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    ###########################################################################
+    #functions to read every attribute
+    ###########################################################################
+
+    def __iter__(self):
+        return dict.__iter__(self.extract_all())
+
+    def __len__(self):
+        return dict.__len__(self.extract_all())
+
+    def keys(self):
+        return dict.keys(self.extract_all())
+
+    def values(self):
+        return dict.values(self.extract_all())
+
+    def items(self):
+        return dict.items(self.extract_all())
+
+    def copy(self):
+        return dict(self.items())
+
+    def popitem(self):
+        return dict.popitem(self.extract_all())
+
+    def __eq__(self, other):
+        if isinstance(other, lazy_attributes):
+            other.extract_all()
+        return dict.__eq__(self.extract_all(), other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return dict.__repr__(self.extract_all())
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
 ###############################################################################
 #data structure class
 ###############################################################################
@@ -107,6 +473,14 @@ class data_structure():
     ATTRIBUTES:
     attributes (list) - A list of attribute objects. 
     expressions (list) - A list of expression objects.
+    plan (list) - The compiled extraction plan for the attributes. Nonetype 
+    until attributes are first extracted or after attributes are changed.
+    expression_plan (list) - The expressions in priority order, compiled 
+    with the extraction plan.
+    pruned (tuple) - The columns required by the last call to 'prune' and the
+    extraction plan and expressions needed for them.
+    steps (tuple) - The last extraction plan used to extract attributes when
+    they are first read and its steps by attribute name.
     """
     ###########################################################################
     #initiate self
@@ -114,6 +488,10 @@ class data_structure():
     def __init__(self):
         self._attributes = []
         self._expressions = []
+        self._plan = None
+        self._expression_plan = None
+        self._pruned = None
+        self._steps = None
     
     ###########################################################################
     #function to add/update attributes to object
@@ -156,6 +534,7 @@ class data_structure():
                 self._attributes.append(attribute(name, attribute_path, dtype, default, priority, function_dictionary))
                 print("Attribute '" + name + "' already exists and will be replaced")
                 print("Attribute '" + name + "' added to data structure")
+            self._plan = None
         except Exception as e:
             print('ERROR: An error occured while adding attribute to data structure')
             print(e)  
@@ -180,6 +559,7 @@ class data_structure():
         """
         try:
             self._attributes = list(filter(lambda x: x._name != name, self._attributes))
+            self._plan = None
             print("Attribute '" + name + "' removed from data structure")
         except Exception as e:
             print('ERROR: An error occured while removing attribute from data structure')
@@ -279,10 +659,12 @@ class data_structure():
             try:
                 if len(list(filter(lambda x: x._name == name, self._expressions))) == 0:
                     self._expressions.append(expression(name, expression_string, priority))
+                    self._plan = None
                     print("Expression '" + name + "' added to data structure")
                 else:
                     self._expressions = list(filter(lambda x: x._name != name, self._expressions))
                     self._expressions.append(expression(name, expression_string, priority))
+                    self._plan = None
                     print("Expression '" + name + "' already exists and will be replaced")
                     print("Expression '" + name + "' added to data structure")
             except Exception as e:
@@ -301,10 +683,10 @@ class data_structure():
                     print('\tTesting expression with dataframe...')
                     row_test = []
                     failed_rows = []
+                    code = compile(expression_string, '<expression:' + str(name) + '>', 'exec')
                     for row_index, row_data in test_data.items():
-                        data = row_data
                         try:
-                            exec(expression_string)
+                            exec(code, expression_namespace(row_data))
                             row_test.append(True)
                         except:
                             row_test.append(False)
@@ -315,10 +697,12 @@ class data_structure():
                         try:
                             if len(list(filter(lambda x: x._name == name, self._expressions))) == 0:
                                 self._expressions.append(expression(name, expression_string, priority))
+                                self._plan = None
                                 print("Expression '" + name + "' added to data structure")
                             else:
                                 self._expressions = list(filter(lambda x: x._name != name, self._expressions))
                                 self._expressions.append(expression(name, expression_string, priority))
+                                self._plan = None
                                 print("Expression '" + name + "' already exists and will be replaced")
                                 print("Expression '" + name + "' added to data structure")
                         except Exception as e:
@@ -329,16 +713,17 @@ class data_structure():
                 else:
                     try:
                         print('\tTesting expression...')
-                        data = test_data
-                        exec(expression_string)
+                        exec(compile(expression_string, '<expression:' + str(name) + '>', 'exec'), expression_namespace(test_data))
                         print('\tExpression valid')
                         try:
                             if len(list(filter(lambda x: x._name == name, self._expressions))) == 0:
                                 self._expressions.append(expression(name, expression_string, priority))
+                                self._plan = None
                                 print("Expression '" + name + "' added to data structure")
                             else:
                                 self._expressions = list(filter(lambda x: x._name != name, self._expressions))
                                 self._expressions.append(expression(name, expression_string, priority))
+                                self._plan = None
                                 print("Expression '" + name + "' already exists and will be replaced")
                                 print("Expression '" + name + "' added to data structure")
                         except Exception as e:
@@ -372,6 +757,7 @@ class data_structure():
         """
         try:
             self._expressions = list(filter(lambda x: x._name != name, self._expressions))
+            self._plan = None
             print("Expression '" + name + "' removed from data structure")
         except Exception as e:
             print('ERROR: An error occured while removing expression from data structure')
@@ -417,7 +803,7 @@ class data_structure():
     ###########################################################################
     #function to apply functions to attributes
     ##########################################################################
-    def apply_functions(self, attribute, function_dictionary, verbose=True):
+    def apply_functions(self, attribute, function_dictionary, verbose=True, errors=None):
         """
         DESCRIPTION:
         This function is used to apply the functions configured within the
@@ -426,41 +812,275 @@ class data_structure():
         PARAMETERS:
         attribute (varies; required) - The extracted attribute from input data.
         
-        function_dictionary (dict; required) - A dictionary of functions to
-        apply.
+        function_dictionary (function chain/dict; required) - The function 
+        chain of the attribute, or a dictionary of functions to apply which 
+        is bound to its parameters first.
         
-        verbose (bool; optional; default:True) - Whether or not to print 
-        details when applying functions. Primarily used for testing and 
+        verbose (bool/tracer; optional; default:True) - Whether or not to 
+        trace details when applying functions. Primarily used for testing and 
         validation. This will be inherited from the rule engine object.
         
+        errors (error channel; optional; default:Nonetype) - The error channel
+        errors are recorded to. This will be inherited from the rule engine 
+        object.
+        
         OUTPUT/RESULT:
         The result of this function is the execution of all functions 
         configured with this function dictionary of the data structure 
         attribute.
         """
+        trace = get_tracer(verbose)
+        function = None
         try:
+            chain = function_dictionary if isinstance(function_dictionary, function_chain) else function_chain(function_dictionary)
             output = attribute
-            for function, parameters in function_dictionary.items():
-                if parameters == None:
-                    print_verbose(verbose, "\tApplying function '" + str(function) + "' without parameters")
-                    print_verbose(verbose, '\t\tInput: ' + str(output))
-                    output = function(output)
-                    print_verbose(verbose, '\t\tOutput: ' + str(output))
-                else: 
-                    print_verbose(verbose, "\tApplying function '" + str(function) + "' with parameter dictionary " + str(parameters))
-                    print_verbose(verbose, '\t\tInput: ' + str(output))
-                    output = function(output, **literal_eval(str(parameters)))
-                    print_verbose(verbose, '\t\tOutput: ' + str(output))
+            if trace._active:
+                for function, parameters, bound in chain._functions:
+                    if parameters == None:
+                        trace("\tApplying function '%s' without parameters", function)
+                    else:
+                        trace("\tApplying function '%s' with parameter dictionary %s", function, parameters)
+                    trace('\t\tInput: %s', output)
+                    output = bound(output)
+                    trace('\t\tOutput: %s', output)
+            else:
+                for function, parameters, bound in chain._functions:
+                    output = bound(output)
             return output
         except Exception as e:
-            print('ERROR: An error occured while applying functions to attribute')
-            print(e)
+            get_errors(errors).record('function', getattr(function, '__name__', function), e)
     
+    ###########################################################################
+    #function to apply vectorized functions to attribute column
+    ###########################################################################
+
+    def apply_functions_vectorized(self, series, values, chain, dtype, default, default_error, traced=(), verbose=True):
+        """
+        DESCRIPTION:
+        This function is used to apply the vectorized implementations of the 
+        functions of an attribute to a whole column of a dataframe, casting 
+        the output to the datatype of the attribute. Rows missing the 
+        attribute get the default value without applying functions, the same
+        as when the functions are applied to each value.
+        
+        PARAMETERS:
+        series (series; required) - The attribute values of each row, or 
+        Nonetype when the values are not a column of the dataframe.
+        
+        values (list; required) - The attribute values of each row, with 
+        missing values as Nonetype.
+        
+        chain (function chain; required) - The function chain of the 
+        attribute, which has vectorized implementations of its functions.
+        
+        dtype (type; required) - The datatype of the attribute.
+        
+        default (varies; required) - The default value of the attribute cast
+        to its datatype.
+        
+        default_error (exception; required) - The error raised when casting 
+        the default value, if any.
+        
+        traced (set; optional; default:()) - The positions of the rows to 
+        trace.
+        
+        verbose (bool/tracer; optional; default:True) - Whether or not to 
+        trace details when applying functions.
+        
+        OUTPUT/RESULT:
+        The result of this function will be a list of the attribute values of
+        each row, or Nonetype when a vectorized function or casting its 
+        output raises an error, in which case the functions should be applied
+        to each value so errors are recorded for the rows they occur in.
+        """
+        positions = [position for position, value in enumerate(values) if value is not None]
+        if default_error is not None and len(positions) < len(values):
+            raise default_error
+        try:
+            if series is not None and len(positions) == len(values):
+                outputs = chain.apply_vectorized(series)
+            elif len(positions) > 0:
+                outputs = chain.apply_vectorized(pd.Series([values[position] for position in positions], dtype=object))
+            else:
+                outputs = []
+            column = [default] * len(values)
+            for position, output in zip(positions, outputs):
+                column[position] = dtype(output)
+        except Exception:
+            return None
+        trace = get_tracer(verbose)
+        for position in sorted(traced):
+            if values[position] is None:
+                trace("\t\tAttribute value missing, applying default value '%s'", default)
+            else:
+                trace("\tApplying vectorized functions %s", [function for function, parameters, bound in chain._functions])
+                trace('\t\tInput: %s', values[position])
+                trace('\t\tOutput: %s', column[position])
+        return column
+
+    ###########################################################################
+    #function to compile extraction plan
+    ###########################################################################
+
+    def compile(self):
+        """
+        DESCRIPTION:
+        This function is used to compile the attributes of the data structure
+        into an extraction plan. The plan is compiled again automatically the 
+        next time attributes are extracted after attributes are added or 
+        removed.
+        
+        OUTPUT/RESULT:
+        The result of this function is an extraction plan stored in the 'plan'
+        attribute of the data structure. The plan is a list with a tuple for 
+        each attribute in priority order containing the attribute name, a 
+        getter for the attribute path, the datatype, the function chain, the
+        default value cast to the datatype and the error raised when 
+        casting the default value, if any. The expressions are stored in 
+        priority order in the 'expression_plan' attribute.
+        """
+        plan = []
+        for attribute in sorted(self._attributes, key=lambda x: (x._priority is None, x._priority)):
+            default, default_error = None, None
+            if attribute._default != None:
+                try:
+                    default = attribute._dtype(attribute._default)
+                except Exception as e:
+                    default_error = e
+            plan.append((attribute._name, 
+                         attribute_getter(attribute._attribute_path), 
+                         attribute._dtype, 
+                         attribute._function_chain, 
+                         default, 
+                         default_error))
+        self._plan = plan
+        self._expression_plan = sorted(self._expressions, key=lambda x: (x._priority is None, x._priority))
+        self._pruned = None
+        return plan
+
+    ###########################################################################
+    #function to prune extraction plan
+    ###########################################################################
+
+    def prune(self, required):
+        """
+        DESCRIPTION:
+        This function is used to find the attributes and expressions needed 
+        to produce the required columns. Expressions are walked in reverse
+        priority order and are needed when they write a required column or a
+        name read by another needed expression, in which case the columns and
+        names they read are required as well. Expressions which use 'data' in
+        a way that cannot be analyzed, such as passing it to a function, are
+        always needed, and when one is needed every attribute is extracted.
+
+        PARAMETERS:
+        required (frozenset; required) - The columns of the extracted data 
+        which are required, or Nonetype when all columns are required.
+
+        OUTPUT/RESULT:
+        The result of this function will be a tuple of the extraction plan
+        and the expressions in priority order needed for the required 
+        columns. The last result is kept in the 'pruned' attribute.
+        """
+        plan = self._plan if self._plan is not None else self.compile()
+        if required is None:
+            return plan, self._expression_plan
+        pruned = self._pruned
+        if pruned is not None and (pruned[0] is required or pruned[0] == required):
+            return pruned[1], pruned[2]
+        needed = set(required)
+        names = set()
+        expressions = []
+        for expression in reversed(self._expression_plan):
+            reads, writes, names_read, names_written = data_references(expression._expression, 'exec')
+            if writes is None or not needed.isdisjoint(writes) or not names.isdisjoint(names_written):
+                expressions.append(expression)
+                names.update(names_read)
+                if reads is None:
+                    needed = None
+                    break
+                needed.update(reads)
+        if needed is None:
+            expressions = self._expression_plan
+        else:
+            expressions.reverse()
+            plan = [step for step in plan if step[0] in needed]
+        self._pruned = (required, plan, expressions)
+        return plan, expressions
+
+    ###########################################################################
+    #function to get steps of extraction plan by attribute
+    ###########################################################################
+
+    def get_steps(self, plan):
+        """
+        DESCRIPTION:
+        This function is used to get the steps of an extraction plan by the 
+        name of their attribute, for extracting attributes when they are first
+        read. The steps of the last plan are kept.
+
+        PARAMETERS:
+        plan (list; required) - The extraction plan.
+
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of the steps of the 
+        plan by attribute name.
+        """
+        steps = self._steps
+        if steps is None or steps[0] is not plan:
+            steps = (plan, {step[0]:step for step in plan})
+            self._steps = steps
+        return steps[1]
+
+    ###########################################################################
+    #function to extract single attribute
+    ###########################################################################
+
+    def extract_attribute(self, data, step, verbose=True, errors=None):
+        """
+        DESCRIPTION:
+        This function is used to extract a single attribute from a record 
+        following a step of the extraction plan, applying its functions and 
+        casting it to its datatype. The default value is used when the 
+        attribute cannot be extracted.
+
+        PARAMETERS:
+        data (dict; required) - Input data to extract the attribute from.
+
+        step (tuple; required) - The step of the extraction plan.
+
+        verbose (bool/tracer; optional; default:True) - Whether or not to 
+        trace details when extracting the attribute.
+
+        errors (error channel; optional; default:Nonetype) - The error channel
+        errors are recorded to.
+
+        OUTPUT/RESULT:
+        The result of this function will be the value of the attribute.
+        """
+        name, getter, dtype, function_dictionary, default, default_error = step
+        trace = get_tracer(verbose)
+        if trace._active:
+            trace("\tExtracting attribute '%s' %s", name, 'without applying functions' if function_dictionary == None else 'and applying functions...')
+        try:
+            if function_dictionary == None:
+                return dtype(getter(data))
+            else:
+                return dtype(self.apply_functions(getter(data), function_dictionary, trace, errors))
+        except Exception as e:
+            if trace._active:
+                trace("\t\tAn Error occured while extracting attribute '%s' at path '%s', applying default value '%s'", name, '.'.join(map(str, getter._path)), default)
+                trace("\t\tERROR: '%s - %s", type(e), e)
+            if default_error is not None:
+                raise default_error
+            return default
+
     ###########################################################################
     #function to extract attributes
     ###########################################################################  
 
-    def extract_attributes(self, data, verbose=True, dataframe=False):
+    def extract_attributes(self, data, verbose=True, dataframe=False, errors=None, profiler=None, required=None, 
+                           lazy=False):
         """
         DESCRIPTION:
         This function is used extract all attributes and apply all expressions
@@ -470,8 +1090,8 @@ class data_structure():
         data (dict/dataframe; required) - Input data to extract attributes 
         from.
         
-        verbose (bool; optional; default:True) - Whether or not to print 
-        details when applying function. Primarily used for testing and 
+        verbose (bool/tracer; optional; default:True) - Whether or not to 
+        trace details when applying function. Primarily used for testing and 
         validation. This  will be inherited from the rule engine object.
         
         dataframe (bool; optional; default: False) - A parameter indicating if 
@@ -479,106 +1099,185 @@ class data_structure():
         will be inhereted from the rule engine object, but should be specified 
         if using the data structure object in a stand alone fashion.
         
+        errors (error channel; optional; default:Nonetype) - The error channel
+        errors are recorded to. This will be inherited from the rule engine 
+        object.
+        
+        profiler (profiler; optional; default:Nonetype) - The profiler the 
+        time spent extracting attributes and executing each expression is 
+        recorded to. This will be inherited from the rule engine object.
+        
+        required (frozenset; optional; default:Nonetype) - The columns of the 
+        extracted data which are required. Only the attributes and 
+        expressions needed for them are extracted and executed. All are when
+        Nonetype.
+        
+        lazy (bool; optional; default:False) - Whether or not to extract each
+        attribute of a record only when it is first read, by an expression or
+        a condition. Only used when the input data is not a dataframe.
+        
         OUTPUT/RESULT:
         The result of this function is the execution of all functions 
         configured with this function dictionary of the data structure 
         attribute.
         """
+        trace = get_tracer(verbose)
+        started = time.perf_counter() if profiler is not None else None
         try:
+            #compile extraction plan if attributes have changed, keeping what the
+            #required columns need
+            plan, expressions = self.prune(required)
             #create empty dictionary to fill in
             output_dict = {}
-            #sort attributes by priority
-            sorted_attributes = sorted(self._attributes, key=lambda x: (x._priority is None, x._priority))
-            print_verbose(verbose, "Extracting attributes configured in data structure")
             #logic for when data structure is for pandas dataframe
             if dataframe == True:
-                #transpose and convert dataframe to dictionary
-                df_dict = data.where(pd.notnull(data), None).transpose().to_dict()
-                #loop through df dictionary to extract attributes
-                for row_index, row_data in df_dict.items():
-                    #create empty dictionary to store output from individual rows
-                    row_dict = {}
-                    #loop through attribute dictionary extract and transform attributes
-                    for attribute in sorted_attributes:
-                        #logic if function is not included
-                        if attribute._function_dictionary == None:
-                            print_verbose(verbose, "\tExtracting attribute '" + attribute._name + "' from row " + str(row_index) + " without applying functions")
-                            try:
-                                if reduce(operator.getitem, attribute._attribute_path, row_data) == None:
-                                    print_verbose(verbose, "\t\tAttribute value missing, applying default value '" + str(attribute._default) + "'")
-                                    row_dict[attribute._name] = attribute._dtype(attribute._default) if attribute._default!= None else None
-                                else:
-                                    row_dict[attribute._name] = attribute._dtype(reduce(operator.getitem, attribute._attribute_path, row_data))
-                            except KeyError:
-                                print_verbose(verbose, "\t\tAttribute '" + attribute._name + "' not in dataframe at column '" + str(attribute._attribute_path) + "', applying default value '" + str(attribute._default) + "'")
-                                row_dict[attribute._name] = attribute._dtype(attribute._default) if attribute._default != None else None
-                        #logic if functions are included
+                row_indexes = data.index.tolist()
+                #extract and transform each attribute a column at a time
+                names = []
+                attribute_columns = []
+                for name, getter, dtype, function_dictionary, default, default_error in plan:
+                    traced = set(position for position in range(len(row_indexes)) if trace.sample(position)) if trace._enabled else set()
+                    for position in sorted(traced):
+                        trace("\tExtracting attribute '%s' from row %s %s", name, row_indexes[position], 
+                              'without applying functions' if function_dictionary == None else 'and applying functions')
+                    column_name = getter._path[0] if len(getter._path) > 0 else None
+                    if column_name not in data.columns:
+                        if default_error is not None:
+                            raise default_error
+                        for position in sorted(traced):
+                            trace("\t\tAttribute '%s' not in dataframe at column '%s', applying default value '%s'", name, getter._path, default)
+                        attribute_columns.append([default] * len(row_indexes))
+                        names.append(name)
+                        continue
+                    #column values with null values as Nonetype
+                    series = data[column_name]
+                    values = series.tolist()
+                    for position in np.flatnonzero(series.isna().to_numpy()):
+                        values[position] = None
+                    rest = attribute_getter(getter._path[1:])
+                    #apply vectorized functions to the whole column when every
+                    #function has a vectorized implementation
+                    if getattr(function_dictionary, '_vectorized', None) is not None:
+                        if len(getter._path) > 1:
+                            series = None
+                            for position, value in enumerate(values):
+                                try:
+                                    values[position] = rest(value)
+                                except KeyError:
+                                    values[position] = None
+                            rest = attribute_getter([])
+                        column = self.apply_functions_vectorized(series, values, function_dictionary, dtype, default, 
+                                                                 default_error, traced, trace)
+                        if column is not None:
+                            attribute_columns.append(column)
+                            names.append(name)
+                            continue
+                    column = []
+                    for position, value in enumerate(values):
+                        try:
+                            value = rest(value)
+                        except KeyError:
+                            value = None
+                        if value is None:
+                            if default_error is not None:
+                                raise default_error
+                            if position in traced:
+                                trace("\t\tAttribute value missing, applying default value '%s'", default)
+                            column.append(default)
+                        elif function_dictionary == None:
+                            column.append(dtype(value))
                         else:
-                            print_verbose(verbose, "\tExtracting attribute '" + attribute._name + "' from row " + str(row_index) + "' and applying functions")
-                            try:
-                                if reduce(operator.getitem, attribute._attribute_path, row_data) == None:
-                                    print_verbose(verbose, "\t\tAttribute value missing, applying default value '" + str(attribute._default) + "' without applying functions")
-                                    row_dict[attribute._name] = attribute._dtype(attribute._default) if attribute._default != None else None
-                                else:            
-                                    row_dict[attribute._name] = attribute._dtype(self.apply_functions(reduce(operator.getitem, attribute._attribute_path, row_data), attribute._function_dictionary, verbose))
-                            except KeyError:
-                                print_verbose(verbose, "\t\tAttribute '" + attribute._name + "' not in dataframe at column '" + str(attribute._attribute_path) + "', applying default value '" + str(attribute._default) + "' without applying functions")
-                                row_dict[attribute._name] = attribute._dtype(attribute._default) if attribute._default != None else None
-                    #execute expressions for reach row
-                    if len(self._expressions) > 0:
-                        print_verbose(verbose, "Executing expressions configured in data structure for row " + str(row_index))
-                        sorted_expressions = sorted(self._expressions, key=lambda x: (x._priority is None, x._priority))
-                        data = row_dict
-                        for expression in sorted_expressions:
+                            column.append(dtype(self.apply_functions(value, function_dictionary, 
+                                                                     trace if position in traced else silent_tracer, errors)))
+                    attribute_columns.append(column)
+                    names.append(name)
+                #build dictionary for each row
+                rows = [dict(zip(names, values)) for values in zip(*attribute_columns)] if len(names) > 0 else [{} for row_index in row_indexes]
+                if profiler is not None:
+                    profiler.record('extraction', 'attributes', None, time.perf_counter() - started, 0, len(row_indexes))
+                #execute expressions for reach row
+                for position, (row_index, row_dict) in enumerate(zip(row_indexes, rows)):
+                    if len(expressions) > 0:
+                        if trace.sample(position):
+                            trace("Executing expressions configured in data structure for row %s", row_index)
+                        namespace = expression_namespace(row_dict)
+                        for expression in expressions:
                             try:
-                                print_verbose(verbose, "\tExecuting expression '" + expression._name + "'")
-                                exec(expression._expression)
+                                if trace._active:
+                                    trace("\tExecuting expression '%s'", expression._name)
+                                if profiler is not None:
+                                    start = time.perf_counter()
+                                    exec(expression._code, namespace)
+                                    profiler.record('expression', expression._name, None, time.perf_counter() - start)
+                                else:
+                                    exec(expression._code, namespace)
                             except Exception as e:
-                                print("ERROR: An error occured while executing expression '" + expression._name + "'")
-                                print(e)
-                        output_dict[row_index] = data
-                    else:
-                        output_dict[row_index] = row_dict
+                                get_errors(errors).record('expression', expression._name, e, row_index)
+                    output_dict[row_index] = row_dict
+            #logic when data structure is not a dataframe and attributes are
+            #extracted when first read
+            elif lazy == True:
+                output_dict = lazy_attributes(data, self.get_steps(plan), self, trace, errors)
             #logic when data structure is not a dataframe
             else:
-                #loop through attribute dictionary extract and transform attributes
-                for attribute in sorted_attributes:
-                    #logic if function is not included
-                    if attribute._function_dictionary == None:
-                        print_verbose(verbose, "\tExtracting attribute '" + attribute._name + "' without applying functions")
-                        try:
-                            output_dict[attribute._name] = attribute._dtype(reduce(operator.getitem, attribute._attribute_path, data))
-                        except Exception as e:
-                            print_verbose(verbose, "\t\tAn Error occured while extracting attribute '" + attribute._name + "' at path '" + '.'.join(attribute._attribute_path) + "', applying default value '" + str(attribute._default) + "'")
-                            print_verbose(verbose, "\t\tERROR: '" + str(type(e)) + ' - ' + str(e))
-                            output_dict[attribute._name] = attribute._dtype(attribute._default) if attribute._default != None else None
-                    #logic if functions are includeed
-                    else:
-                        print_verbose(verbose, "\tExtracting attribute '" + attribute._name + "' and applying functions...")
-                        try:
-                            output_dict[attribute._name] =  attribute._dtype(self.apply_functions(reduce(operator.getitem, attribute._attribute_path, data), attribute._function_dictionary, verbose))
-                        except Exception as e:
-                            print_verbose(verbose, "\t\tAn Error occured while extracting attribute '" + attribute._name + "' at path '" + '.'.join(attribute._attribute_path) + "', applying default value '" + str(attribute._default) + "'")
-                            print_verbose(verbose, "\t\tERROR: '" + str(type(e)) + ' - ' + str(e))
-                            output_dict[attribute._name] = attribute._dtype(attribute._default) if attribute._default != None else None
+                if trace._active:
+                    trace("Extracting attributes configured in data structure")
+                #loop through extraction plan to extract and transform attributes,
+                #the same as 'extract_attribute' without a call for each attribute
+                for name, getter, dtype, function_dictionary, default, default_error in plan:
+                    if trace._active:
+                        trace("\tExtracting attribute '%s' %s", name, 'without applying functions' if function_dictionary == None else 'and applying functions...')
+                    try:
+                        if function_dictionary == None:
+                            output_dict[name] = dtype(getter(data))
+                        else:
+                            output_dict[name] = dtype(self.apply_functions(getter(data), function_dictionary, trace, errors))
+                    except Exception as e:
+                        if trace._active:
+                            trace("\t\tAn Error occured while extracting attribute '%s' at path '%s', applying default value '%s'", name, '.'.join(map(str, getter._path)), default)
+                            trace("\t\tERROR: '%s - %s", type(e), e)
+                        if default_error is not None:
+                            raise default_error
+                        output_dict[name] = default
+            if dataframe != True:
+                if profiler is not None:
+                    profiler.record('extraction', 'attributes', None, time.perf_counter() - started)
                 #logic to execute expressions if they exist
-                if len(self._expressions) > 0:
-                    print_verbose(verbose, "Executing expressions configured in data structure")
-                    sorted_expressions = sorted(self._expressions, key=lambda x: (x._priority is None, x._priority))
-                    data = output_dict
-                    for expression in sorted_expressions:
+                if len(expressions) > 0:
+                    if trace._active:
+                        trace("Executing expressions configured in data structure")
+                    namespace = expression_namespace(output_dict)
+                    for expression in expressions:
                         try:
-                            print_verbose(verbose, "\tExecuting expression '" + expression._name + "'")
-                            exec(expression._expression)
+                            if trace._active:
+                                trace("\tExecuting expression '%s'", expression._name)
+                            if profiler is not None:
+                                start = time.perf_counter()
+                                exec(expression._code, namespace)
+                                profiler.record('expression', expression._name, None, time.perf_counter() - start)
+                            else:
+                                exec(expression._code, namespace)
                         except Exception as e:
-                            print("ERROR: An error occured while executing expression '" + expression._name + "'")
-                            print(e)
-                    output_dict = data
+                            get_errors(errors).record('expression', expression._name, e)
             #return output
             return output_dict
         except Exception as e:
-            print('ERROR: An error occured while extracting attributes from data or applying expressions')
-            print(e)  
+            get_errors(errors).record('extract_attributes', None, e)
+
+    ###########################################################################
+    #functions to pickle data structure without extraction plan
+    ###########################################################################
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_plan'] = None
+        state['_pruned'] = None
+        state['_steps'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
     
 ###############################################################################
 #collection class
@@ -607,18 +1306,42 @@ class collection():
     
     configuration(dict, optional; default:Nonetype) - The configuration the
     collection uses when executing decision tables. Although this says optional
-    this is required to execute a collection.
+    this is required to execute a collection. Decision tables with 'Memoize' 
+    set to True in the configuration table have their results memoized.
     """
     ###########################################################################
     #initiate self
     ###########################################################################
     
+    __slots__ = ('_name', '_directory', '_active', '_priority', '_configuration')
+
     def __init__(self, name, directory, priority, active=True):
         self._name = name
         self._directory = directory
         self._active = active
         self._priority = priority
         self._configuration = None
+
+    ###########################################################################
+    #functions to convert and pickle collection
+    ###########################################################################
+
+    def to_dict(self):
+        """
+        DESCRIPTION:
+        This function is used to get the attributes of the collection as a 
+        dictionary.
+
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of the attributes.
+        """
+        return {name:getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        set_slots(self, state)
     
     ###########################################################################
     #function for creating configuration tables for collection
@@ -644,7 +1367,8 @@ class collection():
                             'Active': [],
                             'Execute All Rules': [],
                             'Score Override': [],
-                            'Manual Flag': []
+                            'Manual Flag': [],
+                            'Memoize': []
                             })
             config_table.to_csv(directory + 'configuration_table.csv', index = False)
             print(directory + 'configuration_table.csv created')
@@ -671,9 +1395,8 @@ class collection():
         collection.
         """
         try:
-            config_table = pd.read_csv(directory + 'configuration_table.csv', 
-                                       index_col = 'Decision Table Filename').sort_values('Priority')
-            config_table = config_table.where(pd.notnull(config_table), None).to_dict(orient = 'index')
+            with open(directory + 'configuration_table.csv', 'rb') as f:
+                config_table = parse_config_table('configuration_table.csv', f.read())
             print(directory + 'configuration_table.csv imported')
             return config_table
         except Exception as e:
@@ -684,7 +1407,7 @@ class collection():
     #function to apply decision tables in collection
     ###########################################################################
             
-    def apply_collection(self, data, decision_table_dictionary, verbose=True):
+    def apply_collection(self, data, decision_table_dictionary, verbose=True, errors=None, profiler=None, detail='full'):
         """
         DESCRIPTION:
         This function is used to apply all the decision tables configured 
@@ -693,33 +1416,45 @@ class collection():
         PARAMETERS:
         data (dict; required) - Input data.
         
-        decision_table_dictionary (dict; required) - The decision table to
-        execute.
+        decision_table_dictionary (dict; required) - A dictionary of compiled
+        decision table objects to execute.
         
-        verbose (bool; optional; default:True) - Whether or not to print 
-        details when applying collection. Primarily used for testing and 
+        verbose (bool/tracer; optional; default:True) - Whether or not to 
+        trace details when applying collection. Primarily used for testing and
         validation. This  will be inherited from the rule engine object.
         
+        errors (error channel; optional; default:Nonetype) - The error channel
+        errors are recorded to. This will be inherited from the rule engine 
+        object.
+        
+        profiler (profiler; optional; default:Nonetype) - The profiler the 
+        time spent on the collection is recorded to. This will be inherited 
+        from the rule engine object.
+        
+        detail (str; optional; default:'full') - The result detail, 'summary',
+        'hits' or 'full'. This will be inherited from the rule engine object.
+        
         OUTPUT/RESULT:
-        The result of this function is a dictionary containing the results of 
-        the executed collection.
-        """
-        dt_results = {}
-        final_result = {'collection_result':None,
-                        'collection_score':None,
-                        'collection_tables':None,
-                        'collection_hits':None,
-                        'rule_hits':None,
-                        'audit_trail':{'decision_tables':[],
-                                      'flags':[],
-                                      'scores':[],
-                                      'rules':[],
-                                      'rule_matches':[],
-                                      'rule_scores':[]
-                                      }}
+        The result of this function is a collection result object containing 
+        the results of the executed collection.
+        """
+        trace = get_tracer(verbose)
+        started = time.perf_counter() if profiler is not None else None
+        #create empty lists for audit trail
+        audit = detail != 'summary'
+        decision_tables = [] if audit == True else None
+        flags = [] if audit == True else None
+        scores = [] if audit == True else None
+        rules = [] if audit == True else None
+        rule_matches = [] if audit == True else None
+        rule_scores = [] if audit == True else None
         counter = 0
+        hits = 0
+        score = 0
+        rule_hits = 0
         for dt_name in self._configuration:
-            print_verbose(verbose,"Executing decision table '" + dt_name + "'")
+            if trace._active:
+                trace("Executing decision table '%s'", dt_name)
             #add to counter
             counter = counter + 1
             if self._configuration[dt_name]['Active'] == True:
@@ -728,495 +1463,2636 @@ class collection():
                 manual_flag = self._configuration[dt_name]['Manual Flag']
                 score_override = self._configuration[dt_name]['Score Override']
                 #apply decision table to data and save results
-                result = apply_decision_table(decision_table_dictionary[dt_name], data, run_all, verbose)
-                if result['decision_table_result'] == True:
-                    dt_results[dt_name] = result
-                    final_result['audit_trail']['decision_tables'].append(dt_name)
-                    final_result['audit_trail']['flags'].append(manual_flag)
-                    final_result['audit_trail']['rules'].extend(result['audit_trail']['rules'])
-                    final_result['audit_trail']['rule_matches'].extend(result['audit_trail']['match'])
-                    final_result['audit_trail']['rule_scores'].extend(result['audit_trail']['score'])
-                    final_result['audit_trail']['scores'].append(score_override if score_override != None else result['decision_table_score'])
+                memoize = self._configuration[dt_name].get('Memoize') == True
+                result = apply_decision_table(decision_table_dictionary[dt_name], data, run_all, trace, errors, profiler, detail,
+                                              memoize)
+                if result._result == True:
+                    table_score = score_override if score_override != None else result._score
+                    hits = hits + 1
+                    score = score + table_score
+                    rule_hits = rule_hits + result._evaluated
+                    if audit == True:
+                        decision_tables.append(dt_name)
+                        flags.append(manual_flag)
+                        rules.extend(result._rules)
+                        rule_matches.extend(result._matches)
+                        rule_scores.extend(result._scores)
+                        scores.append(table_score)
             else:
-                print_verbose(verbose,"Decision table '" + dt_name + "' is not active, continue to next decision table")
+                if trace._active:
+                    trace("Decision table '%s' is not active, continue to next decision table", dt_name)
                 continue
-        final_result['collection_result'] = True if len(final_result['audit_trail']['decision_tables']) > 0 else False
-        final_result['collection_score'] =  sum(final_result['audit_trail']['scores'])
-        final_result['collection_tables'] = counter
-        final_result['collection_hits'] = len(final_result['audit_trail']['decision_tables'])
-        final_result['rule_hits'] = len(final_result['audit_trail']['rules'])
+        final_result = collection_result(True if hits > 0 else False, score, counter, hits, rule_hits, 
+                                         decision_tables, flags, scores, rules, rule_matches, rule_scores)
+        if profiler is not None:
+            profiler.record('collection', self._name, None, time.perf_counter() - started, final_result._result)
         return final_result
 
-###############################################################################
-#rule engine class
+    ###########################################################################
+    #function to apply decision tables in collection to columns
+    ###########################################################################
+
+    def apply_collection_vectorized(self, columns, decision_table_dictionary, verbose=True, errors=None, profiler=None, 
+                                    detail='full'):
+        """
+        DESCRIPTION:
+        This function is used to apply all the decision tables configured
+        within the collection to all rows of the input data at once. The
+        results are identical to applying the collection to each row.
+
+        PARAMETERS:
+        columns (data columns; required) - Input data as a data columns
+        object.
+
+        decision_table_dictionary (dict; required) - A dictionary of compiled
+        decision table objects to execute.
+
+        verbose (bool/tracer; optional; default:True) - Whether or not to
+        trace details when applying collection. Primarily used for testing and
+        validation. This  will be inherited from the rule engine object.
+
+        errors (error channel; optional; default:Nonetype) - The error channel
+        errors are recorded to. This will be inherited from the rule engine
+        object.
+
+        profiler (profiler; optional; default:Nonetype) - The profiler the
+        time spent on the collection is recorded to. This will be inherited 
+        from the rule engine object.
+
+        detail (str; optional; default:'full') - The result detail, 'summary',
+        'hits' or 'full'. This will be inherited from the rule engine object.
+
+        OUTPUT/RESULT:
+        The result of this function is a list containing a collection result 
+        object of the results of the executed collection for each row.
+        """
+        trace = get_tracer(verbose)
+        started = time.perf_counter() if profiler is not None else None
+        audit = detail != 'summary'
+        audit_all = detail == 'full'
+        if audit == True:
+            final_results = [collection_result(False, 0, None, 0, 0, [], [], [], [], [], []) 
+                             for row in range(columns._length)]
+        else:
+            final_results = [collection_result(False, 0, None, 0, 0, None, None, None, None, None, None) 
+                             for row in range(columns._length)]
+        counter = 0
+        for dt_name in self._configuration:
+            if trace._active:
+                trace("Executing decision table '%s'", dt_name)
+            #add to counter
+            counter = counter + 1
+            if self._configuration[dt_name]['Active'] == True:
+                #set configuration params
+                run_all = self._configuration[dt_name]['Execute All Rules']
+                manual_flag = self._configuration[dt_name]['Manual Flag']
+                score_override = self._configuration[dt_name]['Score Override']
+                table = decision_table_dictionary[dt_name]
+                rule_names = [rule[0] for rule in table._rules]
+                rule_scores = [rule[1] for rule in table._rules]
+                #apply decision table to columns
+                result = apply_decision_table_vectorized(table, columns, run_all, trace, profiler)
+                if run_all == True:
+                    matches = np.vstack(result) if len(result) > 0 else np.zeros((0, columns._length), dtype=bool)
+                    for row in np.flatnonzero(matches.any(axis=0)):
+                        match = matches[:, row].tolist()
+                        table_score = score_override if score_override != None else sum([hit*score for hit,score in zip(match, rule_scores)])
+                        final_result = final_results[row]
+                        final_result._hits = final_result._hits + 1
+                        final_result._score = final_result._score + table_score
+                        final_result._rule_hits = final_result._rule_hits + len(rule_names)
+                        if audit == True:
+                            final_result._decision_tables.append(dt_name)
+                            final_result._flags.append(manual_flag)
+                            final_result._scores.append(table_score)
+                        if audit_all == True:
+                            final_result._rules.extend(rule_names)
+                            final_result._rule_matches.extend(match)
+                            final_result._rule_scores.extend(rule_scores)
+                        elif audit == True:
+                            for hit, rule_name, rule_score in zip(match, rule_names, rule_scores):
+                                if hit == True:
+                                    final_result._rules.append(rule_name)
+                                    final_result._rule_matches.append(True)
+                                    final_result._rule_scores.append(rule_score)
+                else:
+                    for row in np.flatnonzero(result >= 0):
+                        rule = result[row]
+                        table_score = score_override if score_override != None else rule_scores[rule]
+                        final_result = final_results[row]
+                        final_result._hits = final_result._hits + 1
+                        final_result._score = final_result._score + table_score
+                        final_result._rule_hits = final_result._rule_hits + 1
+                        if audit == True:
+                            final_result._decision_tables.append(dt_name)
+                            final_result._flags.append(manual_flag)
+                            final_result._scores.append(table_score)
+                            final_result._rules.append(rule_names[rule])
+                            final_result._rule_matches.append(True)
+                            final_result._rule_scores.append(rule_scores[rule])
+            else:
+                if trace._active:
+                    trace("Decision table '%s' is not active, continue to next decision table", dt_name)
+                continue
+        for final_result in final_results:
+            final_result._result = True if final_result._hits > 0 else False
+            final_result._tables = counter
+        if profiler is not None:
+            profiler.record('collection', self._name, None, time.perf_counter() - started, 
+                            sum(final_result._result for final_result in final_results), columns._length)
+        return final_results
+
+###############################################################################
+#data columns class
 ###############################################################################
 
-class rule_engine():
+class data_columns():
     """
     DESCRIPTION:
-    This class creates the primary 'rule_engine' object. The rule engine 
-    coordinates the execution of the data structure, collection, and rule 
-    engine components on input data.
-    
+    This class creates 'data columns' objects utilized by the vectorized
+    decision table functions. It holds the extracted rows of a dataframe and
+    builds a column of values for an attribute the first time it is needed.
+
     ATTRIBUTES:
-    
-    main_directory (str; required) - The main directory the rule engine and
-    associated folders and files will be located in.
-    
-    name (str; optional; default:Nonetype) - The name of the rule engine.
-    
-    description (str; required) - A description for the rule engine.
-    
-    dataframe (bool; optional; default:False) - An attribute indicating whether
-    or not the input data will be a dataframe.
-    
-    verbose (bool; optional; default:True) - Whether or not to print 
-    details when executing rule engine. Primarily used for testing and 
-    validation.
-    
-    data_structure (object; required) - The data structure object associated
-    with the rule engine. Will be added upon creation.
-    
-    decision_table_dict (dict; required) - A dictionary of decision tables
-    associated with the rule engine.
-    
-    collections (list, required) - A list of collection objects associated with
-    the rule engine.
+    rows (list; required) - A list of dictionaries of extracted attributes,
+    one for each row of the input data.
+
+    length (int) - The number of rows.
+
+    columns (dict) - A dictionary of the columns built so far. The value is a
+    tuple of the column values as a list and as a numpy array.
+
+    conditions (dict) - A dictionary of condition results already evaluated on
+    whole columns.
     """
     ###########################################################################
     #initiate self
     ###########################################################################
-    
-    def __init__(self, main_directory, name=None, description=None, dataframe=False):
-        self._main_directory = main_directory
-        self._name = name
-        self._description = description
-        self._dataframe = dataframe
-        self._verbose = True
-        self._data_structure = data_structure()
-        self._decision_table_dict = None
-        self._collections = []
-            
+
+    def __init__(self, rows):
+        self._rows = rows
+        self._length = len(rows)
+        self._columns = {}
+        self._conditions = {}
+
     ###########################################################################
-    #function to add/update attributes to object
+    #function to get column
     ###########################################################################
-    
-    def add_attribute(self, name, attribute_path, dtype, default=None, priority=None, function_dictionary=None):
+
+    def get_column(self, name):
         """
         DESCRIPTION:
-        This function is used to add attributes to the data structure 
-        object within the rule engine.
-        
+        This function is used to get the values of an attribute for all rows.
+
         PARAMETERS:
-        name (str; required) - The name of the attribute to create.
-        
-        attribute_path (list; required) - The path to the attribute in the 
-        input data specified as a list.
-        
-        dtype (type; required) -  The datatype for the attribute to create.
-        
-        default (varies; optional; default:Nonetype) - The default value to 
-        return if the attribute is missing from the input data. The default 
-        value should match the attribute datatype. 
-        
-        priority (int/float; optional; default:Nonetype) - The priority of the 
-        attribute to create.
-        
-        function_dictionary (dict, optional; default:Nonetype) - The 
-        function_dictionary of the attribute to create.
-        
+        name (str; required) - The name of the attribute.
+
         OUTPUT/RESULT:
-        The result of this function is a new attribute within the data 
-        structure object of the rule engine.
+        The result of this function is a tuple of the values as a list and as
+        a numpy array. Columns with a single int, float or bool type are typed
+        arrays, all other columns are object arrays so comparisons behave the
+        same as they do on single values.
         """
-        self._data_structure.add_attribute(name, attribute_path, dtype, default, priority, function_dictionary)
-    
+        if name not in self._columns:
+            values = [row[name] for row in self._rows]
+            types = set(map(type, values))
+            array = None
+            if len(types) == 1 and types.issubset({int, float, bool}):
+                try:
+                    array = np.array(values, dtype=types.pop())
+                except OverflowError:
+                    array = None
+            if array is None:
+                array = np.empty(self._length, dtype=object)
+                array[:] = values
+            self._columns[name] = (values, array)
+        return self._columns[name]
+
+###############################################################################
+#result classes
+###############################################################################
+
+class table_result(Mapping):
+    """
+    DESCRIPTION:
+    This class creates compact 'table result' objects returned when a decision
+    table is applied to a record. The result reads like the dictionary
+    decision tables used to return, with the keys 'decision_table_result',
+    'decision_table_score', 'decision_table_hits' and 'audit_trail', and is
+    converted to that dictionary with 'to_dict'.
+
+    ATTRIBUTES:
+    result (bool; required) - Whether or not any rule was met.
+
+    score (int/float; required) - The sum of the scores of the rules met.
+
+    hits (int; required) - The number of rules met.
+
+    rules (list; required) - The names of the rules evaluated in the audit 
+    trail.
+
+    matches (list; required) - Whether or not each rule was met.
+
+    scores (list; required) - The score of each rule.
+
+    evaluated (int; required) - The number of rules in the full audit trail, 
+    which is kept when the audit trail is not.
+
+    The audit trail lists are Nonetype when the result detail is 'summary',
+    and only hold the rules met when it is 'hits'.
+    """
+    __slots__ = ('_result', '_score', '_hits', '_rules', '_matches', '_scores', '_evaluated')
+    #keys of the dictionary and the attributes holding them
+    result_keys = {'decision_table_result':'_result', 'decision_table_score':'_score', 'decision_table_hits':'_hits'}
+    audit_keys = {'rules':'_rules', 'match':'_matches', 'score':'_scores'}
+
     ###########################################################################
-    #function to remove attributes from object
+    #initiate self
     ###########################################################################
-    
-    def remove_attribute(self, name):
+
+    def __init__(self, result, score, hits, rules, matches, scores, evaluated=None):
+        self._result = result
+        self._score = score
+        self._hits = hits
+        self._rules = rules
+        self._matches = matches
+        self._scores = scores
+        self._evaluated = evaluated if evaluated is not None else len(rules)
+
+    ###########################################################################
+    #functions to read result as dictionary
+    ###########################################################################
+
+    def __getitem__(self, key):
+        if key == 'audit_trail' and self._rules is not None:
+            return {audit_key:getattr(self, name) for audit_key, name in self.audit_keys.items()}
+        return getattr(self, self.result_keys[key])
+
+    def __iter__(self):
+        return iter(list(self.result_keys) + (['audit_trail'] if self._rules is not None else []))
+
+    def __len__(self):
+        return len(self.result_keys) + (1 if self._rules is not None else 0)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
         """
         DESCRIPTION:
-        This function is used to remove attributes from the data structure 
-        object within the rule engind.
-        
-        PARAMETERS:
-        name (str; required) - The name of the attribute to remove from the
-        data structure.
-        
+        This function is used to convert the result to a dictionary.
+
         OUTPUT/RESULT:
-        The result of this function is the removal of the specified attribute 
-        from the data structure object within the rule engine.
+        The result of this function will be the result as a dictionary.
         """
-        self._data_structure.remove_attribute(name)
-            
+        return {key:self[key] for key in self}
+
+class collection_result(Mapping):
+    """
+    DESCRIPTION:
+    This class creates compact 'collection result' objects returned when a
+    collection is applied to a record. The result reads like the dictionary
+    collections used to return, with the keys 'collection_result', 
+    'collection_score', 'collection_tables', 'collection_hits', 'rule_hits' 
+    and 'audit_trail', and is converted to that dictionary with 'to_dict'.
+
+    ATTRIBUTES:
+    result (bool; required) - Whether or not any decision table was met.
+
+    score (int/float; required) - The sum of the scores of the decision 
+    tables met.
+
+    tables (int; required) - The number of decision tables configured.
+
+    hits (int; required) - The number of decision tables met.
+
+    rule_hits (int; required) - The number of rules in the audit trail.
+
+    decision_tables (list; required) - The names of the decision tables met.
+
+    flags (list; required) - The manual flag of each decision table met.
+
+    scores (list; required) - The score of each decision table met.
+
+    rules (list; required) - The names of the rules in the audit trail.
+
+    rule_matches (list; required) - Whether or not each rule was met.
+
+    rule_scores (list; required) - The score of each rule.
+
+    The audit trail lists are Nonetype when the result detail is 'summary',
+    and only hold the decision tables and rules met when it is 'hits'. The
+    other attributes are the same for every result detail.
+    """
+    __slots__ = ('_result', '_score', '_tables', '_hits', '_rule_hits', 
+                 '_decision_tables', '_flags', '_scores', '_rules', '_rule_matches', '_rule_scores')
+    #keys of the dictionary and the attributes holding them
+    result_keys = {'collection_result':'_result', 'collection_score':'_score', 'collection_tables':'_tables', 
+                   'collection_hits':'_hits', 'rule_hits':'_rule_hits'}
+    audit_keys = {'decision_tables':'_decision_tables', 'flags':'_flags', 'scores':'_scores', 
+                  'rules':'_rules', 'rule_matches':'_rule_matches', 'rule_scores':'_rule_scores'}
+
     ###########################################################################
-    #function to get attributes
-    def get_attributes(self, return_dataframe=False):
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, result, score, tables, hits, rule_hits, decision_tables, flags, scores, rules, 
+                 rule_matches, rule_scores):
+        self._result = result
+        self._score = score
+        self._tables = tables
+        self._hits = hits
+        self._rule_hits = rule_hits
+        self._decision_tables = decision_tables
+        self._flags = flags
+        self._scores = scores
+        self._rules = rules
+        self._rule_matches = rule_matches
+        self._rule_scores = rule_scores
+
+    ###########################################################################
+    #function to create result from dictionary
+    ###########################################################################
+
+    def from_dict(result):
         """
         DESCRIPTION:
-        This function is to print or return all attributes currently setup
-        within the data structure object within the rule engine.
-        
+        This function is used to create a collection result from the 
+        dictionary collections used to return.
+
         PARAMETERS:
-        return_dataframe (bool; optional; default:False) - An option for 
-        whether or not to return a pandas dataframe of attributes.
-        
+        result (dict; required) - The result as a dictionary.
+
         OUTPUT/RESULT:
-        The result of this function is a list of all attributes and their 
-        attribute values which are configured within the data structure within 
-        the rule engine.
+        The result of this function will be a collection result object.
         """
-        return self._data_structure.get_attributes(return_dataframe)
-            
+        audit_trail = result.get('audit_trail')
+        return collection_result(*[result[key] for key in collection_result.result_keys], 
+                                 *[audit_trail[key] if audit_trail is not None else None 
+                                   for key in collection_result.audit_keys])
+
     ###########################################################################
-    #function to add/update expressions to object
+    #functions to read result as dictionary
     ###########################################################################
 
-    def add_expression(self, name, expression_string, priority=None, test_data=None):
+    def __getitem__(self, key):
+        if key == 'audit_trail' and self._rules is not None:
+            return {audit_key:getattr(self, name) for audit_key, name in self.audit_keys.items()}
+        return getattr(self, self.result_keys[key])
+
+    def __iter__(self):
+        return iter(list(self.result_keys) + (['audit_trail'] if self._rules is not None else []))
+
+    def __len__(self):
+        return len(self.result_keys) + (1 if self._rules is not None else 0)
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
         """
         DESCRIPTION:
-        This function is used to add expressions to the data structure 
-        object with the rule engine.
-        
-        PARAMETERS:
-        name (str; required) - The name of the expression to create.
-        
-        expression_string (str; required) - The expression string to execute.
+        This function is used to convert the result to a dictionary.
 
-        priority (int/float; optional; default:Nonetype) - The priority of the 
-        expression to create.
-        
-        test_data (dataframe/dict, optional; default:Nonetype) - Test data to 
-        ensure the expression being added is valid. The test data should be a 
-        sample of the input data.The expression will only be added if it passes
-        the validation. If no test_data is provided no vaildation will be 
-        performed and the expression will be added.
-        
-        dataframe (bool; optional; default:False) - A parameter indicating if 
-        the input data for the data structure is a dataframe. This parameter 
-        will be inhereted from the rule engine object, but should be specified 
-        if using the data structure object in a stand alone fashion.
-        
         OUTPUT/RESULT:
-        The result of this function is a new expression within the data 
-        structure object within the rule engine.
+        The result of this function will be the result as a dictionary.
         """
-        self._data_structure.add_expression(name, expression_string, priority=priority, test_data=test_data, dataframe=self._dataframe)
+        return {key:self[key] for key in self}
+
+###############################################################################
+#result builder class
+###############################################################################
+
+class result_builder():
+    """
+    DESCRIPTION:
+    This class creates 'result builder' objects utilized to convert the output
+    of the rule engine to a dataframe. Each output column is a list allocated
+    for every row up front and filled in as the results of each collection are
+    added, so no dictionary is built for each row. Audit trails are kept as
+    lists unless stringify is set.
+
+    ATTRIBUTES:
+    index (list; required) - The index of the rows of the output.
+
+    stringify (bool; optional; default:False) - Whether or not to convert the
+    audit trail lists to strings, the way output used to be formatted.
+
+    detail (str; optional; default:'full') - The result detail. No audit 
+    trail columns are created when it is 'summary'.
+
+    columns (dict) - A dictionary of the column values by column name.
+
+    collections (dict) - A dictionary of the columns of each collection added.
+    """
+    #output columns for each collection and the attribute of the result they hold
+    result_columns = (('_result', '_result'),
+                      ('_score', '_score'),
+                      ('_table_count', '_tables'),
+                      ('_hits', '_hits'),
+                      ('_rule_hits', '_rule_hits'))
+    audit_columns = (('_tables', '_decision_tables'),
+                     ('_table_flags', '_flags'),
+                     ('_table_scores', '_scores'),
+                     ('_rules', '_rules'),
+                     ('_rule_matches', '_rule_matches'),
+                     ('_rule_scores', '_rule_scores'))
 
     ###########################################################################
-    #function to remove expression from object
+    #initiate self
     ###########################################################################
-    
-    def remove_expression(self, name):
+
+    def __init__(self, index, stringify=False, detail='full'):
+        self._index = index
+        self._length = len(index)
+        self._stringify = stringify
+        self._detail = detail
+        self._columns = {}
+        self._collections = {}
+
+    ###########################################################################
+    #function to get columns for collection
+    ###########################################################################
+
+    def get_columns(self, collection_name):
         """
         DESCRIPTION:
-        This function is used to remove expressions from the data structure 
-        object within the rule engine.
-        
+        This function is used to get the output columns of a collection,
+        allocating them the first time the collection is added.
+
         PARAMETERS:
-        name (str; required) - The name of the expression to remove from the
-        data structure.
-        
+        collection_name (str; required) - The name of the collection.
+
         OUTPUT/RESULT:
-        The result of this function is the removal of the specified expression 
-        from the data structure object within the rule engine.
+        The result of this function will be a list of tuples of the column
+        values, the attribute of the result and whether or not it is from the
+        audit trail.
         """
-        self._data_structure.remove_expression(name)
-    
+        if collection_name not in self._collections:
+            columns = []
+            audit_columns = self.audit_columns if self._detail != 'summary' else ()
+            for suffix, name in self.result_columns + audit_columns:
+                column = collection_name + suffix
+                if column not in self._columns:
+                    self._columns[column] = [None] * self._length
+                columns.append((self._columns[column], name, (suffix, name) in self.audit_columns))
+            self._collections[collection_name] = columns
+        return self._collections[collection_name]
+
     ###########################################################################
-    #function to print attributes from data structure object
+    #function to add result of single row
     ###########################################################################
-    
-    def get_expressions(self, return_dataframe=False):
+
+    def add(self, position, collection_name, result):
         """
         DESCRIPTION:
-        This function is to print or return all expressions currently setup
-        within the data structure object of the rule engine.
-        
+        This function is used to add the result of a collection for a single
+        row.
+
         PARAMETERS:
-        return_dataframe (bool; optional; default:False) - An option for 
-        whether or not to return a pandas dataframe of expressions.
-        
+        position (int; required) - The position of the row within the index.
+
+        collection_name (str; required) - The name of the collection.
+
+        result (collection result/dict; required) - The result of the 
+        collection.
+
         OUTPUT/RESULT:
-        The result of this function is a list of all expressions and their 
-        attribute values which are configured within the data structure rule
-        engine.
+        The result of this function is the result stored in the output
+        columns.
         """
-        return self._data_structure.get_expressions(return_dataframe)
-        
+        stringify = self._stringify
+        if not isinstance(result, collection_result):
+            result = collection_result.from_dict(result)
+        for values, name, audit in self.get_columns(collection_name):
+            if audit == True and stringify == True:
+                values[position] = str(getattr(result, name))
+            else:
+                values[position] = getattr(result, name)
+
     ###########################################################################
-    #function to import decision tables
+    #function to add results of all rows
     ###########################################################################
-    
-    def import_decision_tables(self):
+
+    def add_collection(self, collection_name, results):
         """
         DESCRIPTION:
-        This function imports decision tables in the 'decision_tables' 
-        directory created by the rule engine.
-        
+        This function is used to add the results of a collection for every
+        row at once.
+
+        PARAMETERS:
+        collection_name (str; required) - The name of the collection.
+
+        results (list; required) - A list of the results of the collection,
+        one for each row.
+
         OUTPUT/RESULT:
-        The decision tables are imported and added to the 'decision_table_dict'
-        rule engine attribute.
+        The result of this function is the results stored in the output
+        columns.
         """
-        try:
-            #create directory
-            directory = self._main_directory + '/decision_tables/'
-            #list items in directory
-            directory_items = os.listdir(directory)
-            #create empty dictionary to store results
-            decision_table_dict = {}
-            #open files and store in dictionary
-            for i in directory_items:
-                if os.path.isfile(directory + i):
-                    print_verbose(self._verbose, "Importing decision table '" + i + "'")
-                    decision_table_dict[i] = pd.read_csv(directory + i)
-            #add dictionary to rule engine object
-            self._decision_table_dict = decision_table_dict
-            print('Decision table import successful, '
-                  + str(len(decision_table_dict))
-                  + ' decision tables imported and added to rule engine')
-        except Exception as e:
-            print('ERROR: An error occured while importing decision tables')
-            print(e)  
-    
+        for values, name, audit in self.get_columns(collection_name):
+            if audit == True and self._stringify == True:
+                values[:] = [str(getattr(result, name)) for result in results]
+            else:
+                values[:] = [getattr(result, name) for result in results]
+
     ###########################################################################
-    #function to get decision tables
+    #function to create dataframe
     ###########################################################################
 
-    def get_decision_tables(self, return_dataframe=False):
+    def to_df(self):
         """
         DESCRIPTION:
-        This function is to print or return all decision tables currently 
-        within the 'decision_table_dict' dictionary.
-        
-        PARAMETERS:
-        return_dataframe (bool; optional; default:False) - An option for 
-        whether or not to return a pandas dataframe of decision tables.
-        
+        This function is used to create the output dataframe from the columns.
+
         OUTPUT/RESULT:
-        The result of this function is a list of all decision tables within the
-        rule engine.
+        The result of this function will be the output as a pandas dataframe.
         """
-        try:
-            tables = {'decision_tables':[]}
-            for table in self._decision_table_dict:
-                tables['decision_tables'].append(table)
-            if return_dataframe == True:
-                return pd.DataFrame.from_dict(tables)
-            else:
-                print(pd.DataFrame.from_dict(tables))
-        except Exception as e:
-            print('ERROR: An error occured while getting dataframes')
-            print(e)  
-            
+        return pd.DataFrame(self._columns, index=self._index)
+
+###############################################################################
+
+class decision_table():
+    """
+    DESCRIPTION:
+    This class creates compiled 'decision table' objects utilized by the rule
+    engine and collection classes. The decision table dataframe is converted a
+    single time into sparse rules with pre-compiled conditions so the table
+    does not need to be converted or parsed when it is applied to input data.
+
+    ATTRIBUTES:
+    name (str; required) - The name of the decision table.
+
+    columns (list) - The condition columns of the decision table in the order
+    they appear in the decision table.
+
+    rules (list) - A list of compiled rules in the order they appear in the
+    decision table. Each rule is a tuple of the rule name, the rule score and a
+    list of (column, condition, code) tuples for the conditions populated in
+    the rule.
+
+    vectorized (dict) - A dictionary of conditions and their code objects
+    for evaluating the condition on a whole column. The value is Nonetype if
+    the condition can only be evaluated one value at a time.
+
+    adaptive (bool) - Whether or not conditions are reordered using their 
+    statistics. Configured with the 'set_adaptive' function.
+
+    condition_stats (dict) - A dictionary of (column, condition) tuples and
+    a list of the number of evaluations, passes and seconds spent evaluating
+    the condition while adaptive.
+
+    ordered_conditions (list) - The conditions of each rule in the order 
+    they are evaluated.
+
+    index_column (str) - The column the rules are indexed on, or Nonetype if
+    the decision table has no index.
+
+    index (dict/interval index) - A hash index of the values of the index
+    column and the positions of the rules whose equality condition on the 
+    index column matches the value, or an interval index of the rules whose
+    range condition on the index column contains the value.
+
+    indexed_rules (frozenset) - The positions of the rules within the index.
+
+    unindexed_rules (tuple) - The positions of the rules without an indexed 
+    condition on the index column. These rules are evaluated for every value.
+
+    data_columns (frozenset) - The columns and keys of the input data the 
+    conditions read, or Nonetype if a condition reads the input data by a key
+    which is not a constant.
+
+    memo_columns (tuple) - The columns and keys of the input data the results
+    of the decision table depend on, or Nonetype if a condition calls a
+    function which may not be deterministic and results cannot be memoized.
+
+    memo_size (int) - The largest number of results memoized. Configured 
+    with the 'set_memoization' function.
+
+    memo (memo cache) - The cache of memoized results, used when the 
+    collection configuration memoizes the decision table.
+    """
     ###########################################################################
-    #function to add collection
+    #initiate self
     ###########################################################################
-    
-    def add_collection(self, name, priority, active=True):
+
+    def __init__(self, name, table):
+        self._name = name
+        self._columns = [column for column in table.columns if column not in ['Rule Name', 'Rule Score']]
+        self._rules = []
+        for row in table.to_dict(orient='records'):
+            rule_name = row.get('Rule Name')
+            rule_score = row.get('Rule Score')
+            conditions = []
+            for column in self._columns:
+                if not is_null(row[column]):
+                    conditions.append((column, str(row[column])))
+            self._rules.append((None if is_null(rule_name) else rule_name,
+                                0 if is_null(rule_score) else rule_score,
+                                conditions))
+        self._adaptive = False
+        self._reorder_interval = 1000
+        self._applications = 0
+        self._condition_stats = {}
+        self._memo_size = 10000
+        self.compile()
+
+    ###########################################################################
+    #function to compile conditions
+    ###########################################################################
+
+    def compile(self):
         """
         DESCRIPTION:
-        This function is used to create and add collection objects to the 
-        collections list of the rule engine object.
-        
-        PARAMETERS:
-        name (str; required) - The name of the collection to create.
+        This function is used to compile the condition strings of all rules
+        within the decision table to code objects.
 
-        priority (int/float; optional) - The priority of the collection to 
-        create.
-        
-        active (bool; required; default:True) : Parameter to determine whether 
-        or not the collection should be active.
-        
         OUTPUT/RESULT:
-        The result of this function is a new collection added to the 
-        'collections' attribute of the rule enngine object as well as a new
-        sub-directory and configuration file for the collection. 
+        The result of this function is a list of rules with compiled
+        conditions stored in the 'rules' attribute of the decision table.
         """
-        try:
-            #create seperate directory for collection
-            directory = self._main_directory + '/collections/' + name + '/'
-            if name not in os.listdir(self._main_directory + '/collections/'):
-                os.mkdir(directory)
-                #add configuration table to directory
-                collection.create_config_table(directory)
-                #create collection object
-                obj = collection(name, directory, priority, active)
-                self._collections.append(obj)
-                print("Collection added to rule engine and directory '" + name + "' created, next steps...")
-                print('1 - Populate configuration file')
-                print('2 - Import configurations')
+        compiled_rules = []
+        self._vectorized = {}
+        for rule_name, rule_score, conditions in self._rules:
+            compiled_conditions = []
+            for condition in conditions:
+                column, condition_string = condition[0], condition[1]
+                code = compile(condition_string, '<' + str(self._name) + ':' + str(column) + '>', 'eval')
+                compiled_conditions.append((column, condition_string, code))
+                if condition_string not in self._vectorized:
+                    self._vectorized[condition_string] = vectorize_condition(condition_string)
+            compiled_rules.append((rule_name, rule_score, compiled_conditions))
+        self._rules = compiled_rules
+        #columns and data the conditions read, and whether they can be memoized
+        columns_read = set()
+        deterministic = True
+        for rule_name, rule_score, conditions in compiled_rules:
+            for column, condition_string, code in conditions:
+                reads = data_references(condition_string)[0] if columns_read is not None else None
+                if reads is None:
+                    columns_read = None
+                else:
+                    columns_read.add(column)
+                    columns_read.update(reads)
+                deterministic = deterministic and condition_references(condition_string) is not None
+        self._data_columns = frozenset(columns_read) if columns_read is not None else None
+        memoizable = deterministic == True and columns_read is not None
+        self._memo_columns = tuple(sorted(columns_read, key=str)) if memoizable == True else None
+        self._memo = memo_cache(self._memo_size)
+        self.build_index()
+        self.reorder_conditions()
+
+    ###########################################################################
+    #function to build index
+    ###########################################################################
+
+    def build_index(self):
+        """
+        DESCRIPTION:
+        This function is used to index the rules on a single column so only 
+        some of the rules need to be evaluated for a record. Equality 
+        conditions, such as "X == 'foo'" or "X in [1, 2]", are indexed with a
+        hash index and range conditions on numbers, such as "X > 0 and 
+        X <= 100" or "100 < X <= 500", are indexed with an interval index. The
+        column and type of index with the most indexed rules is used, and the
+        rules without an indexed condition on the column are evaluated for 
+        every value.
+
+        OUTPUT/RESULT:
+        The result of this function is the index stored in the 'index' 
+        attribute of the decision table, or no index when fewer than two rules
+        have an indexed condition on the same column.
+        """
+        self._index_column = None
+        self._index = None
+        self._indexed_rules = frozenset()
+        self._unindexed_rules = ()
+        equality = {}
+        ranges = {}
+        for position, (rule_name, rule_score, conditions) in enumerate(self._rules):
+            for column, condition_string, code in conditions:
+                keys = equality_keys(condition_string)
+                if keys is not None:
+                    equality.setdefault(column, {})[position] = keys
+                interval = range_interval(condition_string)
+                if interval is not None:
+                    ranges.setdefault(column, {})[position] = interval
+        #most indexed rules first, hash index before interval index
+        options = sorted([(len(rules), 1, column) for column, rules in equality.items()] + 
+                         [(len(rules), 0, column) for column, rules in ranges.items()], 
+                         key=lambda option: option[:2], reverse=True)
+        for count, hashed, column in options:
+            if count < 2:
+                return
+            if hashed == 1:
+                index = {}
+                for position, keys in equality[column].items():
+                    for key in keys:
+                        positions = index.setdefault(key, [])
+                        if len(positions) == 0 or positions[-1] != position:
+                            positions.append(position)
+                index = {key:tuple(positions) for key, positions in index.items()}
+                indexed_rules = equality[column]
             else:
-                print('ATTENTION: Collection directory already exists. Directory and configuration table will not be created.')
-                #create collection object
-                obj = collection(name, directory, priority, active)
-                self._collections.append(obj)
-                print('Collection added to rule engine, next steps...')
-                print('1 - Populate configuration file')
-                print('2 - Import configurations')
-        except Exception as e:
-            print('ERROR: An error occured while adding collection to rule engine')
-            print(e)  
-    
+                index = interval_index(ranges[column], max_size=16 * count + 1024)
+                if index._positions is None:
+                    continue
+                indexed_rules = ranges[column]
+            self._index_column = column
+            self._index = index
+            self._indexed_rules = frozenset(indexed_rules)
+            self._unindexed_rules = tuple(position for position in range(len(self._rules)) 
+                                          if position not in self._indexed_rules)
+            return
+
     ###########################################################################
-    #function to remove collection
+    #function to get candidate rules
     ###########################################################################
-    
-    def remove_collection(self, name, remove_directory=False):
+
+    def get_candidates(self, value):
         """
         DESCRIPTION:
-        This function is used to remove a collection object from the
-        collections list of the rule engine object and the directory for the
-        collection if desired.
-        
+        This function is used to get the rules which can evaluate to True for
+        a value of the index column.
+
         PARAMETERS:
-        name (str; required) - The name of the collection to remove.
+        value (varies; required) - The value of the index column.
 
-        remove_directory (bool; required; default:False) - Parameter to 
-        determine whether or not the directory and configuraion file for 
-        collection should be removed.
-        
         OUTPUT/RESULT:
-        The result of this function will be the removal of the specified
-        collection and its directory and configuration file if desired.
+        The result of this function will be an iterable of the positions of
+        the candidate rules in the order they appear in the decision table, or
+        Nonetype if the value cannot be looked up and every rule needs to be 
+        evaluated.
         """
         try:
-            if len(self._collections) == 0:
-                print('ATTENTION: There are no collections in rule engine')
-            else:
-                #create seperate directory for collection
-                for collection in self._collections:
-                    if collection._name == name:
-                        self._collections.remove(collection)
-                        print("Collection '" + name + "' removed from rule engine collections")
-                        if remove_directory == True:
-                            try:
-                                os.remove(collection._directory + 'configuration_table.csv')
-                                print("Configuration table removed for collection '" + name + "'")
-                                os.rmdir(collection._directory)
-                                print("Directory removed for collection '" + name + "'")
-                            except Exception as e:
-                                print('ERROR: An error occured while removing directory for collection')
-                                print(e) 
-                    else:
-                        print("Collection '" + name + "' not found in rule engine")
-        except Exception as e:
-            print('ERROR: An error occured while removing collection from rule engine')
-            print(e) 
-            
+            indexed = self._index.get(value, ())
+        except TypeError:
+            return None
+        if len(self._unindexed_rules) == 0:
+            return indexed
+        if len(indexed) == 0:
+            return self._unindexed_rules
+        return heapq.merge(indexed, self._unindexed_rules)
+
     ###########################################################################
-    #function to get collections for rule engine
+    #function to set adaptive ordering
     ###########################################################################
-    
-    def get_collections(self, return_dataframe=False):
+
+    def set_adaptive(self, adaptive=True, reorder_interval=1000):
         """
         DESCRIPTION:
-        This function is to print or return all collections and its attributes
-        currently within the 'collections' list of the rule engine object.
-        
+        This function is used to turn adaptive ordering of conditions on or 
+        off. When on, the pass rate and evaluation time of each condition are
+        recorded and the conditions of each rule are reordered so the cheapest
+        conditions which most often fail are evaluated first. The result of
+        each rule, and the audit trail, is the same in any order.
+
         PARAMETERS:
-        return_dataframe (bool; optional; default:False) - An option for 
-        whether or not to return a pandas dataframe of collections and their
-        attributes.
-        
+        adaptive (bool; optional; default:True) - Whether or not to reorder
+        conditions.
+
+        reorder_interval (int; optional; default:1000) - The number of times
+        the decision table is applied between reordering conditions.
+
         OUTPUT/RESULT:
-        The result of this function is a list of all collections within the
-        rule engine object.
+        The result of this function is updated adaptive settings for the 
+        decision table.
         """
-        try:
-            coll_dict = {'name':[], 'active':[], 'priority':[], 'directory':[]}
-            for collection in self._collections:
-                coll_dict['name'].append(collection._name)
-                coll_dict['active'].append(collection._active)
-                coll_dict['priority'].append(collection._priority)
-                coll_dict['directory'].append(collection._directory)
-            if return_dataframe == True:
-                return pd.DataFrame.from_dict(coll_dict)
-            else:
-                print(pd.DataFrame.from_dict(coll_dict))
-        except Exception as e:
-            print('ERROR: An error occured while getting collections')
-            print(e)  
-    
+        self._adaptive = adaptive
+        self._reorder_interval = reorder_interval
+
     ###########################################################################
-    #function to import configurations for collections
+    #function to reorder conditions
     ###########################################################################
-    
-    def import_configurations(self):
+
+    def reorder_conditions(self):
         """
         DESCRIPTION:
-        This function is to import the configuration tables for all
-        collections within the 'collections' list attribute of the rule engine
-        object. 
-        
+        This function is used to order the conditions of each rule by their
+        average evaluation time divided by the rate they fail. Conditions 
+        without statistics are evaluated first and ties keep the order of the
+        decision table.
+
         OUTPUT/RESULT:
-        The result of this function will update the configuration for all
-        collections setup within the rule engine.
+        The result of this function is the conditions of each rule in the 
+        order they are evaluated stored in the 'ordered_conditions' attribute.
         """
-        try:
-            for i in self._collections:
-                i._configuration = collection.import_config_table(i._directory)
-                print_verbose(self._verbose,"Configuration imported for collecion '" + i._name + "'")
-            print('Configurations for all collections imported to rule engine')
-        except Exception as e:
-            print('ERROR: An error occured while importing configurations for collections')
-            print(e)
-            
+        def rank(condition):
+            stats = self._condition_stats.get((condition[0], condition[1]))
+            if stats is None or stats[0] == 0:
+                return 0
+            evaluations, passes, seconds = stats
+            return (seconds / evaluations) / max(1 - passes / evaluations, 1e-9)
+        self._ordered_conditions = [sorted(conditions, key=rank) for rule_name, rule_score, conditions in self._rules]
+
     ###########################################################################
-    #function to run rule engine on data
+    #function to get condition statistics
     ###########################################################################
-    
-    def run(self, data):
+
+    def get_condition_stats(self):
         """
         DESCRIPTION:
-        This function is run the rule engine on a set of data.
-        
-        PARAMETERS:
-        data (dict/dataframe; required) - Input data to pass to the rule 
-        engine.
-        
+        This function is used to get the statistics recorded for each 
+        condition while adaptive ordering is on.
+
         OUTPUT/RESULT:
-        The result of this function will be the output generated by the rule 
-        engine.
+        The result of this function will be a list of dictionaries with the
+        number of evaluations, the pass rate and the average evaluation time 
+        of each condition.
         """
+        return [{'decision_table':self._name,
+                 'column':column,
+                 'condition':condition,
+                 'evaluations':evaluations,
+                 'pass_rate':passes / evaluations if evaluations > 0 else None,
+                 'mean_seconds':seconds / evaluations if evaluations > 0 else None}
+                for (column, condition), (evaluations, passes, seconds) in self._condition_stats.items()]
+
+    ###########################################################################
+    #function to set memoization
+    ###########################################################################
+
+    def set_memoization(self, max_size=10000):
+        """
+        DESCRIPTION:
+        This function is used to set the largest number of results memoized
+        for the decision table. The memoized results are removed.
+
+        PARAMETERS:
+        max_size (int; optional; default:10000) - The largest number of 
+        results memoized.
+
+        OUTPUT/RESULT:
+        The result of this function is an empty memo cache for the decision
+        table.
+        """
+        self._memo_size = max_size
+        self._memo = memo_cache(max_size)
+
+    ###########################################################################
+    #function to get memoization statistics
+    ###########################################################################
+
+    def get_memo_stats(self):
+        """
+        DESCRIPTION:
+        This function is used to get the statistics of the memoized results
+        of the decision table.
+
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of whether or not the
+        decision table can be memoized and the size, hits, misses and hit rate
+        of its memo cache.
+        """
+        return dict({'decision_table':self._name, 'memoizable':self._memo_columns is not None}, 
+                    **self._memo.get_stats())
+
+    ###########################################################################
+    #functions to pickle decision table without code objects
+    ###########################################################################
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ['_vectorized', '_index_column', '_index', '_indexed_rules', '_unindexed_rules', '_ordered_conditions',
+                    '_data_columns', '_memo_columns', '_memo']:
+            state.pop(key, None)
+        state['_rules'] = [(rule_name, rule_score, [(column, condition_string) for column, condition_string, code in conditions])
+                           for rule_name, rule_score, conditions in self._rules]
+        return state
+
+    def __setstate__(self, state):
+        #defaults for decision tables saved before adaptive ordering
+        self._adaptive = False
+        self._reorder_interval = 1000
+        self._applications = 0
+        self._condition_stats = {}
+        self._memo_size = 10000
+        self.__dict__.update(state)
+        self.compile()
+
+###############################################################################
+#interval index class
+###############################################################################
+
+class interval_index():
+    """
+    DESCRIPTION:
+    This class creates 'interval index' objects utilized by decision tables to
+    find the rules whose range condition on a column is met by a number. The
+    bounds of all ranges split the numbers into regions, each bound being a
+    region of its own, and the rules are stored for each region they cover so
+    the rules for a number are found with a binary search of the bounds.
+
+    ATTRIBUTES:
+    intervals (dict; required) - A dictionary of rule positions and their 
+    range as a tuple of the lower bound, whether it is inclusive, the upper 
+    bound and whether it is inclusive. Bounds are Nonetype when unbounded.
+
+    max_size (int; optional; default:Nonetype) - The maximum number of rule
+    positions stored across all regions. No regions are stored when the 
+    ranges overlap so much that the index would be larger.
+
+    points (list) - The sorted bounds of the ranges.
+
+    offsets (memoryview) - The start of the rule positions of each region 
+    within the positions, followed by the end of the last region, or 
+    Nonetype when the index is larger than max_size.
+
+    positions (memoryview) - The rule positions of all regions as 64 bit 
+    integers. The regions are stored in buffers so large indexes can be 
+    memory mapped from a snapshot.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, intervals, max_size=None):
+        self._points = sorted({bound for lower, lower_inclusive, upper, upper_inclusive in intervals.values() 
+                               for bound in (lower, upper) if bound is not None})
+        point_position = {point:i for i, point in enumerate(self._points)}
+        last_region = 2 * len(self._points)
+        #regions are numbered 2i for the numbers below point i and 2i+1 for point i
+        spans = []
+        for position, (lower, lower_inclusive, upper, upper_inclusive) in intervals.items():
+            start = 0 if lower is None else 2 * point_position[lower] + (1 if lower_inclusive == True else 2)
+            end = last_region if upper is None else 2 * point_position[upper] + (1 if upper_inclusive == True else 0)
+            if start <= end:
+                spans.append((position, start, end))
+        self._size = sum(end - start + 1 for position, start, end in spans)
+        self._offsets = None
+        self._positions = None
+        if max_size is not None and self._size > max_size:
+            return
+        regions = [[] for i in range(last_region + 1)]
+        for position, start, end in sorted(spans):
+            for region in range(start, end + 1):
+                regions[region].append(position)
+        self._offsets = memoryview(array.array('q', itertools.accumulate((len(region) for region in regions), initial=0)))
+        self._positions = memoryview(array.array('q', itertools.chain.from_iterable(regions)))
+
+    ###########################################################################
+    #function to get rules for number
+    ###########################################################################
+
+    def get(self, value, default=None):
+        """
+        DESCRIPTION:
+        This function is used to get the rules whose range contains a number,
+        the same way rules are looked up in a hash index.
+
+        PARAMETERS:
+        value (int/float; required) - The number to look up.
+
+        default (varies; optional; default:Nonetype) - The value to return 
+        when no range contains the number.
+
+        OUTPUT/RESULT:
+        The result of this function will be a list of the positions of the 
+        rules. A TypeError is raised for values which are not numbers, or NaN,
+        the same as a hash index raises a TypeError for unhashable values, so
+        all rules are evaluated for them instead.
+        """
+        if not isinstance(value, numbers.Real) or value != value:
+            raise TypeError('interval index value must be a number')
+        i = bisect.bisect_left(self._points, value)
+        region = 2 * i + 1 if i < len(self._points) and self._points[i] == value else 2 * i
+        start, end = self._offsets[region:region + 2].tolist()
+        return self._positions[start:end].tolist() if end > start else default
+
+    ###########################################################################
+    #functions to pickle interval index with buffers
+    ###########################################################################
+
+    def __reduce_ex__(self, protocol):
+        state = self.__dict__.copy()
+        for key in ['_offsets', '_positions']:
+            if state[key] is not None:
+                #buffers are saved out of band in snapshots
+                state[key] = pickle.PickleBuffer(state[key]) if protocol >= 5 else state[key].tobytes()
+        return copyreg.__newobj__, (type(self),), state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for key in ['_offsets', '_positions']:
+            if self.__dict__[key] is not None:
+                self.__dict__[key] = memoryview(self.__dict__[key]).cast('B').cast('q')
+
+###############################################################################
+#memo cache class
+###############################################################################
+
+class memo_cache():
+    """
+    DESCRIPTION:
+    This class creates bounded least recently used caches of the results of 
+    a decision table, keyed on the values of the columns it references. The 
+    cache is safe to use from several threads and is emptied when it is 
+    pickled, so results are never carried over to a decision table which was
+    imported again.
+
+    ATTRIBUTES:
+    max_size (int; optional; default:10000) - The largest number of results
+    kept. The least recently used result is removed when it is full.
+
+    results (ordered dict) - The results by key, least recently used first.
+
+    hits (int) - The number of results found in the cache.
+
+    misses (int) - The number of results not found in the cache.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, max_size=10000):
+        self._max_size = max_size
+        self._results = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    ###########################################################################
+    #functions to get and add results
+    ###########################################################################
+
+    def get(self, key):
+        """
+        DESCRIPTION:
+        This function is used to get a result from the cache.
+
+        PARAMETERS:
+        key (tuple; required) - The key of the result.
+
+        OUTPUT/RESULT:
+        The result of this function will be the result, or Nonetype if it is
+        not in the cache.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self._misses = self._misses + 1
+            else:
+                self._hits = self._hits + 1
+                self._results.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        """
+        DESCRIPTION:
+        This function is used to add a result to the cache, removing the least
+        recently used result when the cache is full.
+
+        PARAMETERS:
+        key (tuple; required) - The key of the result.
+
+        result (table result; required) - The result.
+
+        OUTPUT/RESULT:
+        The result of this function is the result added to the cache.
+        """
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self._max_size:
+                self._results.popitem(last=False)
+
+    ###########################################################################
+    #functions to get statistics and clear cache
+    ###########################################################################
+
+    def get_stats(self):
+        """
+        DESCRIPTION:
+        This function is used to get the statistics of the cache.
+
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of the size, hits,
+        misses and hit rate of the cache.
+        """
+        calls = self._hits + self._misses
+        return {'size':len(self._results),
+                'max_size':self._max_size,
+                'hits':self._hits,
+                'misses':self._misses,
+                'hit_rate':self._hits / calls if calls > 0 else None}
+
+    def clear(self):
+        """
+        DESCRIPTION:
+        This function is used to remove all results and statistics from the 
+        cache.
+
+        OUTPUT/RESULT:
+        The result of this function is an empty cache.
+        """
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __reduce__(self):
+        return memo_cache, (self._max_size,)
+
+###############################################################################
+#engine version class
+###############################################################################
+
+class engine_version():
+    """
+    DESCRIPTION:
+    This class creates 'engine version' objects holding the decision tables
+    and collections of a rule engine at a point in time. A version is not 
+    changed once it is created, so a run using it sees the same decision 
+    tables and configurations from start to finish.
+
+    ATTRIBUTES:
+    number (int; required) - The number of the version, increasing with each
+    reload.
+
+    decision_table_dict (dict; required) - A dictionary of compiled decision
+    table objects.
+
+    collections (list; required) - The collection objects, which are sorted
+    by priority.
+
+    changes (list; optional; default:Nonetype) - The files which changed 
+    since the previous version.
+
+    created (float) - The time the version was created.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, number, decision_table_dict, collections, changes=None):
+        self._number = number
+        self._decision_table_dict = decision_table_dict
+        self._collections = sorted(collections, key=lambda x: x._priority)
+        self._changes = changes if changes is not None else []
+        self._created = time.time()
+
+###############################################################################
+#rule engine class
+###############################################################################
+
+class rule_engine():
+    """
+    DESCRIPTION:
+    This class creates the primary 'rule_engine' object. The rule engine 
+    coordinates the execution of the data structure, collection, and rule 
+    engine components on input data.
+    
+    ATTRIBUTES:
+    
+    main_directory (str; required) - The main directory the rule engine and
+    associated folders and files will be located in.
+    
+    name (str; optional; default:Nonetype) - The name of the rule engine.
+    
+    description (str; required) - A description for the rule engine.
+    
+    dataframe (bool; optional; default:False) - An attribute indicating whether
+    or not the input data will be a dataframe.
+    
+    vectorized (bool; optional; default:True) - An attribute indicating 
+    whether or not decision tables are evaluated a column at a time when the 
+    input data is a dataframe. The results are the same as evaluating each row
+    of the dataframe.
+    
+    verbose (bool; optional; default:True) - Whether or not to print 
+    details when executing rule engine. Primarily used for testing and 
+    validation.
+    
+    tracer (tracer) - The tracer used when verbose is True. Configured with
+    the 'set_tracing' function.
+    
+    errors (error channel) - The error channel errors are recorded to while
+    running the rule engine.
+    
+    parallel_stats (dict) - The timing statistics of the last 'run_parallel'.
+    
+    profiler (profiler) - The profiler the time spent on each component is 
+    recorded to, or Nonetype when profiling is off. Configured with the 
+    'set_profiling' function.
+    
+    stringify (bool) - Whether or not audit trail lists are converted to 
+    strings in dataframe output. Configured with the 'set_output' function.
+    
+    detail (str) - The result detail, 'summary', 'hits' or 'full', which 
+    sets how much of the audit trail is built. Configured with the 
+    'set_output' function.
+    
+    adaptive (bool) - Whether or not decision tables reorder conditions using
+    their statistics. Configured with the 'set_adaptive' function.
+    
+    memo_size (int) - The largest number of results memoized for each 
+    decision table. Configured with the 'set_memoization' function.
+    
+    pruning (bool) - Whether or not only the attributes and expressions the
+    active decision tables need are extracted and executed. Configured with
+    the 'set_pruning' function.
+    
+    required (tuple) - The decision tables and collections the required 
+    columns were last found for, and the required columns.
+    
+    lazy (bool) - Whether or not attributes of a record are extracted when
+    first read rather than up front. Configured with the 'set_lazy' 
+    function.
+    
+    cache_directory (str) - The directory parsed decision tables and 
+    configuration tables are cached in, or Nonetype when they are not cached.
+    Configured with the 'set_import' function.
+    
+    import_workers (int) - The number of workers parsing decision tables and
+    configuration tables. Configured with the 'set_import' function.
+    
+    import_stats (dict) - The timing statistics of each file of the last 
+    import of decision tables and configurations.
+    
+    file_stamps (dict) - The modified time and size of each decision table 
+    and configuration table when it was imported, used to find the files 
+    which changed on reload.
+    
+    version (engine version) - The version of the decision tables and 
+    collections published by the last reload, or Nonetype when the decision
+    tables or collections have been changed since. 
+    
+    data_structure (object; required) - The data structure object associated
+    with the rule engine. Will be added upon creation.
+    
+    decision_table_dict (dict; required) - A dictionary of compiled decision 
+    table objects associated with the rule engine.
+    
+    collections (list, required) - A list of collection objects associated with
+    the rule engine.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+    
+    def __init__(self, main_directory, name=None, description=None, dataframe=False, vectorized=True):
+        self._main_directory = main_directory
+        self._name = name
+        self._description = description
+        self._dataframe = dataframe
+        self._vectorized = vectorized
+        self._verbose = True
+        self._tracer = tracer()
+        self._errors = error_channel()
+        self._parallel_stats = None
+        self._profiler = None
+        self._stringify = False
+        self._detail = 'full'
+        self._adaptive = False
+        self._reorder_interval = 1000
+        self._memo_size = 10000
+        self._pruning = False
+        self._required = None
+        self._lazy = False
+        self._cache_directory = None
+        self._import_workers = 1
+        self._import_executor = 'process'
+        self._import_stats = {'decision_tables':[], 'configurations':[]}
+        self._file_stamps = {}
+        self._version = None
+        self._version_number = 0
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._data_structure = data_structure()
+        self._decision_table_dict = None
+        self._collections = []
+            
+    ###########################################################################
+    #function to add/update attributes to object
+    ###########################################################################
+    
+    def add_attribute(self, name, attribute_path, dtype, default=None, priority=None, function_dictionary=None):
+        """
+        DESCRIPTION:
+        This function is used to add attributes to the data structure 
+        object within the rule engine.
+        
+        PARAMETERS:
+        name (str; required) - The name of the attribute to create.
+        
+        attribute_path (list; required) - The path to the attribute in the 
+        input data specified as a list.
+        
+        dtype (type; required) -  The datatype for the attribute to create.
+        
+        default (varies; optional; default:Nonetype) - The default value to 
+        return if the attribute is missing from the input data. The default 
+        value should match the attribute datatype. 
+        
+        priority (int/float; optional; default:Nonetype) - The priority of the 
+        attribute to create.
+        
+        function_dictionary (dict, optional; default:Nonetype) - The 
+        function_dictionary of the attribute to create.
+        
+        OUTPUT/RESULT:
+        The result of this function is a new attribute within the data 
+        structure object of the rule engine.
+        """
+        self._data_structure.add_attribute(name, attribute_path, dtype, default, priority, function_dictionary)
+    
+    ###########################################################################
+    #function to remove attributes from object
+    ###########################################################################
+    
+    def remove_attribute(self, name):
+        """
+        DESCRIPTION:
+        This function is used to remove attributes from the data structure 
+        object within the rule engind.
+        
+        PARAMETERS:
+        name (str; required) - The name of the attribute to remove from the
+        data structure.
+        
+        OUTPUT/RESULT:
+        The result of this function is the removal of the specified attribute 
+        from the data structure object within the rule engine.
+        """
+        self._data_structure.remove_attribute(name)
+            
+    ###########################################################################
+    #function to get attributes
+    def get_attributes(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return all attributes currently setup
+        within the data structure object within the rule engine.
+        
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of attributes.
+        
+        OUTPUT/RESULT:
+        The result of this function is a list of all attributes and their 
+        attribute values which are configured within the data structure within 
+        the rule engine.
+        """
+        return self._data_structure.get_attributes(return_dataframe)
+            
+    ###########################################################################
+    #function to add/update expressions to object
+    ###########################################################################
+
+    def add_expression(self, name, expression_string, priority=None, test_data=None):
+        """
+        DESCRIPTION:
+        This function is used to add expressions to the data structure 
+        object with the rule engine.
+        
+        PARAMETERS:
+        name (str; required) - The name of the expression to create.
+        
+        expression_string (str; required) - The expression string to execute.
+
+        priority (int/float; optional; default:Nonetype) - The priority of the 
+        expression to create.
+        
+        test_data (dataframe/dict, optional; default:Nonetype) - Test data to 
+        ensure the expression being added is valid. The test data should be a 
+        sample of the input data.The expression will only be added if it passes
+        the validation. If no test_data is provided no vaildation will be 
+        performed and the expression will be added.
+        
+        dataframe (bool; optional; default:False) - A parameter indicating if 
+        the input data for the data structure is a dataframe. This parameter 
+        will be inhereted from the rule engine object, but should be specified 
+        if using the data structure object in a stand alone fashion.
+        
+        OUTPUT/RESULT:
+        The result of this function is a new expression within the data 
+        structure object within the rule engine.
+        """
+        self._data_structure.add_expression(name, expression_string, priority=priority, test_data=test_data, dataframe=self._dataframe)
+
+    ###########################################################################
+    #function to remove expression from object
+    ###########################################################################
+    
+    def remove_expression(self, name):
+        """
+        DESCRIPTION:
+        This function is used to remove expressions from the data structure 
+        object within the rule engine.
+        
+        PARAMETERS:
+        name (str; required) - The name of the expression to remove from the
+        data structure.
+        
+        OUTPUT/RESULT:
+        The result of this function is the removal of the specified expression 
+        from the data structure object within the rule engine.
+        """
+        self._data_structure.remove_expression(name)
+    
+    ###########################################################################
+    #function to print attributes from data structure object
+    ###########################################################################
+    
+    def get_expressions(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return all expressions currently setup
+        within the data structure object of the rule engine.
+        
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of expressions.
+        
+        OUTPUT/RESULT:
+        The result of this function is a list of all expressions and their 
+        attribute values which are configured within the data structure rule
+        engine.
+        """
+        return self._data_structure.get_expressions(return_dataframe)
+        
+    ###########################################################################
+    #function to import decision tables
+    ###########################################################################
+    
+    def import_decision_tables(self):
+        """
+        DESCRIPTION:
+        This function imports decision tables in the 'decision_tables' 
+        directory created by the rule engine.
+        
+        OUTPUT/RESULT:
+        The decision tables are imported, compiled to decision table objects
+        and added to the 'decision_table_dict' rule engine attribute.
+        """
+        try:
+            #create directory
+            directory = self._main_directory + '/decision_tables/'
+            #list items in directory
+            directory_items = os.listdir(directory)
+            files = [(i, directory + i) for i in directory_items if os.path.isfile(directory + i)]
+            #parse changed files and load the rest from the cache
+            decision_table_dict, stats = import_files(files, parse_decision_table, self._cache_directory, 
+                                                      self._import_workers, self._import_executor, 'decision_table')
+            for i, file_stats in zip(decision_table_dict, stats):
+                print_verbose(self._verbose, "Imported decision table '" + i + "'" 
+                              + (' from cache' if file_stats['cached'] == True else '') + ' in ' 
+                              + str(round(file_stats['read_seconds'] + file_stats['parse_seconds'] 
+                                          + file_stats['cache_seconds'], 4)) + ' seconds')
+                decision_table_dict[i].set_adaptive(self._adaptive, self._reorder_interval)
+                decision_table_dict[i].set_memoization(self._memo_size)
+            self._import_stats['decision_tables'] = stats
+            self._file_stamps.update({file_stats['file']:(file_stats['mtime_ns'], file_stats['bytes']) for file_stats in stats})
+            #add dictionary to rule engine object
+            self._decision_table_dict = decision_table_dict
+            self._version = None
+            print('Decision table import successful, '
+                  + str(len(decision_table_dict))
+                  + ' decision tables imported and added to rule engine')
+        except Exception as e:
+            print('ERROR: An error occured while importing decision tables')
+            print(e)  
+    
+    ###########################################################################
+    #function to get decision tables
+    ###########################################################################
+
+    def get_decision_tables(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return all decision tables currently 
+        within the 'decision_table_dict' dictionary.
+        
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of decision tables.
+        
+        OUTPUT/RESULT:
+        The result of this function is a list of all decision tables within the
+        rule engine.
+        """
+        try:
+            tables = {'decision_tables':[]}
+            for table in self._decision_table_dict:
+                tables['decision_tables'].append(table)
+            if return_dataframe == True:
+                return pd.DataFrame.from_dict(tables)
+            else:
+                print(pd.DataFrame.from_dict(tables))
+        except Exception as e:
+            print('ERROR: An error occured while getting dataframes')
+            print(e)  
+            
+    ###########################################################################
+    #function to add collection
+    ###########################################################################
+    
+    def add_collection(self, name, priority, active=True):
+        """
+        DESCRIPTION:
+        This function is used to create and add collection objects to the 
+        collections list of the rule engine object.
+        
+        PARAMETERS:
+        name (str; required) - The name of the collection to create.
+
+        priority (int/float; optional) - The priority of the collection to 
+        create.
+        
+        active (bool; required; default:True) : Parameter to determine whether 
+        or not the collection should be active.
+        
+        OUTPUT/RESULT:
+        The result of this function is a new collection added to the 
+        'collections' attribute of the rule enngine object as well as a new
+        sub-directory and configuration file for the collection. 
+        """
+        try:
+            #create seperate directory for collection
+            directory = self._main_directory + '/collections/' + name + '/'
+            if name not in os.listdir(self._main_directory + '/collections/'):
+                os.mkdir(directory)
+                #add configuration table to directory
+                collection.create_config_table(directory)
+                #create collection object
+                obj = collection(name, directory, priority, active)
+                self._collections.append(obj)
+                self._version = None
+                print("Collection added to rule engine and directory '" + name + "' created, next steps...")
+                print('1 - Populate configuration file')
+                print('2 - Import configurations')
+            else:
+                print('ATTENTION: Collection directory already exists. Directory and configuration table will not be created.')
+                #create collection object
+                obj = collection(name, directory, priority, active)
+                self._collections.append(obj)
+                self._version = None
+                print('Collection added to rule engine, next steps...')
+                print('1 - Populate configuration file')
+                print('2 - Import configurations')
+        except Exception as e:
+            print('ERROR: An error occured while adding collection to rule engine')
+            print(e)  
+    
+    ###########################################################################
+    #function to remove collection
+    ###########################################################################
+    
+    def remove_collection(self, name, remove_directory=False):
+        """
+        DESCRIPTION:
+        This function is used to remove a collection object from the
+        collections list of the rule engine object and the directory for the
+        collection if desired.
+        
+        PARAMETERS:
+        name (str; required) - The name of the collection to remove.
+
+        remove_directory (bool; required; default:False) - Parameter to 
+        determine whether or not the directory and configuraion file for 
+        collection should be removed.
+        
+        OUTPUT/RESULT:
+        The result of this function will be the removal of the specified
+        collection and its directory and configuration file if desired.
+        """
+        try:
+            if len(self._collections) == 0:
+                print('ATTENTION: There are no collections in rule engine')
+            else:
+                #create seperate directory for collection
+                for collection in self._collections:
+                    if collection._name == name:
+                        self._collections.remove(collection)
+                        self._version = None
+                        print("Collection '" + name + "' removed from rule engine collections")
+                        if remove_directory == True:
+                            try:
+                                os.remove(collection._directory + 'configuration_table.csv')
+                                print("Configuration table removed for collection '" + name + "'")
+                                os.rmdir(collection._directory)
+                                print("Directory removed for collection '" + name + "'")
+                            except Exception as e:
+                                print('ERROR: An error occured while removing directory for collection')
+                                print(e) 
+                    else:
+                        print("Collection '" + name + "' not found in rule engine")
+        except Exception as e:
+            print('ERROR: An error occured while removing collection from rule engine')
+            print(e) 
+            
+    ###########################################################################
+    #function to get collections for rule engine
+    ###########################################################################
+    
+    def get_collections(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return all collections and its attributes
+        currently within the 'collections' list of the rule engine object.
+        
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of collections and their
+        attributes.
+        
+        OUTPUT/RESULT:
+        The result of this function is a list of all collections within the
+        rule engine object.
+        """
+        try:
+            coll_dict = {'name':[], 'active':[], 'priority':[], 'directory':[]}
+            for collection in self._collections:
+                coll_dict['name'].append(collection._name)
+                coll_dict['active'].append(collection._active)
+                coll_dict['priority'].append(collection._priority)
+                coll_dict['directory'].append(collection._directory)
+            if return_dataframe == True:
+                return pd.DataFrame.from_dict(coll_dict)
+            else:
+                print(pd.DataFrame.from_dict(coll_dict))
+        except Exception as e:
+            print('ERROR: An error occured while getting collections')
+            print(e)  
+    
+    ###########################################################################
+    #function to import configurations for collections
+    ###########################################################################
+    
+    def import_configurations(self):
+        """
+        DESCRIPTION:
+        This function is to import the configuration tables for all
+        collections within the 'collections' list attribute of the rule engine
+        object. 
+        
+        OUTPUT/RESULT:
+        The result of this function will update the configuration for all
+        collections setup within the rule engine.
+        """
+        try:
+            files = [(i._name + '.configuration_table.csv', i._directory + 'configuration_table.csv') for i in self._collections]
+            #parse changed files and load the rest from the cache
+            configurations, stats = import_files(files, parse_config_table, self._cache_directory, 
+                                                 self._import_workers, self._import_executor, 'configuration')
+            for i, (name, path), file_stats in zip(self._collections, files, stats):
+                i._configuration = configurations[name]
+                print_verbose(self._verbose,"Configuration imported for collecion '" + i._name + "'" 
+                              + (' from cache' if file_stats['cached'] == True else ''))
+            self._import_stats['configurations'] = stats
+            self._file_stamps.update({file_stats['file']:(file_stats['mtime_ns'], file_stats['bytes']) for file_stats in stats})
+            self._version = None
+            print('Configurations for all collections imported to rule engine')
+        except Exception as e:
+            print('ERROR: An error occured while importing configurations for collections')
+            print(e)
+            
+    ###########################################################################
+    #function to run rule engine on data
+    ###########################################################################
+    
+    def run(self, data):
+        """
+        DESCRIPTION:
+        This function is run the rule engine on a set of data.
+        
+        PARAMETERS:
+        data (dict/dataframe; required) - Input data to pass to the rule 
+        engine.
+        
+        OUTPUT/RESULT:
+        The result of this function will be the output generated by the rule 
+        engine.
+        """
+        trace = self.get_tracer()
+        errors = self._errors
+        profiler = self._profiler
         try:
+            #sample record for tracing when input is a single record
+            if self._dataframe != True:
+                trace.sample()
+            #decision tables and collections sorted by priority of the current version
+            version = self.current_version()
+            decision_table_dict, collections_sorted = version._decision_table_dict, version._collections
             #extract attributes from data
-            data = self._data_structure.extract_attributes(data, self._verbose, self._dataframe)
-            #sort collections list by priority
-            collections_sorted = sorted(self._collections, key=lambda x: x._priority)
-            #set output dictionary
-            output = {}
-            if self._dataframe == True:
-                for row, value in data.items():
-                    df_output = {}
+            required = self.get_required(version) if self._pruning == True else None
+            data = self._data_structure.extract_attributes(data, trace, self._dataframe, errors, profiler, required, 
+                                                           self._lazy)
+            if self._dataframe == True and self._vectorized == True:
+                columns = data_columns(list(data.values()))
+                builder = result_builder(list(data.keys()), self._stringify, self._detail)
+                trace.sample(0)
+                for collection in collections_sorted:
+                    if collection._active == False:
+                        if trace._active:
+                            trace("Collection '%s' is not active, continue to next collection", collection._name)
+                        continue
+                    else:
+                        if trace._active:
+                            trace("Executing collection '%s'", collection._name)
+                        results = collection.apply_collection_vectorized(columns=columns,
+                                  decision_table_dictionary = decision_table_dict,
+                                  verbose = trace,
+                                  errors = errors,
+                                  profiler = profiler,
+                                  detail = self._detail)
+                        builder.add_collection(collection._name, results)
+                output = builder.to_df()
+            elif self._dataframe == True:
+                builder = result_builder(list(data.keys()), self._stringify, self._detail)
+                for position, (row, value) in enumerate(data.items()):
+                    trace.sample(position)
                     for collection in collections_sorted:
                         if collection._active == False:
-                            print_verbose(self._verbose,"Collection '" + collection._name + "' is not active, continue to next collection")
+                            if trace._active:
+                                trace("Collection '%s' is not active, continue to next collection", collection._name)
                             continue
                         else:
-                            print_verbose(self._verbose,"Executing collection '" + collection._name + "'")
-                            df_output[collection._name] = collection.apply_collection(data=value, 
-                                  decision_table_dictionary = self._decision_table_dict,
-                                  verbose = self._verbose)
-                            output[row] = df_output
-                output = output_to_df(output, self._dataframe)
+                            if trace._active:
+                                trace("Executing collection '%s'", collection._name)
+                            builder.add(position, collection._name, collection.apply_collection(data=value, 
+                                  decision_table_dictionary = decision_table_dict,
+                                  verbose = trace,
+                                  errors = errors,
+                                  profiler = profiler,
+                                  detail = self._detail))
+                output = builder.to_df()
             else:
-                for collection in collections_sorted:
-                    if collection._active == False:
-                        print_verbose(self._verbose,"Collection '" + collection._name + "' is not active, continue to next collection")
-                        continue
-                    else:
-                        print_verbose(self._verbose,"Executing collection '" + collection._name + "'")
-                        output[collection._name] = collection.apply_collection(data=data, 
-                              decision_table_dictionary = self._decision_table_dict,
-                              verbose = self._verbose)
+                output = self.apply_collections(data, collections_sorted, decision_table_dict, trace, errors, profiler,
+                                                self._detail)
             return output
         except Exception as e:
-            print('ERROR: An error occured while running rule engine')
-            print(e)
+            errors.record('rule_engine', self._name, e)
+    
+    ###########################################################################
+    #function to apply collections to extracted data
+    ###########################################################################
+    
+    def apply_collections(self, data, collections_sorted, decision_table_dictionary, verbose=True, errors=None, profiler=None,
+                          detail='full'):
+        """
+        DESCRIPTION:
+        This function is to apply all active collections to the attributes 
+        extracted from a single record.
+        
+        PARAMETERS:
+        data (dict; required) - The extracted attributes of the record.
+        
+        collections_sorted (list; required) - The collections of the rule 
+        engine sorted by priority.
+        
+        decision_table_dictionary (dict; required) - A dictionary of compiled
+        decision table objects to execute.
+        
+        verbose (bool/tracer; optional; default:True) - Whether or not to 
+        trace details when applying collections.
+        
+        errors (error channel; optional; default:Nonetype) - The error channel
+        errors are recorded to.
+        
+        profiler (profiler; optional; default:Nonetype) - The profiler the 
+        time spent on each collection is recorded to.
+        
+        detail (str; optional; default:'full') - The result detail, 'summary',
+        'hits' or 'full'.
+        
+        OUTPUT/RESULT:
+        The result of this function will be a dictionary of the results of 
+        each collection.
+        """
+        trace = get_tracer(verbose)
+        output = {}
+        for collection in collections_sorted:
+            if collection._active == False:
+                if trace._active:
+                    trace("Collection '%s' is not active, continue to next collection", collection._name)
+                continue
+            else:
+                if trace._active:
+                    trace("Executing collection '%s'", collection._name)
+                output[collection._name] = collection.apply_collection(data=data, 
+                      decision_table_dictionary = decision_table_dictionary,
+                      verbose = trace,
+                      errors = errors,
+                      profiler = profiler,
+                      detail = detail)
+        return output
+    
+    ###########################################################################
+    #function to run rule engine on a stream of data
+    ###########################################################################
+    
+    def run_stream(self, records, batch_size=1000):
+        """
+        DESCRIPTION:
+        This function is to run the rule engine lazily on a stream of records,
+        such as a generator or an open file of JSON lines. Records are read 
+        in micro-batches so setup such as sorting collections and compiling 
+        the extraction plan is done once for each batch instead of once for 
+        each record, and only one batch is held in memory at a time.
+        
+        PARAMETERS:
+        records (iterable; required) - An iterable of dictionaries or JSON 
+        strings, one for each record.
+        
+        batch_size (int; optional; default:1000) - The number of records in 
+        each micro-batch.
+        
+        OUTPUT/RESULT:
+        The result of this function will be a generator. When the rule engine
+        expects a dictionary, it yields the output for each record, the same 
+        as 'run', or Nonetype if the record failed. When the rule engine 
+        expects a dataframe, it yields the output of each micro-batch as a 
+        pandas dataframe indexed by the position of the records in the 
+        stream.
+        """
+        records = iter(records)
+        position = 0
+        while True:
+            batch = [json.loads(record) if isinstance(record, (str, bytes)) else record 
+                     for record in itertools.islice(records, batch_size)]
+            if len(batch) == 0:
+                return
+            #setup once for each batch
+            trace = self.get_tracer()
+            errors = self._errors
+            profiler = self._profiler
+            if self._dataframe == True:
+                output = self.run(pd.DataFrame(batch, index=range(position, position + len(batch))))
+                position = position + len(batch)
+                yield output
+                continue
+            data_structure = self._data_structure
+            if data_structure._plan is None:
+                data_structure.compile()
+            version = self.current_version()
+            decision_table_dictionary, collections_sorted = version._decision_table_dict, version._collections
+            required = self.get_required(version) if self._pruning == True else None
+            for record in batch:
+                trace.sample()
+                try:
+                    data = data_structure.extract_attributes(record, trace, False, errors, profiler, required, self._lazy)
+                    output = self.apply_collections(data, collections_sorted, decision_table_dictionary, trace, errors, 
+                                                    profiler, self._detail)
+                except Exception as e:
+                    errors.record('rule_engine', self._name, e, position)
+                    output = None
+                position = position + 1
+                yield output
+    
+    ###########################################################################
+    #function to run rule engine on data in parallel
+    ###########################################################################
+    
+    def run_parallel(self, data, workers=None, chunksize=None, return_stats=False):
+        """
+        DESCRIPTION:
+        This function is to run the rule engine on a batch of data using a 
+        pool of worker processes. The rule engine is serialized once as a 
+        snapshot and sent to each worker when the worker starts, the data is
+        split into chunks and the output is put back together in the order of
+        the input data.
+        
+        PARAMETERS:
+        data (list/dataframe; required) - Input data to pass to the rule 
+        engine. A list of dictionaries when the rule engine expects a 
+        dictionary, or a dataframe when the rule engine expects a dataframe.
+        
+        workers (int; optional; default:Nonetype) - The number of worker 
+        processes. Defaults to the number of CPUs.
+        
+        chunksize (int; optional; default:Nonetype) - The number of records in
+        each chunk. Defaults to splitting the data into four chunks for each 
+        worker.
+        
+        return_stats (bool; optional; default:False) - Whether or not to 
+        return the timing statistics along with the output.
+        
+        OUTPUT/RESULT:
+        The result of this function will be the output of the rule engine as a
+        pandas dataframe, the same as 'output_to_df' produces. Records which 
+        fail are rows of null values. The timing statistics for worker 
+        startup, engine transfer and each chunk are stored in the 
+        'parallel_stats' attribute and returned as well if return_stats is 
+        True.
+        """
+        #imported here as importing multiprocessing slows down starting workers
+        from concurrent.futures import ProcessPoolExecutor
+        start = time.perf_counter()
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        #serialize rule engine once for all workers with its compiled state
+        engine_bytes = dump_snapshot(self)
+        serialize_seconds = time.perf_counter() - start
+        #split data into chunks
+        length = len(data)
+        chunksize = chunksize if chunksize is not None else max(-(-length // (workers * 4)), 1)
+        if self._dataframe == True:
+            chunks = [data.iloc[i:i + chunksize] for i in range(0, length, chunksize)]
+        else:
+            data = list(data)
+            chunks = [(list(range(i, min(i + chunksize, length))), data[i:i + chunksize]) for i in range(0, length, chunksize)]
+        stats = {'workers':workers,
+                 'chunksize':chunksize,
+                 'chunks':len(chunks),
+                 'records':length,
+                 'engine_bytes':len(engine_bytes),
+                 'serialize_seconds':serialize_seconds,
+                 'worker_startup':[],
+                 'chunk_stats':[]}
+        outputs = []
+        pool_start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker, initargs=(engine_bytes,)) as executor:
+            futures = [executor.submit(run_chunk, position, chunk, time.time()) for position, chunk in enumerate(chunks)]
+            for future in futures:
+                output, chunk_stats, errors, worker_startup, profile = future.result()
+                outputs.append(output)
+                stats['chunk_stats'].append(chunk_stats)
+                if worker_startup is not None:
+                    stats['worker_startup'].append(worker_startup)
+                self._errors.merge(errors)
+                if profile is not None:
+                    self._profiler.merge(profile)
+        stats['pool_seconds'] = time.perf_counter() - pool_start
+        output = pd.concat(outputs) if len(outputs) > 0 else pd.DataFrame()
+        stats['total_seconds'] = time.perf_counter() - start
+        self._parallel_stats = stats
+        print_verbose(self._verbose, 'Scored ' + str(length) + ' records in ' + str(len(chunks)) + ' chunks on ' 
+                      + str(workers) + ' workers in ' + str(round(stats['total_seconds'], 3)) + ' seconds')
+        if return_stats == True:
+            return output, stats
+        return output
+    
+    ###########################################################################
+    #function to set tracing
+    ###########################################################################
+    
+    def set_tracing(self, verbose=True, level=logging.DEBUG, sample_rate=1):
+        """
+        DESCRIPTION:
+        This function is used to configure how the rule engine traces the 
+        execution of its components. Traces are emitted through the 
+        'judge.trace' logger and are only formatted for records which are 
+        traced.
+        
+        PARAMETERS:
+        verbose (bool; optional; default:True) - Whether or not to trace the
+        execution of the rule engine.
+        
+        level (int; optional; default:logging.DEBUG) - The logging level the 
+        traces are emitted at.
+        
+        sample_rate (int; optional; default:1) - Trace 1 in every sample_rate
+        records.
+        
+        OUTPUT/RESULT:
+        The result of this function is an updated tracer for the rule engine.
+        """
+        self._verbose = verbose
+        self._tracer = tracer(enabled=True, level=level, sample_rate=sample_rate)
+        if verbose == True:
+            attach_verbose_handler()
+
+    def get_tracer(self):
+        """
+        DESCRIPTION:
+        This function is used to get the tracer the rule engine traces with,
+        which is silent unless the rule engine is verbose.
+
+        OUTPUT/RESULT:
+        The result of this function will be a tracer.
+        """
+        if self._verbose == True:
+            attach_verbose_handler()
+            return self._tracer
+        return silent_tracer
+
+    ###########################################################################
+    #function to set output
+    ###########################################################################
+
+    def set_output(self, stringify=False, detail='full'):
+        """
+        DESCRIPTION:
+        This function is used to configure the output of the rule engine.
+
+        PARAMETERS:
+        stringify (bool; optional; default:False) - Whether or not to convert
+        the audit trail lists, such as the '_rules' column, to strings. By
+        default they are kept as lists.
+
+        detail (str; optional; default:'full') - How much of the audit trail 
+        is built for each collection. 'full' keeps every decision table met 
+        and every rule evaluated, 'hits' keeps only the decision tables and 
+        rules met, and 'summary' builds no audit trail, so results only have 
+        the collection result, score, tables, hits and rule hits and 
+        dataframe output has no audit trail columns. The results and scores
+        are the same for each.
+
+        OUTPUT/RESULT:
+        The result of this function is updated output settings for the rule
+        engine.
+        """
+        if detail not in ['summary', 'hits', 'full']:
+            raise ValueError("detail must be 'summary', 'hits' or 'full'")
+        self._stringify = stringify
+        self._detail = detail
+
+    ###########################################################################
+    #function to set profiling
+    ###########################################################################
+
+    def set_profiling(self, enabled=True):
+        """
+        DESCRIPTION:
+        This function is used to turn profiling on or off. While on, the calls,
+        hits and time spent on extracting attributes and on each expression, 
+        collection, decision table, rule and condition are recorded. Turning 
+        profiling on again keeps the statistics recorded so far.
+
+        PARAMETERS:
+        enabled (bool; optional; default:True) - Whether or not to profile 
+        the rule engine.
+
+        OUTPUT/RESULT:
+        The result of this function is a profiler for the rule engine, or no
+        profiler when profiling is off.
+        """
+        if enabled == True:
+            if self._profiler is None:
+                self._profiler = profiler()
+        else:
+            self._profiler = None
+
+    ###########################################################################
+    #function to get profile
+    ###########################################################################
+
+    def get_profile(self, return_dataframe=False, return_json=False):
+        """
+        DESCRIPTION:
+        This function is to print or return the statistics recorded while 
+        profiling the rule engine.
+
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of the statistics.
+
+        return_json (bool; optional; default:False) - An option for whether 
+        or not to return the statistics as a JSON string.
+
+        OUTPUT/RESULT:
+        The result of this function is the statistics of each component, 
+        sorted by the time spent.
+        """
+        stats = self._profiler if self._profiler is not None else profiler()
+        if return_json == True:
+            return stats.to_json()
+        if return_dataframe == True:
+            return stats.to_dataframe()
+        else:
+            print(stats.to_dataframe())
+
+    ###########################################################################
+    #function to snapshot profile
+    ###########################################################################
+
+    def snapshot_profile(self, reset=False):
+        """
+        DESCRIPTION:
+        This function is to get a copy of the statistics recorded while 
+        profiling the rule engine.
+
+        PARAMETERS:
+        reset (bool; optional; default:False) - Whether or not to reset the 
+        statistics after taking the snapshot.
+
+        OUTPUT/RESULT:
+        The result of this function will be a list of dictionaries, one for 
+        each component.
+        """
+        if self._profiler is None:
+            return []
+        snapshot = self._profiler.snapshot()
+        if reset == True:
+            self._profiler.reset()
+        return snapshot
+
+    ###########################################################################
+    #function to reset profile
+    ###########################################################################
+
+    def reset_profile(self):
+        """
+        DESCRIPTION:
+        This function is to clear the statistics recorded while profiling the
+        rule engine.
+
+        OUTPUT/RESULT:
+        The result of this function is an empty profiler.
+        """
+        if self._profiler is not None:
+            self._profiler.reset()
+
+    ###########################################################################
+    #function to set import
+    ###########################################################################
+
+    def set_import(self, cache_directory=None, workers=1, executor='process'):
+        """
+        DESCRIPTION:
+        This function is used to configure how decision tables and 
+        configuration tables are imported. With a cache directory, each file
+        is parsed and compiled once and saved to the cache keyed on a hash of
+        its content, so only the files which changed are parsed again by 
+        'import_decision_tables' and 'import_configurations'.
+
+        PARAMETERS:
+        cache_directory (str; optional; default:Nonetype) - The directory to
+        cache parsed files in, or Nonetype to parse every file on import. The
+        directory is created if it does not exist.
+
+        workers (int; optional; default:1) - The number of workers parsing 
+        the files which are not in the cache.
+
+        executor (str; optional; default:'process') - Whether files are parsed
+        on a 'process' or 'thread' pool when there is more than one worker.
+
+        OUTPUT/RESULT:
+        The result of this function is updated import settings for the rule
+        engine.
+        """
+        if executor not in ['process', 'thread']:
+            raise ValueError("executor must be 'process' or 'thread'")
+        if cache_directory is not None:
+            os.makedirs(cache_directory, exist_ok=True)
+        self._cache_directory = cache_directory
+        self._import_workers = max(workers, 1)
+        self._import_executor = executor
+
+    ###########################################################################
+    #function to get import statistics
+    ###########################################################################
+
+    def get_import_stats(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return the timing statistics of each file
+        of the last import of decision tables and configurations.
+
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of the statistics.
+
+        OUTPUT/RESULT:
+        The result of this function is the size of each file, whether it was
+        loaded from the cache and the seconds spent reading, parsing and 
+        caching it.
+        """
+        stats = self._import_stats['decision_tables'] + self._import_stats['configurations']
+        columns = ['component', 'file', 'bytes', 'mtime_ns', 'cached', 'read_seconds', 'parse_seconds', 'cache_seconds']
+        if return_dataframe == True:
+            return pd.DataFrame(stats, columns=columns)
+        else:
+            print(pd.DataFrame(stats, columns=columns))
+
+    ###########################################################################
+    #function to set adaptive ordering
+    ###########################################################################
+
+    def set_adaptive(self, adaptive=True, reorder_interval=1000):
+        """
+        DESCRIPTION:
+        This function is used to turn adaptive ordering of conditions on or 
+        off for all decision tables. Rules stop evaluating at the first 
+        condition which is not met, and with adaptive ordering the conditions
+        which are cheapest and most often not met are evaluated first. The 
+        output of the rule engine is the same either way.
+
+        PARAMETERS:
+        adaptive (bool; optional; default:True) - Whether or not to reorder
+        conditions.
+
+        reorder_interval (int; optional; default:1000) - The number of times
+        a decision table is applied between reordering its conditions.
+
+        OUTPUT/RESULT:
+        The result of this function is updated adaptive settings for the rule
+        engine and its decision tables.
+        """
+        self._adaptive = adaptive
+        self._reorder_interval = reorder_interval
+        for table in (self._decision_table_dict or {}).values():
+            table.set_adaptive(adaptive, reorder_interval)
+
+    ###########################################################################
+    #function to get condition statistics
+    ###########################################################################
+
+    def get_condition_stats(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return the pass rate and average 
+        evaluation time of each condition recorded while adaptive ordering is
+        on.
+
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of the statistics.
+
+        OUTPUT/RESULT:
+        The result of this function is the statistics of each condition of 
+        every decision table.
+        """
+        stats = [row for table in (self._decision_table_dict or {}).values() for row in table.get_condition_stats()]
+        columns = ['decision_table', 'column', 'condition', 'evaluations', 'pass_rate', 'mean_seconds']
+        if return_dataframe == True:
+            return pd.DataFrame(stats, columns=columns)
+        else:
+            print(pd.DataFrame(stats, columns=columns))
+
+    ###########################################################################
+    #function to set memoization
+    ###########################################################################
+
+    def set_memoization(self, max_size=10000):
+        """
+        DESCRIPTION:
+        This function is used to set the largest number of results memoized
+        for each decision table. Results are memoized for the decision tables
+        with 'Memoize' set to True in the configuration table of a collection,
+        keyed on the values of the columns the decision table references, 
+        when the input data is a dictionary or the rule engine is not 
+        vectorized. Decision tables whose conditions call functions which may
+        not be deterministic are never memoized. The memoized results are 
+        removed, and the results of a decision table are also removed when it
+        is imported or reloaded.
+
+        PARAMETERS:
+        max_size (int; optional; default:10000) - The largest number of 
+        results memoized for each decision table. The least recently used 
+        results are removed first.
+
+        OUTPUT/RESULT:
+        The result of this function is updated memoization settings for the 
+        rule engine and its decision tables.
+        """
+        self._memo_size = max_size
+        for table in (self._decision_table_dict or {}).values():
+            table.set_memoization(max_size)
+
+    ###########################################################################
+    #function to get memoization statistics
+    ###########################################################################
+
+    def get_memo_stats(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return the hits and misses of the 
+        memoized results of each decision table.
+
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of the statistics.
+
+        OUTPUT/RESULT:
+        The result of this function is the memoization statistics of every 
+        decision table.
+        """
+        stats = [table.get_memo_stats() for table in (self._decision_table_dict or {}).values()]
+        columns = ['decision_table', 'memoizable', 'size', 'max_size', 'hits', 'misses', 'hit_rate']
+        if return_dataframe == True:
+            return pd.DataFrame(stats, columns=columns)
+        else:
+            print(pd.DataFrame(stats, columns=columns))
+
+    ###########################################################################
+    #function to set pruning
+    ###########################################################################
+
+    def set_pruning(self, enabled=True):
+        """
+        DESCRIPTION:
+        This function is used to turn pruning of attribute extraction on or 
+        off. While on, only the attributes and expressions needed by the 
+        active decision tables of the active collections are extracted and 
+        executed for each record. The columns the decision tables read are 
+        found from their column names and the 'data' keys their conditions 
+        use, and the expressions and attributes needed are found from the 
+        'data' keys each expression reads and writes. The output of the rule
+        engine is the same, but attributes which are not needed are not 
+        extracted, so errors from extracting them are not recorded.
+
+        PARAMETERS:
+        enabled (bool; optional; default:True) - Whether or not to prune 
+        attribute extraction.
+
+        OUTPUT/RESULT:
+        The result of this function is updated pruning settings for the rule
+        engine.
+        """
+        self._pruning = enabled
+
+    ###########################################################################
+    #function to set lazy extraction
+    ###########################################################################
+
+    def set_lazy(self, enabled=True):
+        """
+        DESCRIPTION:
+        This function is used to turn lazy extraction of attributes on or off.
+        While on, and the input data is not a dataframe, each attribute of a
+        record is extracted, with its functions applied and cast to its 
+        datatype, only the first time an expression or condition reads it, 
+        and is kept for the rest of the record. Records which hit an early 
+        rule do not extract the attributes of later rules. Expressions are 
+        still executed up front, so the attributes they read are extracted 
+        for every record. The output of the rule engine is the same, but the
+        time spent extracting attributes is profiled as part of the decision
+        tables reading them, and errors from attributes which are never read
+        are not recorded, including attributes whose default value cannot be
+        cast to their datatype.
+
+        PARAMETERS:
+        enabled (bool; optional; default:True) - Whether or not to extract
+        attributes lazily.
+
+        OUTPUT/RESULT:
+        The result of this function is updated extraction settings for the 
+        rule engine.
+        """
+        self._lazy = enabled
+
+    ###########################################################################
+    #function to get required columns
+    ###########################################################################
+
+    def get_required(self, version=None):
+        """
+        DESCRIPTION:
+        This function is used to get the columns of the extracted data read by
+        the active decision tables of the active collections of a version. 
+        The columns are found again only when the decision tables, 
+        collections or configurations of the version change.
+
+        PARAMETERS:
+        version (engine version; optional; default:Nonetype) - The version to
+        get the required columns of. The current version is used when not 
+        supplied.
+
+        OUTPUT/RESULT:
+        The result of this function will be a frozenset of the required 
+        columns, or Nonetype when a decision table reads columns which cannot
+        be found.
+        """
+        version = version if version is not None else self.current_version()
+        key = (version._decision_table_dict,) + tuple(item for collection in version._collections 
+                                                      for item in (collection, collection._active, collection._configuration))
+        cached = self._required
+        if cached is not None and len(cached[0]) == len(key) and all(map(operator.is_, cached[0], key)):
+            return cached[1]
+        required = set()
+        for collection in version._collections:
+            if collection._active == False:
+                continue
+            for dt_name, config in (collection._configuration or {}).items():
+                table = version._decision_table_dict.get(dt_name) if config['Active'] == True else None
+                if table is None:
+                    continue
+                if table._data_columns is None:
+                    required = None
+                    break
+                required.update(table._data_columns)
+            if required is None:
+                break
+        required = frozenset(required) if required is not None else None
+        self._required = (key, required)
+        return required
+
+    ###########################################################################
+    #function to get pruning
+    ###########################################################################
+
+    def get_pruning(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return whether each attribute and 
+        expression is needed by the active decision tables of the active 
+        collections, and so is extracted or executed while pruning is on.
+
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe.
+
+        OUTPUT/RESULT:
+        The result of this function is whether each attribute and expression
+        is needed.
+        """
+        plan, expressions = self._data_structure.prune(self.get_required())
+        attributes = set(step[0] for step in plan)
+        expressions = set(expression._name for expression in expressions)
+        rows = ([{'component':'attribute', 'name':step[0], 'needed':step[0] in attributes} 
+                 for step in self._data_structure._plan] + 
+                [{'component':'expression', 'name':expression._name, 'needed':expression._name in expressions} 
+                 for expression in self._data_structure._expression_plan])
+        if return_dataframe == True:
+            return pd.DataFrame(rows, columns=['component', 'name', 'needed'])
+        else:
+            print(pd.DataFrame(rows, columns=['component', 'name', 'needed']))
+
+    ###########################################################################
+    #function to get errors
+    ###########################################################################
+    
+    def get_errors(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return the errors recorded while running 
+        the rule engine.
+        
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of errors.
+        
+        OUTPUT/RESULT:
+        The result of this function is a list of the most recent errors 
+        recorded by the rule engine.
+        """
+        return self._errors.get_errors(return_dataframe)
     
+    ###########################################################################
+    #function to clear errors
+    ###########################################################################
+    
+    def clear_errors(self):
+        """
+        DESCRIPTION:
+        This function is to clear the errors recorded while running the rule 
+        engine.
+        
+        OUTPUT/RESULT:
+        The result of this function is an empty error channel.
+        """
+        self._errors.clear()
+    
+    ###########################################################################
+    #function to get current version
+    ###########################################################################
+
+    def current_version(self):
+        """
+        DESCRIPTION:
+        This function is to get the version of the decision tables and 
+        collections to run. A run uses the same version from start to finish,
+        so a reload while it runs does not change its output.
+
+        OUTPUT/RESULT:
+        The result of this function will be the version published by the last
+        reload, or a version of the current decision tables and collections 
+        when they have been changed since.
+        """
+        version = self._version
+        if version is None:
+            version = engine_version(self._version_number, self._decision_table_dict, self._collections)
+        return version
+
+    ###########################################################################
+    #function to reload changed files
+    ###########################################################################
+
+    def reload(self):
+        """
+        DESCRIPTION:
+        This function is to reload the decision tables and configuration 
+        tables which changed since they were imported. Files are found to have
+        changed by their modified time and size. Only the changed decision 
+        tables are compiled, using the cache and workers configured with 
+        'set_import', and a new version of the decision tables and collections
+        is published in a single step once they are all compiled. Runs which
+        started before keep using the version they started with. When a file 
+        fails to import, the current version is kept and the file is imported
+        again on the next reload.
+
+        OUTPUT/RESULT:
+        The result of this function will be a list of the files which were 
+        added, changed or removed.
+        """
+        with self._reload_lock:
+            decision_table_dict = self._decision_table_dict or {}
+            directory = self._main_directory + '/decision_tables/'
+            table_files = [(i, directory + i) for i in os.listdir(directory) if os.path.isfile(directory + i)]
+            config_files = [(i._name + '.configuration_table.csv', i._directory + 'configuration_table.csv') 
+                            for i in self._collections]
+            def changed(path):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    return False
+                return self._file_stamps.get(path) != (stat.st_mtime_ns, stat.st_size)
+            changed_tables = [(name, path) for name, path in table_files if name not in decision_table_dict or changed(path)]
+            removed_tables = [name for name in decision_table_dict if name not in dict(table_files)]
+            changed_configs = [(name, path) for name, path in config_files if changed(path)]
+            changes = ([path for name, path in changed_tables] + [directory + name for name in removed_tables] 
+                       + [path for name, path in changed_configs])
+            if len(changes) == 0 and self._version is not None:
+                return changes
+            #compile changed files before changing anything
+            tables, table_stats = import_files(changed_tables, parse_decision_table, self._cache_directory, 
+                                               self._import_workers, self._import_executor, 'decision_table')
+            configurations, config_stats = import_files(changed_configs, parse_config_table, self._cache_directory, 
+                                                        self._import_workers, self._import_executor, 'configuration')
+            for table in tables.values():
+                table.set_adaptive(self._adaptive, self._reorder_interval)
+                table.set_memoization(self._memo_size)
+            decision_table_dict = {name:tables[name] if name in tables else decision_table_dict[name] 
+                                   for name, path in table_files}
+            collections = []
+            for i, (name, path) in zip(self._collections, config_files):
+                if name in configurations:
+                    #collections of earlier versions are not changed
+                    i = copy.copy(i)
+                    i._configuration = configurations[name]
+                collections.append(i)
+            #publish new version
+            self._version = engine_version(self._version_number + 1, decision_table_dict, collections, changes)
+            self._version_number = self._version_number + 1
+            self._decision_table_dict = decision_table_dict
+            self._collections = collections
+            for name in removed_tables:
+                self._file_stamps.pop(directory + name, None)
+            self._file_stamps.update({file_stats['file']:(file_stats['mtime_ns'], file_stats['bytes']) 
+                                      for file_stats in table_stats + config_stats})
+            self._import_stats = {'decision_tables':table_stats, 'configurations':config_stats}
+            if len(changes) > 0:
+                print_verbose(self._verbose, 'Reloaded ' + str(len(changes)) + ' changed files, rule engine version ' 
+                              + str(self._version_number) + ' published')
+            return changes
+
+    ###########################################################################
+    #functions to watch for changed files
+    ###########################################################################
+
+    def watch(self, interval=1.0):
+        """
+        DESCRIPTION:
+        This function is to reload changed decision tables and configuration
+        tables in a background thread, checking the modified time of the files
+        at an interval. Errors while reloading are recorded to the error 
+        channel of the rule engine.
+
+        PARAMETERS:
+        interval (float; optional; default:1.0) - The number of seconds 
+        between checking for changed files.
+
+        OUTPUT/RESULT:
+        The result of this function is a thread reloading the rule engine 
+        until 'stop_watching' is called.
+        """
+        self.stop_watching()
+        stop = threading.Event()
+        def watch_files():
+            while not stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:
+                    self._errors.record('reload', self._name, e)
+        thread = threading.Thread(target=watch_files, name='judge-reload', daemon=True)
+        self._watcher = (thread, stop)
+        thread.start()
+
+    def stop_watching(self):
+        """
+        DESCRIPTION:
+        This function is to stop reloading changed files in the background.
+
+        OUTPUT/RESULT:
+        The result of this function is the thread started by 'watch' stopped.
+        """
+        if self._watcher is not None:
+            thread, stop = self._watcher
+            stop.set()
+            if thread is not threading.current_thread():
+                thread.join()
+            self._watcher = None
+
+    ###########################################################################
+    #functions to pickle and restore rule engine
+    ###########################################################################
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_reload_lock', None)
+        state['_watcher'] = None
+        state['_required'] = None
+        return state
+
+    def __setstate__(self, state):
+        #attributes added since the rule engine object was saved use defaults
+        self.__init__(state['_main_directory'])
+        self.__dict__.update(state)
+        #rule engines saved before decision tables were compiled at import 
+        #time hold them as dataframes, which are compiled once here
+        for name, table in (self._decision_table_dict or {}).items():
+            if is_dataframe(table):
+                self._decision_table_dict[name] = compile_decision_table(name, table)
 
     ###########################################################################
     #function to create decision table template
@@ -1261,184 +4137,1261 @@ class rule_engine():
             print(e)
 
 ###########################################################################
-#function to convert output to dataframe
+#function to convert output to dataframe
+###########################################################################
+
+def output_to_df(output, dataframe, stringify=False):
+    """
+    DESCRIPTION:
+    This function is to convert the output of the rule engine to a dataframe.
+    
+    PARAMETERS:
+    output (dict; required) - The output of the rule engine.
+    
+    dataframe (bool; required) - A parameter for whether or not the input data
+    is a dataframe
+    
+    stringify (bool; optional; default:False) - Whether or not to convert the
+    audit trail lists to strings.
+    
+    OUTPUT/RESULT:
+    The result of this function will be the rule engine output as a pandas
+    dataframe object.
+    """
+    if dataframe != True:
+        output = {0:output}
+    builder = result_builder(list(output.keys()), stringify)
+    for position, value in enumerate(output.values()):
+        for collection, result in value.items():
+            builder.add(position, collection, result)
+    return builder.to_df()
+
+###########################################################################
+#function to apply single decision table
+###########################################################################
+
+
+
+def apply_decision_table(decision_table, data, run_all=False, verbose=True, errors=None, profiler=None, detail='full',
+                         memoize=False):
+    """
+    DESCRIPTION:
+    This function is to apply a decision tablee to input data.
+    
+    PARAMETERS:
+    decision_table (decision table/dataframe; required) - A compiled decision 
+    table object. A decision table as a dataframe will be compiled before it 
+    is applied.
+    
+    data (dict; required) - Input data for the decision table.
+    
+    run_all (bool, optional; default:False) - A parameter for whether or not
+    to evaluate all rows within the decision table. Default behavior is to
+    exit the decision table when the first row evaluates to True.
+    
+    verbose (bool/tracer; optional; default:True) - Whether or not to trace
+    details when applying decision table. Primarily used for testing and 
+    validation.
+    
+    errors (error channel; optional; default:Nonetype) - The error channel 
+    errors are recorded to.
+    
+    profiler (profiler; optional; default:Nonetype) - The profiler the time 
+    spent on the decision table, its rules and its conditions is recorded to.
+    
+    detail (str; optional; default:'full') - The result detail. The audit 
+    trail holds every rule evaluated when 'full', only the rules met when 
+    'hits', and is not built when 'summary'. The result and score are the 
+    same for each.
+    
+    memoize (bool; optional; default:False) - Whether or not to memoize the
+    result for the values of the columns the decision table references. 
+    Decision tables whose conditions may not be deterministic are never 
+    memoized.
+    
+    OUTPUT/RESULT:
+    The result of this function will be the result of the decision table as a
+    table result object.
+    """
+    trace = get_tracer(verbose)
+    started = time.perf_counter() if profiler is not None else None
+    try:
+        #compile decision table if supplied as a dataframe
+        if is_dataframe(decision_table):
+            decision_table = compile_decision_table(None, decision_table)
+        #use the memoized result for the same values of the referenced columns
+        memo = decision_table._memo if memoize == True and decision_table._memo_columns is not None else None
+        if memo is not None:
+            try:
+                values = [data.get(column, missing) for column in decision_table._memo_columns]
+                key = (run_all, detail, *values, *map(type, values))
+                result = memo.get(key)
+            except TypeError:
+                #values which cannot be hashed are not memoized
+                memo = None
+                result = None
+            if result is not None:
+                if trace._active:
+                    trace('\tMemoized result: %s; Score: %s', result._result, result._score)
+                if profiler is not None:
+                    profiler.record('decision_table', decision_table._name, None, time.perf_counter() - started, result._result)
+                return result
+        #create empty lists for audit trail
+        audit = detail != 'summary'
+        audit_all = detail == 'full'
+        audit_rules = [] if audit == True else None
+        audit_matches = [] if audit == True else None
+        audit_scores = [] if audit == True else None
+        table_hits = 0
+        table_score = 0
+        evaluated = 0
+        #namespace the conditions are evaluated in
+        namespace = {'data':data}
+        rules = decision_table._rules
+        #look up the candidate rules in the index of the decision table
+        index_column = decision_table._index_column
+        candidates = None
+        if index_column is not None:
+            candidates = decision_table.get_candidates(data[index_column])
+            if trace._active:
+                trace('\tIndex column: %s; Value: %s', index_column, data[index_column])
+        if candidates is None:
+            positions = range(len(rules))
+        elif run_all == True:
+            positions = range(len(rules))
+            candidates = set(candidates)
+        else:
+            positions = candidates
+        indexed_rules = decision_table._indexed_rules if candidates is not None else ()
+        #evaluate conditions in the order learned from their statistics
+        adaptive = decision_table._adaptive
+        timed = adaptive == True or profiler is not None
+        if adaptive == True:
+            ordered_conditions = decision_table._ordered_conditions
+            condition_stats = decision_table._condition_stats
+            decision_table._applications = decision_table._applications + 1
+            if decision_table._applications % decision_table._reorder_interval == 0:
+                decision_table.reorder_conditions()
+        for position in positions:
+            rule_name, rule_score, conditions = rules[position]
+            hits = 0
+            rule_start = time.perf_counter() if profiler is not None else None
+            if trace._active:
+                trace('\tEvaluate rule: %s', rule_name)
+            if run_all == True and candidates is not None and position not in candidates:
+                #the indexed condition on the index column is not met
+                if trace._active:
+                    trace('\t\tColumn: %s; Value:%s; Condition: index; Output: False', index_column, data[index_column])
+            else:
+                indexed = position in indexed_rules
+                #stop at the first condition which is not met
+                for column, condition, code in (ordered_conditions[position] if adaptive == True else conditions):
+                    X = data[column]
+                    if indexed == True and column == index_column:
+                        output = True
+                    elif timed == True:
+                        namespace['X'] = X
+                        start = time.perf_counter()
+                        output = bool(eval(code, globals(), namespace))
+                        seconds = time.perf_counter() - start
+                        if adaptive == True:
+                            stats = condition_stats.setdefault((column, condition), [0, 0, 0.0])
+                            stats[0] = stats[0] + 1
+                            stats[1] = stats[1] + output
+                            stats[2] = stats[2] + seconds
+                        if profiler is not None:
+                            profiler.record('condition', decision_table._name, str(column) + ': ' + condition, seconds, output)
+                    else:
+                        namespace['X'] = X
+                        output = bool(eval(code, globals(), namespace))
+                    if trace._active:
+                        trace('\t\tColumn: %s; Value:%s; Condition: %s; Output: %s', column, X, condition, output)
+                    if output == False:
+                        break
+                    hits = hits + 1
+            #store rule result
+            rule_result = bool(len(conditions) == hits)
+            if trace._active:
+                trace('\t\tRULE RESULT: %s; Conditions available: %s; Conditions met: %s', rule_result, len(conditions), hits)
+            if profiler is not None:
+                profiler.record('rule', decision_table._name, rule_name, time.perf_counter() - rule_start, rule_result)
+
+            if run_all == True or rule_result == True:
+                evaluated = evaluated + 1
+                table_hits = table_hits + rule_result
+                table_score = table_score + rule_result*rule_score
+                if audit_all == True or (audit == True and rule_result == True):
+                    audit_rules.append(rule_name)
+                    audit_matches.append(rule_result)
+                    audit_scores.append(rule_score)
+                if run_all != True:
+                    break
+        result = table_result(table_hits > 0, table_score, table_hits, audit_rules, audit_matches, audit_scores, evaluated)
+        if memo is not None:
+            memo.put(key, result)
+        if profiler is not None:
+            profiler.record('decision_table', decision_table._name, None, time.perf_counter() - started, result._result)
+        return result
+    except Exception as e:
+        get_errors(errors).record('decision_table', getattr(decision_table, '_name', None), e)
+        
+###########################################################################
+#function to apply single decision table to columns
+###########################################################################
+
+def apply_decision_table_vectorized(decision_table, columns, run_all=False, verbose=True, profiler=None):
+    """
+    DESCRIPTION:
+    This function is to apply a decision table to all rows of the input data
+    at once. Each condition is evaluated on the whole column of its attribute
+    and the rules are resolved with array operations.
+    
+    PARAMETERS:
+    decision_table (decision table; required) - A compiled decision table 
+    object.
+    
+    columns (data columns; required) - Input data as a data columns object.
+    
+    run_all (bool, optional; default:False) - A parameter for whether or not
+    to evaluate all rows within the decision table. Default behavior is to
+    use the first rule which evaluates to True for each row.
+    
+    verbose (bool/tracer; optional; default:True) - Whether or not to trace
+    details when applying decision table. Primarily used for testing and 
+    validation.
+    
+    profiler (profiler; optional; default:Nonetype) - The profiler the time 
+    spent on the decision table, its rules and its conditions is recorded to.
+    Calls are counted for each row.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a list of boolean arrays with the 
+    result of every rule when run_all is True. Otherwise the result will be an
+    array with the position of the first rule which evaluated to True for each
+    row, or -1 when no rule evaluated to True.
+    """
+    trace = get_tracer(verbose)
+    started = time.perf_counter() if profiler is not None else None
+    length = columns._length
+    matches = []
+    first_hit = np.full(length, -1, dtype=np.int64)
+    unresolved = np.ones(length, dtype=bool)
+    #only evaluate the rules which are candidates for at least one row
+    candidates = None
+    if decision_table._index_column is not None:
+        try:
+            values = set(columns.get_column(decision_table._index_column)[0])
+            candidates = set(decision_table._unindexed_rules)
+            for value in values:
+                candidates.update(decision_table._index.get(value, ()))
+        except TypeError:
+            candidates = None
+    for position, (rule_name, rule_score, conditions) in enumerate(decision_table._rules):
+        if run_all != True and not unresolved.any():
+            break
+        if candidates is not None and position not in candidates:
+            if run_all == True:
+                matches.append(np.zeros(length, dtype=bool))
+            continue
+        rule_result = unresolved.copy()
+        rows = int(rule_result.sum()) if profiler is not None else None
+        rule_start = time.perf_counter() if profiler is not None else None
+        for column, condition, code in (decision_table._ordered_conditions[position] if decision_table._adaptive == True else conditions):
+            if profiler is not None:
+                selected = int(rule_result.sum())
+                start = time.perf_counter()
+                rule_result &= evaluate_condition_vectorized(decision_table, column, condition, code, columns, rule_result)
+                profiler.record('condition', decision_table._name, str(column) + ': ' + condition, 
+                                time.perf_counter() - start, int(rule_result.sum()), selected)
+            else:
+                rule_result &= evaluate_condition_vectorized(decision_table, column, condition, code, columns, rule_result)
+            if not rule_result.any():
+                break
+        if profiler is not None:
+            profiler.record('rule', decision_table._name, rule_name, time.perf_counter() - rule_start, int(rule_result.sum()), rows)
+        if trace._active:
+            trace('\tEvaluated rule: %s; Rows matched: %s', rule_name, int(rule_result.sum()))
+        if run_all == True:
+            matches.append(rule_result)
+        else:
+            first_hit[rule_result] = position
+            unresolved &= ~rule_result
+    if profiler is not None:
+        hits = int(np.any(matches, axis=0).sum()) if run_all == True and len(matches) > 0 else int((first_hit >= 0).sum())
+        profiler.record('decision_table', decision_table._name, None, time.perf_counter() - started, hits, length)
+    return matches if run_all == True else first_hit
+
+###########################################################################
+#function to evaluate condition on column
+###########################################################################
+
+def evaluate_condition_vectorized(decision_table, column, condition, code, columns, rows):
+    """
+    DESCRIPTION:
+    This function is to evaluate a single condition of a decision table on a
+    whole column. Conditions which cannot be evaluated on the column as an 
+    array are evaluated one value at a time for the selected rows.
+    
+    PARAMETERS:
+    decision_table (decision table; required) - The compiled decision table
+    object the condition belongs to.
+    
+    column (str; required) - The attribute name of the condition.
+    
+    condition (str; required) - The condition string.
+    
+    code (code; required) - The compiled condition.
+    
+    columns (data columns; required) - Input data as a data columns object.
+    
+    rows (array; required) - A boolean array of the rows which still need the
+    result of the condition.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a boolean array of the condition 
+    result for each row.
+    """
+    key = (column, condition)
+    if key in columns._conditions:
+        return columns._conditions[key]
+    values, array = columns.get_column(column)
+    vectorized = decision_table._vectorized.get(condition)
+    if vectorized is not None:
+        try:
+            output = eval(vectorized, globals(), {'X':array})
+            if isinstance(output, np.ndarray) and output.dtype == bool and output.shape == (columns._length,):
+                columns._conditions[key] = output
+                return output
+        except Exception:
+            pass
+    #evaluate condition one value at a time
+    output = np.zeros(columns._length, dtype=bool)
+    for row in np.flatnonzero(rows):
+        output[row] = bool(eval(code, globals(), {'data':columns._rows[row], 'X':values[row]}))
+    return output
+
+###########################################################################
+#function to get keys of equality condition
+###########################################################################
+
+def equality_keys(condition):
+    """
+    DESCRIPTION:
+    This function is to get the values an equality condition compares 'X' to,
+    such as "X == 'foo'", "X in [1, 2]" or "X == 1 or X == 2". A value of 'X'
+    meets the condition exactly when it is one of the values, so the rule can
+    be found from the value with a hash index.
+    
+    PARAMETERS:
+    condition (str; required) - The condition string.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a list of the values, or Nonetype if 
+    the condition is not an equality condition.
+    """
+    def is_x(node):
+        return isinstance(node, ast.Name) and node.id == 'X'
+    def constant(node):
+        value = literal_eval(node)
+        if type(value) not in (int, float, bool, str, type(None)):
+            raise ValueError(condition)
+        return value
+    def keys(node):
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.Or):
+            return [key for value in node.values for key in keys(value)]
+        if isinstance(node, ast.Compare) and len(node.ops) == 1:
+            left, op, right = node.left, node.ops[0], node.comparators[0]
+            if isinstance(op, ast.Eq) and is_x(left) and not is_x(right):
+                return [constant(right)]
+            if isinstance(op, ast.Eq) and is_x(right) and not is_x(left):
+                return [constant(left)]
+            if isinstance(op, ast.In) and is_x(left) and isinstance(right, (ast.List, ast.Tuple, ast.Set)):
+                return [constant(element) for element in right.elts]
+        raise ValueError(condition)
+    try:
+        return keys(ast.parse(condition, mode='eval').body)
+    except (SyntaxError, ValueError):
+        return None
+
+###########################################################################
+#function to get range of range condition
+###########################################################################
+
+def range_interval(condition):
+    """
+    DESCRIPTION:
+    This function is to get the range of numbers a range condition on 'X' 
+    contains, such as "X > 0 and X <= 100", "100 < X <= 500" or "X >= 1000".
+    A number meets the condition exactly when it is within the range, so the
+    rule can be found from the number with an interval index.
+    
+    PARAMETERS:
+    condition (str; required) - The condition string.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a tuple of the lower bound, whether 
+    it is inclusive, the upper bound and whether it is inclusive, with 
+    Nonetype for a bound which is not limited, or Nonetype if the condition is 
+    not a range condition.
+    """
+    def is_x(node):
+        return isinstance(node, ast.Name) and node.id == 'X'
+    def number(node):
+        value = literal_eval(node)
+        if type(value) not in (int, float) or value != value:
+            raise ValueError(condition)
+        return value
+    #operators as if 'X' is on the left
+    flipped = {ast.Lt:ast.Gt, ast.LtE:ast.GtE, ast.Gt:ast.Lt, ast.GtE:ast.LtE, ast.Eq:ast.Eq}
+    def comparisons(node):
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            return [comparison for value in node.values for comparison in comparisons(value)]
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            output = []
+            for left, op, right in zip(operands, node.ops, operands[1:]):
+                if type(op) not in flipped:
+                    raise ValueError(condition)
+                if is_x(left) and not is_x(right):
+                    output.append((type(op), number(right)))
+                elif is_x(right) and not is_x(left):
+                    output.append((flipped[type(op)], number(left)))
+                else:
+                    raise ValueError(condition)
+            return output
+        raise ValueError(condition)
+    try:
+        lower, lower_inclusive, upper, upper_inclusive = None, False, None, False
+        for op, value in comparisons(ast.parse(condition, mode='eval').body):
+            if op in (ast.Gt, ast.GtE, ast.Eq):
+                inclusive = op != ast.Gt
+                if lower is None or value > lower or (value == lower and inclusive == False):
+                    lower, lower_inclusive = value, inclusive
+            if op in (ast.Lt, ast.LtE, ast.Eq):
+                inclusive = op != ast.Lt
+                if upper is None or value < upper or (value == upper and inclusive == False):
+                    upper, upper_inclusive = value, inclusive
+        return lower, lower_inclusive, upper, upper_inclusive
+    except (SyntaxError, ValueError):
+        return None
+
+###########################################################################
+#function to vectorize condition
+###########################################################################
+
+def vectorize_condition(condition):
+    """
+    DESCRIPTION:
+    This function is to rewrite a condition so it can be evaluated on a whole
+    column at once. Only comparisons of 'X' with constants joined by 'and', 
+    'or' and 'not' are rewritten, as these give the same result on an array as
+    they do on single values.
+    
+    PARAMETERS:
+    condition (str; required) - The condition string.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a code object for the rewritten 
+    condition, or Nonetype if the condition cannot be rewritten.
+    """
+    def is_x(node):
+        return isinstance(node, ast.Name) and node.id == 'X'
+    def is_constant(node):
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            node = node.operand
+            if not isinstance(node, ast.Constant) or type(node.value) not in (int, float):
+                return False
+        if not isinstance(node, ast.Constant) or type(node.value) not in (int, float, bool, str):
+            return False
+        return not (type(node.value) == int and abs(node.value) > 2**53)
+    def rewrite(node):
+        if isinstance(node, ast.BoolOp):
+            op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+            return reduce(lambda left, right: ast.BinOp(left, op, right), [rewrite(value) for value in node.values])
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ast.UnaryOp(ast.Invert(), rewrite(node.operand))
+        if isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+            parts = []
+            for left, op, right in zip(operands, node.ops, operands[1:]):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    if not is_x(left) or not isinstance(right, (ast.List, ast.Tuple)) or len(right.elts) == 0 or not all(map(is_constant, right.elts)):
+                        raise ValueError(condition)
+                    part = reduce(lambda left, right: ast.BinOp(left, ast.BitOr(), right), 
+                                  [ast.Compare(ast.Name('X', ast.Load()), [ast.Eq()], [element]) for element in right.elts])
+                    parts.append(ast.UnaryOp(ast.Invert(), part) if isinstance(op, ast.NotIn) else part)
+                elif isinstance(op, (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)):
+                    if not (is_x(left) or is_constant(left)) or not (is_x(right) or is_constant(right)) or not (is_x(left) or is_x(right)):
+                        raise ValueError(condition)
+                    parts.append(ast.Compare(left, [op], [right]))
+                else:
+                    raise ValueError(condition)
+            return reduce(lambda left, right: ast.BinOp(left, ast.BitAnd(), right), parts)
+        raise ValueError(condition)
+    try:
+        tree = ast.Expression(rewrite(ast.parse(condition, mode='eval').body))
+        return compile(ast.fix_missing_locations(tree), '<vectorized>', 'eval')
+    except (SyntaxError, ValueError):
+        return None
+
+###########################################################################
+#function to find data referenced by condition
+###########################################################################
+
+#value of the columns missing from the input data in memo keys
+missing = object()
+
+#functions and methods conditions can call and still be memoized
+deterministic_functions = frozenset(['abs', 'all', 'any', 'bool', 'float', 'frozenset', 'int', 'isinstance', 'len', 
+                                     'list', 'max', 'min', 'round', 'set', 'sorted', 'str', 'sum', 'tuple'])
+deterministic_methods = frozenset(['startswith', 'endswith', 'lower', 'upper', 'strip', 'lstrip', 'rstrip', 'isdigit',
+                                   'isalpha', 'isalnum', 'isnumeric', 'isspace', 'count', 'find', 'split', 'replace',
+                                   'get', 'keys', 'values', 'items'])
+
+def condition_references(condition):
+    """
+    DESCRIPTION:
+    This function is to find the values of the input data a condition depends
+    on besides 'X', so results of the condition can be memoized. Conditions 
+    are only memoized when they read 'data' with constant keys and call 
+    deterministic builtins, such as 'len', or string methods of 'X' and 
+    constants. Conditions using any other name, such as 'functions', 
+    'datetime' or 'random', may not give the same result for the same values
+    and are not memoized.
+    
+    PARAMETERS:
+    condition (str; required) - The condition string.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a set of the keys of 'data' the 
+    condition references, or Nonetype if the condition cannot be memoized.
+    """
+    try:
+        tree = ast.parse(condition, mode='eval')
+    except SyntaxError:
+        return None
+    keys = set()
+    lookups = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == 'data':
+            if not isinstance(node.slice, ast.Constant):
+                return None
+            keys.add(node.slice.value)
+            lookups.add(id(node.value))
+        elif isinstance(node, ast.Call):
+            function = node.func
+            if isinstance(function, ast.Name) and function.id in deterministic_functions:
+                continue
+            if (isinstance(function, ast.Attribute) and function.attr in deterministic_methods 
+                and (isinstance(function.value, ast.Constant) or 
+                     (isinstance(function.value, ast.Name) and function.value.id == 'X'))):
+                continue
+            return None
+        elif isinstance(node, ast.Name):
+            if node.id == 'data' and id(node) in lookups:
+                continue
+            if node.id != 'X' and node.id not in deterministic_functions:
+                return None
+        elif isinstance(node, (ast.Lambda, ast.NamedExpr, ast.Await, ast.Yield, ast.YieldFrom)):
+            return None
+    return keys
+
+###########################################################################
+#function to find data read and written by code
 ###########################################################################
 
-def output_to_df(output, dataframe):
+def data_references(source, mode='eval'):
     """
     DESCRIPTION:
-    This function is to convert the output of the rule engine to a dataframe.
+    This function is to find the keys of 'data' a condition or expression 
+    reads and writes, along with the other names it reads and assigns, so 
+    the attributes and expressions a rule engine does not need can be found.
+    Keys are found where 'data' is subscripted with a constant, such as 
+    "data['amount']", used with 'get', such as "data.get('amount')", or 
+    checked for a constant key, such as "'amount' in data". 
     
     PARAMETERS:
-    output (dict; required) - The output of the rule engine.
+    source (str; required) - The condition or expression string.
     
-    dataframe (bool; required) - A parameter for whether or not the input data
-    is a dataframe
+    mode (str; optional; default:'eval') - 'eval' for a condition and 'exec'
+    for an expression.
     
     OUTPUT/RESULT:
-    The result of this function will be the rule engine output as a pandas
-    dataframe object.
+    The result of this function will be a tuple of the keys of 'data' read, 
+    the keys of 'data' written, the names read and the names assigned. The 
+    keys read and written are Nonetype when 'data' is used any other way, 
+    such as being passed to a function, as any key may be read or written.
+    """
+    try:
+        tree = ast.parse(source, mode=mode)
+    except SyntaxError:
+        return None, None, set(), set()
+    reads = set()
+    writes = set()
+    names_read = set()
+    names_written = set()
+    lookups = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name) and node.value.id == 'data':
+            if isinstance(node.slice, ast.Constant):
+                (reads if isinstance(node.ctx, ast.Load) else writes).add(node.slice.value)
+                lookups.add(id(node.value))
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == 'get'
+              and isinstance(node.func.value, ast.Name) and node.func.value.id == 'data'
+              and len(node.args) > 0 and isinstance(node.args[0], ast.Constant)):
+            reads.add(node.args[0].value)
+            lookups.add(id(node.func.value))
+        elif (isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], (ast.In, ast.NotIn))
+              and isinstance(node.left, ast.Constant) and isinstance(node.comparators[0], ast.Name) 
+              and node.comparators[0].id == 'data'):
+            reads.add(node.left.value)
+            lookups.add(id(node.comparators[0]))
+        elif isinstance(node, ast.AugAssign):
+            #augmented assignments read their target as well
+            target = node.target
+            if isinstance(target, ast.Name):
+                names_read.add(target.id)
+            elif (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) and target.value.id == 'data' 
+                  and isinstance(target.slice, ast.Constant)):
+                reads.add(target.slice.value)
+    dynamic = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id == 'data':
+                dynamic = dynamic or id(node) not in lookups
+            elif isinstance(node.ctx, ast.Load):
+                names_read.add(node.id)
+            else:
+                names_written.add(node.id)
+    if dynamic == True:
+        return None, None, names_read, names_written
+    return reads, writes, names_read, names_written
+
+###############################################################################
+#function to create expression namespace
+###############################################################################
+
+#names available to expressions in addition to 'data'
+expression_globals = {'functions':functions,
+                      'pd':pd,
+                      're':re,
+                      'operator':operator,
+                      'reduce':reduce,
+                      'literal_eval':literal_eval}
+
+def expression_namespace(data):
+    """
+    DESCRIPTION:
+    This function is to create the namespace expressions are executed in for
+    a single record. Expressions read and write attributes through 'data', 
+    which is the dictionary of extracted attributes itself, and can use the 
+    'functions' module along with the other names in 'expression_globals'.
+    
+    PARAMETERS:
+    data (dict; required) - The extracted attributes of a record.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a new namespace dictionary.
+    """
+    namespace = expression_globals.copy()
+    namespace['data'] = data
+    return namespace
+
+###############################################################################
+#function to create attribute getter
+###############################################################################
+
+def attribute_getter(attribute_path):
+    """
+    DESCRIPTION:
+    This function is to create a getter for an attribute path. Getters for 
+    paths up to three keys deep index the input data directly instead of 
+    walking the path.
+    
+    PARAMETERS:
+    attribute_path (list; required) - The path to the attribute in the input 
+    data.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a function which returns the value at
+    the attribute path of the input data. The path is stored in the '_path' 
+    attribute of the function.
     """
-    out_dict = {}
-    if dataframe == True:
-        for row, value in output.items():
-            coll_dict = {}
-            for collection, result in value.items():
-                coll_dict[collection + '_result'] = result['collection_result']
-                coll_dict[collection + '_score'] = result['collection_score']
-                coll_dict[collection + '_tables'] = result['collection_tables']
-                coll_dict[collection + '_hits'] = result['collection_hits']
-                coll_dict[collection + '_rule_hits'] = result['rule_hits']
-                coll_dict[collection + '_tables'] = str(result['audit_trail']['decision_tables'])
-                coll_dict[collection + '_table_flags'] = str(result['audit_trail']['flags'])
-                coll_dict[collection + '_table_scores'] = str(result['audit_trail']['scores'])
-                coll_dict[collection + '_rules'] = str(result['audit_trail']['rules'])
-                coll_dict[collection + '_rule_matches'] = str(result['audit_trail']['rule_matches'])
-                coll_dict[collection + '_rule_scores'] = str(result['audit_trail']['rule_scores'])
-                out_dict[row] = coll_dict
+    path = list(attribute_path)
+    if len(path) == 0:
+        getter = lambda data: data
+    elif len(path) == 1:
+        key = path[0]
+        getter = lambda data: data[key]
+    elif len(path) == 2:
+        key_1, key_2 = path
+        getter = lambda data: data[key_1][key_2]
+    elif len(path) == 3:
+        key_1, key_2, key_3 = path
+        getter = lambda data: data[key_1][key_2][key_3]
     else:
-        coll_dict = {}
-        for collection, result in output.items():
-            coll_dict[collection + '_result'] = result['collection_result']
-            coll_dict[collection + '_score'] = result['collection_score']
-            coll_dict[collection + '_tables'] = result['collection_tables']
-            coll_dict[collection + '_hits'] = result['collection_hits']
-            coll_dict[collection + '_rule_hits'] = result['rule_hits']
-            coll_dict[collection + '_tables'] = str(result['audit_trail']['decision_tables'])
-            coll_dict[collection + '_table_flags'] = str(result['audit_trail']['flags'])
-            coll_dict[collection + '_table_scores'] = str(result['audit_trail']['scores'])
-            coll_dict[collection + '_rules'] = str(result['audit_trail']['rules'])
-            coll_dict[collection + '_rule_matches'] = str(result['audit_trail']['rule_matches'])
-            coll_dict[collection + '_rule_scores'] = str(result['audit_trail']['rule_scores'])
-        out_dict[0] = coll_dict
-    return  pd.DataFrame.from_dict(out_dict, orient='index')
+        getter = lambda data: reduce(operator.getitem, path, data)
+    getter._path = path
+    return getter
 
-###########################################################################
-#function to apply single decision table
-###########################################################################
+###############################################################################
+#function to compile decision table
+###############################################################################
+
+def compile_decision_table(name, table):
+    """
+    DESCRIPTION:
+    This function is to compile a decision table dataframe to a decision table
+    object.
+    
+    PARAMETERS:
+    name (str; required) - The name of the decision table.
+    
+    table (dataframe; required) - The decision table as a dataframe.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a compiled decision table object.
+    """
+    return decision_table(name, table)
 
+###############################################################################
+#functions to import decision tables and configuration tables
+###############################################################################
 
+def parse_decision_table(name, content):
+    """
+    DESCRIPTION:
+    This function is to parse and compile a decision table CSV file.
+    
+    PARAMETERS:
+    name (str; required) - The name of the decision table.
+    
+    content (bytes; required) - The content of the CSV file.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a compiled decision table object.
+    """
+    return compile_decision_table(name, pd.read_csv(io.BytesIO(content)))
 
-def apply_decision_table(decision_table, data, run_all=False, verbose=True):
+def parse_config_table(name, content):
     """
     DESCRIPTION:
-    This function is to apply a decision tablee to input data.
+    This function is to parse a configuration table CSV file.
     
     PARAMETERS:
-    decision_table (dataframe; required) - A decision table as a dataframe.
+    name (str; required) - The name of the configuration table.
     
-    data (dict; required) - Input data for the decision table.
+    content (bytes; required) - The content of the CSV file.
     
-    run_all (bool, optional; default:False) - A parameter for whether or not
-    to evaluate all rows within the decision table. Default behavior is to
-    exit the decision table when the first row evaluates to True.
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of configurations for
+    each decision table, sorted by priority.
+    """
+    config_table = pd.read_csv(io.BytesIO(content), index_col = 'Decision Table Filename').sort_values('Priority')
+    return {dt_name: {key: None if is_null(value) else value for key, value in config.items()}
+            for dt_name, config in config_table.to_dict(orient = 'index').items()}
+
+def cache_filename(cache_directory, name, content):
+    """
+    DESCRIPTION:
+    This function is to get the cache file of a parsed file. The cache file is
+    keyed on a hash of the content of the file, the snapshot format version
+    and the version of Python, so a file is parsed again whenever one of them 
+    changes.
     
-    verbose (bool; optional; default:True) - Whether or not to print 
-    details when applying decision table. Primarily used for testing and 
-    validation.
+    PARAMETERS:
+    cache_directory (str; required) - The cache directory.
+    
+    name (str; required) - The name of the file.
+    
+    content (bytes; required) - The content of the file.
     
     OUTPUT/RESULT:
-    The result of this function will be the result of the decision table.
+    The result of this function will be the filename of the cache file.
     """
-    try:
-        #replace na values in decision_table
-        dt = decision_table.where(pd.notnull(decision_table), None).transpose().to_dict()
-        #create empty dictionary for outputs
-        output_dict = {'decision_table_result':None, 
-                       'decision_table_score':None, 
-                       'decision_table_hits':None,
-                       'audit_trail': {'rules':[],
-                                       'match':[],
-                                       'score':[]}}
-        #create counter variable to track cells with condition
-        for rule in range(len(dt)):
-            rule_name = dt[rule]['Rule Name']
-            rule_score = 0 if dt[rule]['Rule Score'] == None else dt[rule]['Rule Score']
-            conditions = 0
-            hit_list = []
-            print_verbose(verbose,'\tEvaluate rule: ' + str(rule_name))
-            for column, condition in dt[rule].items():
-                if column not in ['Rule Name', 'Rule Score'] and condition != None:
-                    conditions = conditions + 1
-                    X = data[column]
-                    output = bool(eval(condition))
-                    print_verbose(verbose,'\t\tColumn: ' + str(column) + '; Value:' + str(X) + '; Condition: ' + str(condition) + '; Output: ' + str(output))
-                    hit_list.append(output)
-            #store rule result
-            rule_result = bool(conditions == sum(hit_list))
-            print_verbose(verbose,'\t\tRULE RESULT: ' + str(rule_result) + '; Conditions available: ' + str(conditions) + '; Conditions met: ' + str(sum(hit_list)))
+    key = hashlib.sha256(struct.pack('<I', snapshot_version) + importlib.util.MAGIC_NUMBER + content).hexdigest()
+    return os.path.join(cache_directory, name + '.' + key + '.snapshot')
+
+def parse_file(parse, name, content, cache_file=None, serialize=False):
+    """
+    DESCRIPTION:
+    This function is to parse a file which is not in the cache and save it 
+    to the cache, removing the cache files of earlier versions of the file.
+    
+    PARAMETERS:
+    parse (function; required) - The function parsing the file, which takes
+    the name and content of the file.
+    
+    name (str; required) - The name of the file.
+    
+    content (bytes; required) - The content of the file.
+    
+    cache_file (str; optional; default:Nonetype) - The cache file to save 
+    the parsed file to, or Nonetype to not cache it.
+    
+    serialize (bool; optional; default:False) - Whether or not to return the
+    parsed file as a snapshot, used when it is parsed in a worker process.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a tuple of the parsed file and a 
+    dictionary of the seconds spent parsing and caching it.
+    """
+    start = time.perf_counter()
+    obj = parse(name, content)
+    parse_seconds = time.perf_counter() - start
+    if cache_file is not None or serialize == True:
+        snapshot = dump_snapshot(obj)
+    if cache_file is not None:
+        write_snapshot(snapshot, cache_file)
+        cache_directory, cache_name = os.path.split(cache_file)
+        for item in os.listdir(cache_directory):
+            #cache files are named <name>.<sha256>.snapshot
+            if (item != cache_name and item.startswith(name + '.') and item.endswith('.snapshot') 
+                and len(item) == len(cache_name)):
+                try:
+                    os.remove(os.path.join(cache_directory, item))
+                except OSError:
+                    pass
+    stats = {'parse_seconds':parse_seconds, 'cache_seconds':time.perf_counter() - start - parse_seconds}
+    return (snapshot if serialize == True else obj), stats
+
+def import_files(files, parse, cache_directory=None, workers=1, executor='process', component=None):
+    """
+    DESCRIPTION:
+    This function is to import files, loading files which have not changed 
+    from the cache and parsing the rest in parallel.
+    
+    PARAMETERS:
+    files (list; required) - A list of tuples of the name and path of each
+    file.
+    
+    parse (function; required) - The function parsing a file, which takes 
+    the name and content of the file.
+    
+    cache_directory (str; optional; default:Nonetype) - The directory of 
+    parsed files, or Nonetype to parse every file.
+    
+    workers (int; optional; default:1) - The number of workers parsing files.
+    
+    executor (str; optional; default:'process') - Whether files are parsed on
+    a 'process' or 'thread' pool when there is more than one worker.
+    
+    component (str; optional; default:Nonetype) - The type of file, added to
+    the timing statistics.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a tuple of a dictionary of the parsed
+    files by name and a list of the timing statistics of each file.
+    """
+    parsed = {}
+    stats = {}
+    misses = []
+    for name, path in files:
+        start = time.perf_counter()
+        with open(path, 'rb') as f:
+            #modified before reading so changes while reading are found on reload
+            modified = os.fstat(f.fileno()).st_mtime_ns
+            content = f.read()
+        cache_file = cache_filename(cache_directory, name, content) if cache_directory is not None else None
+        stats[name] = {'component':component, 'file':path, 'bytes':len(content), 'mtime_ns':modified, 'cached':False, 
+                       'read_seconds':time.perf_counter() - start, 'parse_seconds':0, 'cache_seconds':0}
+        if cache_file is not None and os.path.isfile(cache_file):
+            start = time.perf_counter()
+            try:
+                parsed[name] = load_snapshot(cache_file, memory_map=False)
+                stats[name]['cached'] = True
+                stats[name]['cache_seconds'] = time.perf_counter() - start
+                continue
+            except Exception:
+                pass
+        misses.append((name, path, content, cache_file))
+    if workers > 1 and len(misses) > 1:
+        #imported here as importing multiprocessing slows down starting workers
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        serialize = executor == 'process'
+        pool = ProcessPoolExecutor if serialize == True else ThreadPoolExecutor
+        with pool(max_workers=min(workers, len(misses))) as pool_executor:
+            futures = [pool_executor.submit(parse_file, parse, name, content, cache_file, serialize) 
+                       for name, path, content, cache_file in misses]
+            results = [future.result() for future in futures]
+    else:
+        serialize = False
+        results = [parse_file(parse, name, content, cache_file) for name, path, content, cache_file in misses]
+    for (name, path, content, cache_file), (obj, file_stats) in zip(misses, results):
+        parsed[name] = read_snapshot(obj) if serialize == True else obj
+        stats[name].update(file_stats)
+    #keep the order of the files
+    parsed = {name:parsed[name] for name, path in files}
+    return parsed, [stats[name] for name, path in files]
+
+###############################################################################
+#functions to run rule engine in worker processes
+###############################################################################
+
+#rule engine of the current worker process
+worker_engine = None
+worker_startup = None
+
+def initialize_worker(engine_snapshot, verbose=None, reload_interval=None):
+    """
+    DESCRIPTION:
+    This function is to load the rule engine a single time when a worker 
+    process of 'run_parallel' starts.
+    
+    PARAMETERS:
+    engine_snapshot (bytes/str; required) - The rule engine serialized with 
+    'dump_snapshot', or the filename of a snapshot which is memory mapped.
+    
+    verbose (bool; optional; default:Nonetype) - Whether or not the rule 
+    engine prints details, or Nonetype to keep the setting of the snapshot.
+    
+    reload_interval (float; optional; default:Nonetype) - The number of 
+    seconds between reloading changed decision tables and configurations, 
+    or Nonetype to not reload them.
+    
+    OUTPUT/RESULT:
+    The result of this function is the rule engine of the worker process and 
+    the time it took to load.
+    """
+    global worker_engine, worker_startup
+    start = time.perf_counter()
+    if isinstance(engine_snapshot, str):
+        worker_engine = load_snapshot(engine_snapshot)
+    else:
+        worker_engine = read_snapshot(engine_snapshot)
+    if verbose is not None:
+        worker_engine._verbose = verbose
+    if reload_interval is not None:
+        worker_engine.watch(reload_interval)
+    worker_startup = {'pid':os.getpid(), 'load_seconds':time.perf_counter() - start}
+
+def run_chunk(position, chunk, submitted):
+    """
+    DESCRIPTION:
+    This function is to run the rule engine of the worker process on a chunk
+    of data.
+    
+    PARAMETERS:
+    position (int; required) - The position of the chunk within the input 
+    data.
+    
+    chunk (tuple/dataframe; required) - A dataframe, or a tuple of the 
+    positions and the records of the chunk.
+    
+    submitted (float; required) - The time the chunk was submitted.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a tuple of the output as a dataframe,
+    the timing statistics for the chunk, the errors recorded, the startup 
+    statistics of the worker the first time it runs a chunk and the profile 
+    of the chunk when profiling is on.
+    """
+    global worker_startup
+    started = time.time()
+    start = time.perf_counter()
+    engine = worker_engine
+    engine._errors.clear()
+    if engine._profiler is not None:
+        engine._profiler.reset()
+    if engine._dataframe == True:
+        output = engine.run(chunk)
+        if output is None:
+            output = pd.DataFrame(index=chunk.index)
+        records = len(chunk)
+    else:
+        positions, records_data = chunk
+        builder = result_builder(positions, engine._stringify, engine._detail)
+        for row, record in enumerate(records_data):
+            result = engine.run(record)
+            if result is not None:
+                for collection_name, collection_result in result.items():
+                    builder.add(row, collection_name, collection_result)
+        output = builder.to_df()
+        records = len(positions)
+    chunk_stats = {'chunk':position,
+                   'pid':os.getpid(),
+                   'records':records,
+                   'queue_seconds':started - submitted,
+                   'run_seconds':time.perf_counter() - start}
+    startup, worker_startup = worker_startup, None
+    profile = engine._profiler._stats if engine._profiler is not None else None
+    return output, chunk_stats, list(engine._errors._errors), startup, profile
 
-            if run_all == True:
-                if rule_result == True:
-                    output_dict['audit_trail']['rules'].append(rule_name)
-                    output_dict['audit_trail']['match'].append(rule_result)
-                    output_dict['audit_trail']['score'].append(rule_score)
-                else: 
-                    output_dict['audit_trail']['rules'].append(rule_name)
-                    output_dict['audit_trail']['match'].append(rule_result)
-                    output_dict['audit_trail']['score'].append(rule_score)
-            else: 
-                if rule_result == True:
-                    output_dict['audit_trail']['rules'].append(rule_name)
-                    output_dict['audit_trail']['match'].append(rule_result)
-                    output_dict['audit_trail']['score'].append(rule_score)
-                    break
-        if sum(output_dict['audit_trail']['match']) > 0:
-            output_dict['decision_table_result'] = True
-            output_dict['decision_table_score'] = sum([match*score for match,score in zip(output_dict['audit_trail']['match'],output_dict['audit_trail']['score'])])
-            output_dict['decision_table_hits'] = sum(output_dict['audit_trail']['match'])
-        else:
-            output_dict['decision_table_result'] = False
-            output_dict['decision_table_score'] = sum([match*score for match,score in zip(output_dict['audit_trail']['match'],output_dict['audit_trail']['score'])])
-            output_dict['decision_table_hits'] = sum(output_dict['audit_trail']['match'])
-        return output_dict
-    except Exception as e:
-        print('ERROR: An error occured while applying decision table to data')
-        print(e)          
-        
 ###############################################################################
 #function to save objects
 ###############################################################################
 def save_object(obj, filename):
     """
     DESCRIPTION:
-    This function is to save objects to a pickle file.
+    This function is to save objects to a pickle file.
+    
+    PARAMETERS:
+    obj (object; required) - An object to save.
+    
+    filename (str; required) - The filename the object should be saved as.
+    
+    OUTPUT/RESULT:
+    The result of this function will be an object saved to a file.
+    """
+    with open(filename, 'wb') as output:  # Overwrites any existing file.
+        pickle.dump(obj, output, -1)
+
+###############################################################################
+#function to import object
+###############################################################################
+        
+def import_object(filename):
+    """
+    DESCRIPTION:
+    This function is to import objects from a pickle file.
+    
+    PARAMETERS:
+    filename (str; required) - The filename the object should be imported from.
+    
+    OUTPUT/RESULT:
+    The result of this function will be an object.
+    """
+    with open(filename, 'rb') as f:
+        obj = pickle.load(f)
+    return obj
+
+###############################################################################
+#functions to save and load snapshots
+###############################################################################
+
+#snapshots start with the magic bytes, the format version and the length of
+#the JSON header, followed by the pickled object and its out of band buffers.
+#version 2 added memoization and version 3 the data columns to decision tables
+snapshot_magic = b'JUDGESNP'
+snapshot_version = 3
+snapshot_alignment = 64
+
+class snapshot_pickler(pickle.Pickler):
+    """
+    DESCRIPTION:
+    This class creates pickler objects which keep the compiled state of 
+    decision tables and expressions, so a snapshot is loaded without parsing
+    or compiling conditions again. Code objects are saved with marshal.
+    """
+    def reducer_override(self, obj):
+        if isinstance(obj, types.CodeType):
+            return marshal.loads, (marshal.dumps(obj),)
+        if isinstance(obj, decision_table):
+            return restore_compiled, (type(obj), obj.__dict__)
+        if isinstance(obj, expression):
+            return restore_compiled, (type(obj), obj.to_dict())
+        return NotImplemented
+
+class snapshot_unpickler(pickle.Unpickler):
+    """
+    DESCRIPTION:
+    This class creates unpickler objects for snapshots saved by a different 
+    version of Python or byte order, whose code objects and index buffers 
+    cannot be used, or saved in an earlier format version. Decision tables 
+    and expressions are compiled again from their condition and expression 
+    strings instead.
+    """
+    def find_class(self, module, name):
+        if module == 'marshal' and name == 'loads':
+            return lambda data: None
+        if module == __name__ and name == 'restore_compiled':
+            return restore_recompiled
+        return super().find_class(module, name)
+
+def restore_compiled(cls, state):
+    """
+    DESCRIPTION:
+    This function is to restore a decision table or expression from a 
+    snapshot with its compiled state.
+    
+    PARAMETERS:
+    cls (class; required) - The class of the object.
+    
+    state (dict; required) - The attributes of the object.
+    
+    OUTPUT/RESULT:
+    The result of this function will be the object.
+    """
+    obj = cls.__new__(cls)
+    for name, value in state.items():
+        setattr(obj, name, value)
+    return obj
+
+def restore_recompiled(cls, state):
+    """
+    DESCRIPTION:
+    This function is to restore a decision table or expression from a 
+    snapshot, compiling it again the same way it is restored from a pickle.
+    
+    PARAMETERS:
+    cls (class; required) - The class of the object.
+    
+    state (dict; required) - The attributes of the object.
+    
+    OUTPUT/RESULT:
+    The result of this function will be the object.
+    """
+    obj = cls.__new__(cls)
+    obj.__setstate__(state)
+    return obj
+
+def dump_snapshot(obj):
+    """
+    DESCRIPTION:
+    This function is to serialize an object, usually a rule engine, to a 
+    snapshot. The snapshot holds the compiled state of the object: the 
+    compiled expressions, decision tables with their compiled conditions and
+    indexes, and collection configurations. Large arrays are stored aligned
+    after the pickled object so they can be memory mapped.
+    
+    PARAMETERS:
+    obj (object; required) - An object to serialize.
+    
+    OUTPUT/RESULT:
+    The result of this function will be the snapshot as bytes.
+    """
+    buffers = []
+    data = io.BytesIO()
+    snapshot_pickler(data, protocol=5, buffer_callback=buffers.append).dump(obj)
+    payload = data.getvalue()
+    buffers = [buffer.raw() for buffer in buffers]
+    #offsets are relative to the aligned end of the header
+    offset = len(payload)
+    buffer_offsets = []
+    for buffer in buffers:
+        offset = offset + (-offset % snapshot_alignment)
+        buffer_offsets.append([offset, buffer.nbytes])
+        offset = offset + buffer.nbytes
+    header = json.dumps({'format_version':snapshot_version,
+                         'python_magic':importlib.util.MAGIC_NUMBER.hex(),
+                         'python_version':sys.version.split()[0],
+                         'byteorder':sys.byteorder,
+                         'object':type(obj).__name__,
+                         'name':getattr(obj, '_name', None),
+                         'created':datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                         'payload':[0, len(payload)],
+                         'buffers':buffer_offsets}).encode('utf-8')
+    output = bytearray(snapshot_magic + struct.pack('<II', snapshot_version, len(header)) + header)
+    output.extend(bytes(-len(output) % snapshot_alignment))
+    start = len(output)
+    output.extend(payload)
+    for (offset, length), buffer in zip(buffer_offsets, buffers):
+        output.extend(bytes(start + offset - len(output)))
+        output.extend(buffer)
+    return bytes(output)
+
+def read_snapshot(snapshot):
+    """
+    DESCRIPTION:
+    This function is to load an object from a snapshot. Arrays are loaded as
+    read only views of the snapshot rather than copies. Snapshots saved by a
+    different version of Python, on a machine of a different byte order, or in
+    an earlier format version are compiled again when loaded.
+    
+    PARAMETERS:
+    snapshot (bytes/mmap; required) - The snapshot.
+    
+    OUTPUT/RESULT:
+    The result of this function will be the object.
+    """
+    view = memoryview(snapshot)
+    if bytes(view[:len(snapshot_magic)]) != snapshot_magic:
+        raise ValueError('not a rule engine snapshot')
+    version, header_length = struct.unpack_from('<II', view, len(snapshot_magic))
+    if version > snapshot_version:
+        raise ValueError('snapshot format version ' + str(version) + ' is newer than the supported version ' 
+                         + str(snapshot_version))
+    start = len(snapshot_magic) + 8
+    header = json.loads(bytes(view[start:start + header_length]).decode('utf-8'))
+    start = start + header_length
+    start = start + (-start % snapshot_alignment)
+    offset, length = header['payload']
+    payload = view[start + offset:start + offset + length]
+    buffers = [view[start + offset:start + offset + length] for offset, length in header['buffers']]
+    if (version == snapshot_version and header['python_magic'] == importlib.util.MAGIC_NUMBER.hex() 
+        and header.get('byteorder') == sys.byteorder):
+        return pickle.loads(payload, buffers=buffers)
+    return snapshot_unpickler(io.BytesIO(payload), buffers=buffers).load()
+
+def save_snapshot(obj, filename):
+    """
+    DESCRIPTION:
+    This function is to save an object, usually a rule engine, to a snapshot
+    file, which loads faster than a pickle file saved with 'save_object' 
+    because nothing is compiled when it is loaded.
+    
+    PARAMETERS:
+    obj (object; required) - An object to save.
+    
+    filename (str; required) - The filename the snapshot should be saved as.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a snapshot saved to a file.
+    """
+    write_snapshot(dump_snapshot(obj), filename)
+
+def write_snapshot(snapshot, filename):
+    """
+    DESCRIPTION:
+    This function is to write a snapshot to a file. The snapshot is written 
+    to a temporary file first so a snapshot being loaded is never partial.
+    
+    PARAMETERS:
+    snapshot (bytes; required) - The snapshot from 'dump_snapshot'.
+    
+    filename (str; required) - The filename the snapshot should be saved as.
+    
+    OUTPUT/RESULT:
+    The result of this function will be a snapshot saved to a file.
+    """
+    temporary = filename + '.' + str(os.getpid()) + '.tmp'
+    with open(temporary, 'wb') as output:
+        output.write(snapshot)
+    os.replace(temporary, filename)
+
+def load_snapshot(filename, memory_map=True):
+    """
+    DESCRIPTION:
+    This function is to load an object from a snapshot file. When the file is
+    memory mapped, the arrays of large decision table indexes are read from 
+    the mapped pages, so processes loading the same snapshot share them.
     
     PARAMETERS:
-    obj (object; required) - An object to save.
+    filename (str; required) - The filename the snapshot should be loaded 
+    from.
     
-    filename (str; required) - The filename the object should be saved as.
+    memory_map (bool; optional; default:True) - Whether or not to memory map
+    the file rather than reading it.
     
     OUTPUT/RESULT:
-    The result of this function will be an object saved to a file.
+    The result of this function will be the object.
     """
-    with open(filename, 'wb') as output:  # Overwrites any existing file.
-        pickle.dump(obj, output, -1)
+    with open(filename, 'rb') as f:
+        if memory_map == True:
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            snapshot = f.read()
+    return read_snapshot(snapshot)
 
-###############################################################################
-#function to import object
-###############################################################################
-        
-def import_object(filename):
+def is_snapshot(filename):
     """
     DESCRIPTION:
-    This function is to import objects from a pickle file.
+    This function is to check whether a file is a snapshot or a pickle file.
     
     PARAMETERS:
-    filename (str; required) - The filename the object should be imported from.
+    filename (str; required) - The filename to check.
     
     OUTPUT/RESULT:
-    The result of this function will be an object.
+    The result of this function will be True if the file is a snapshot.
     """
     with open(filename, 'rb') as f:
-        obj = pickle.load(f)
-    return obj
+        return f.read(len(snapshot_magic)) == snapshot_magic
 
 ###############################################################################
 #function to create rule engine
 ###############################################################################
     
-def create_rule_engine(directory, name=None, description=None, dataframe=False, return_object=True):
+def create_rule_engine(directory, name=None, description=None, dataframe=False, return_object=True, vectorized=True):
     """
     DESCRIPTION:
     This function is to create a rule engine object and necessary directories 
@@ -1459,6 +5412,10 @@ def create_rule_engine(directory, name=None, description=None, dataframe=False,
     return_object (required; default:True) - A parameter for whether or not to
     return a rule engine object upon creation.
     
+    vectorized (bool; optional; default:True) - Whether or not the rule engine
+    should evaluate decision tables a column at a time when the input is a 
+    pandas dataframe.
+    
     OUTPUT/RESULT:
     The result of this function is the creation of a rule engine object and all
     necessary directories and files for its setup.
@@ -1486,7 +5443,8 @@ def create_rule_engine(directory, name=None, description=None, dataframe=False,
         obj = rule_engine(main_directory = directory,
                           name = name,
                           description = description,
-                          dataframe = dataframe)
+                          dataframe = dataframe,
+                          vectorized = vectorized)
         save_object(obj, directory + '/rule_engine_object.pkl')
         print('Rule engine created, next steps...')
         print('1 - Assign attributes and expressions to data structure')
@@ -1533,4 +5491,494 @@ def print_verbose(verbose, string):
     """
     if verbose == True:
         print(string)
-            
\ No newline at end of file
+
+
+###############################################################################
+#function to restore objects with slots
+###############################################################################
+
+def set_slots(obj, state):
+    """
+    DESCRIPTION:
+    This function is to restore the attributes of an object with slots from 
+    a pickle. Objects pickled before they had slots have a dictionary of 
+    their attributes as the state, and objects pickled without a 
+    '__getstate__' function have a tuple of Nonetype and the slots.
+    
+    PARAMETERS:
+    obj (object; required) - The object to restore.
+    
+    state (dict/tuple; required) - The state of the object from the pickle.
+    
+    OUTPUT/RESULT:
+    The result of this function is the attributes of the object set from the
+    state. Attributes the object no longer has are ignored.
+    """
+    if isinstance(state, tuple):
+        state = dict(state[1] or {}, **(state[0] or {}))
+    for name, value in state.items():
+        if name in obj.__slots__:
+            setattr(obj, name, value)
+
+###############################################################################
+#function to check for null values
+###############################################################################
+
+def is_null(value):
+    """
+    DESCRIPTION:
+    This function is to check whether a value read from a decision table or
+    configuration table is null.
+    
+    PARAMETERS:
+    value (varies; required) - The value to check.
+    
+    OUTPUT/RESULT:
+    The result of this function is True if the value is None or NaN, otherwise
+    False.
+    """
+    return value is None or (isinstance(value, float) and value != value)
+
+
+###############################################################################
+#loggers for traces and errors
+###############################################################################
+
+class verbose_handler(logging.Handler):
+    """
+    DESCRIPTION:
+    This class creates a logging handler which prints trace messages to the 
+    current standard output, the same way verbose details have always been 
+    printed.
+    """
+    def emit(self, record):
+        try:
+            sys.stdout.write(self.format(record) + '\n')
+        except Exception:
+            self.handleError(record)
+
+trace_logger = logging.getLogger('judge.trace')
+trace_logger.addHandler(logging.NullHandler())
+error_logger = logging.getLogger('judge.errors')
+error_logger.addHandler(logging.NullHandler())
+
+#whether or not verbose tracing has been turned on
+verbose_handler_attached = False
+
+def attach_verbose_handler():
+    """
+    DESCRIPTION:
+    This function is to print traces once verbose tracing is turned on, by
+    attaching a verbose handler to the 'judge.trace' logger the first time 
+    it is called. Loggers are not changed when the module is imported, and 
+    the logger is left as it is when an application has already added 
+    handlers of its own to it.
+    
+    OUTPUT/RESULT:
+    The result of this function is traces printed to standard output.
+    """
+    global verbose_handler_attached
+    if verbose_handler_attached == True:
+        return
+    verbose_handler_attached = True
+    if all(isinstance(handler, logging.NullHandler) for handler in trace_logger.handlers):
+        trace_logger.addHandler(verbose_handler())
+        trace_logger.setLevel(logging.DEBUG)
+        trace_logger.propagate = False
+
+###############################################################################
+#tracer class
+###############################################################################
+
+class tracer():
+    """
+    DESCRIPTION:
+    This class creates 'tracer' objects utilized by the rule engine and its
+    components to trace execution. Messages are passed to the logger with 
+    their arguments, so they are only formatted when a trace is emitted, and 
+    callers check the 'active' attribute before building any arguments.
+    
+    ATTRIBUTES:
+    enabled (bool; optional; default:True) - Whether or not the tracer emits
+    traces.
+    
+    level (int; optional; default:logging.DEBUG) - The logging level traces
+    are emitted at.
+    
+    sample_rate (int; optional; default:1) - Trace 1 in every sample_rate 
+    records.
+    
+    logger (logger; optional; default:'judge.trace') - The logger traces are
+    emitted to.
+    
+    active (bool) - Whether or not the current record is traced.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+    
+    def __init__(self, enabled=True, level=logging.DEBUG, sample_rate=1, logger=trace_logger):
+        self._enabled = enabled
+        self._level = level
+        self._sample_rate = max(int(sample_rate), 1)
+        self._logger = logger
+        self._count = 0
+        self._active = enabled
+    
+    ###########################################################################
+    #function to sample record
+    ###########################################################################
+    
+    def sample(self, record=None):
+        """
+        DESCRIPTION:
+        This function is used to decide whether or not the next record is 
+        traced.
+        
+        PARAMETERS:
+        record (int; optional; default:Nonetype) - The position of the record
+        within the input data. Records are counted by the tracer if no 
+        position is supplied.
+        
+        OUTPUT/RESULT:
+        The result of this function is whether or not the record is traced.
+        """
+        if record is None:
+            record = self._count
+            self._count = self._count + 1
+        self._active = (self._enabled and record % self._sample_rate == 0 
+                        and self._logger.isEnabledFor(self._level))
+        return self._active
+    
+    ###########################################################################
+    #function to emit trace
+    ###########################################################################
+    
+    def __call__(self, message, *args):
+        if self._active:
+            self._logger.log(self._level, message, *args)
+
+###############################################################################
+#error channel class
+###############################################################################
+
+class error_channel():
+    """
+    DESCRIPTION:
+    This class creates 'error channel' objects utilized by the rule engine and
+    its components to record errors which occur while processing records. 
+    Errors are stored as structured records and passed to the 'judge.errors' 
+    logger instead of being printed.
+    
+    ATTRIBUTES:
+    max_errors (int; optional; default:1000) - The number of most recent 
+    errors to keep.
+    
+    errors (deque) - The most recent errors.
+    
+    counts (dict) - The number of errors recorded for each component.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+    
+    def __init__(self, max_errors=1000, logger=error_logger):
+        self._errors = deque(maxlen=max_errors)
+        self._counts = {}
+        self._logger = logger
+    
+    ###########################################################################
+    #function to record error
+    ###########################################################################
+    
+    def record(self, component, name, exception, record=None):
+        """
+        DESCRIPTION:
+        This function is used to record an error.
+        
+        PARAMETERS:
+        component (str; required) - The component the error occured in, e.g.
+        'expression' or 'decision_table'.
+        
+        name (str; required) - The name of the expression, decision table or 
+        other object the error occured in.
+        
+        exception (exception; required) - The exception raised.
+        
+        record (varies; optional; default:Nonetype) - The row index of the 
+        record the error occured on.
+        
+        OUTPUT/RESULT:
+        The result of this function is a new error within the error channel.
+        """
+        error = {'component':component,
+                 'name':name,
+                 'record':record,
+                 'error_type':type(exception).__name__,
+                 'message':str(exception)}
+        self._errors.append(error)
+        self._counts[component] = self._counts.get(component, 0) + 1
+        self._logger.error('%s %s failed: %s', component, name, exception, extra={'judge_error':error})
+    
+    ###########################################################################
+    #function to merge errors
+    ###########################################################################
+    
+    def merge(self, errors):
+        """
+        DESCRIPTION:
+        This function is used to add errors recorded by another error 
+        channel, such as the error channel of a worker process. The errors 
+        are passed to the logger the same way as errors recorded here.
+        
+        PARAMETERS:
+        errors (list; required) - The errors of the other error channel.
+        
+        OUTPUT/RESULT:
+        The result of this function is the errors added to the error channel.
+        """
+        for error in errors:
+            self._errors.append(error)
+            self._counts[error['component']] = self._counts.get(error['component'], 0) + 1
+            self._logger.error('%s %s failed: %s', error['component'], error['name'], error['message'], 
+                               extra={'judge_error':error})
+    
+    ###########################################################################
+    #function to get errors
+    ###########################################################################
+    
+    def get_errors(self, return_dataframe=False):
+        """
+        DESCRIPTION:
+        This function is to print or return the recorded errors.
+        
+        PARAMETERS:
+        return_dataframe (bool; optional; default:False) - An option for 
+        whether or not to return a pandas dataframe of errors.
+        
+        OUTPUT/RESULT:
+        The result of this function is a list of the most recent errors.
+        """
+        if return_dataframe == True:
+            return pd.DataFrame(list(self._errors), columns=['component', 'name', 'record', 'error_type', 'message'])
+        else:
+            print(pd.DataFrame(list(self._errors), columns=['component', 'name', 'record', 'error_type', 'message']))
+    
+    ###########################################################################
+    #function to clear errors
+    ###########################################################################
+    
+    def clear(self):
+        """
+        DESCRIPTION:
+        This function is to clear all recorded errors.
+        
+        OUTPUT/RESULT:
+        The result of this function is an empty error channel.
+        """
+        self._errors.clear()
+        self._counts = {}
+
+###############################################################################
+#profiler class
+###############################################################################
+
+class profiler():
+    """
+    DESCRIPTION:
+    This class creates 'profiler' objects utilized by the rule engine and its
+    components to record the time spent on extracting attributes, each 
+    expression, collection, decision table and condition, along with the hits
+    of each rule. Components only record to a profiler when one is supplied, 
+    so there is no cost when profiling is off.
+    
+    ATTRIBUTES:
+    stats (dict) - A dictionary of (component, name, detail) tuples and a 
+    list of the calls, hits and seconds recorded for them.
+    
+    started (float) - The time the profiler was started or last reset.
+    """
+    #columns of the profile
+    columns = ['component', 'name', 'detail', 'calls', 'hits', 'seconds', 'mean_seconds']
+    
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+    
+    def __init__(self):
+        self._stats = {}
+        self._started = time.time()
+    
+    ###########################################################################
+    #function to record time
+    ###########################################################################
+    
+    def record(self, component, name, detail, seconds, hits=0, calls=1):
+        """
+        DESCRIPTION:
+        This function is used to record the time spent on a component.
+        
+        PARAMETERS:
+        component (str; required) - The type of component, e.g. 'collection'
+        or 'condition'.
+        
+        name (str; required) - The name of the component, or the name of the
+        decision table for rules and conditions.
+        
+        detail (str; required) - The rule name or condition for rules and 
+        conditions, otherwise Nonetype.
+        
+        seconds (float; required) - The time spent.
+        
+        hits (int; optional; default:0) - The number of hits, such as the 
+        number of times the rule or condition was met.
+        
+        calls (int; optional; default:1) - The number of records processed.
+        
+        OUTPUT/RESULT:
+        The result of this function is updated statistics for the component.
+        """
+        stats = self._stats.get((component, name, detail))
+        if stats is None:
+            stats = self._stats[(component, name, detail)] = [0, 0, 0.0]
+        stats[0] = stats[0] + calls
+        stats[1] = stats[1] + hits
+        stats[2] = stats[2] + seconds
+    
+    ###########################################################################
+    #function to merge statistics
+    ###########################################################################
+    
+    def merge(self, stats):
+        """
+        DESCRIPTION:
+        This function is used to add the statistics of another profiler, such
+        as the profiler of a worker process.
+        
+        PARAMETERS:
+        stats (dict; required) - The statistics of the other profiler.
+        
+        OUTPUT/RESULT:
+        The result of this function is updated statistics.
+        """
+        for (component, name, detail), (calls, hits, seconds) in stats.items():
+            self.record(component, name, detail, seconds, hits, calls)
+    
+    ###########################################################################
+    #function to snapshot statistics
+    ###########################################################################
+    
+    def snapshot(self):
+        """
+        DESCRIPTION:
+        This function is used to get a copy of the statistics recorded so far.
+        
+        OUTPUT/RESULT:
+        The result of this function will be a list of dictionaries, one for
+        each component, sorted by the time spent.
+        """
+        rows = [{'component':component,
+                 'name':name,
+                 'detail':detail,
+                 'calls':calls,
+                 'hits':hits,
+                 'seconds':seconds,
+                 'mean_seconds':seconds / calls if calls > 0 else None}
+                for (component, name, detail), (calls, hits, seconds) in self._stats.items()]
+        return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+    
+    ###########################################################################
+    #function to reset statistics
+    ###########################################################################
+    
+    def reset(self):
+        """
+        DESCRIPTION:
+        This function is used to clear the statistics recorded so far.
+        
+        OUTPUT/RESULT:
+        The result of this function is an empty profiler.
+        """
+        self._stats = {}
+        self._started = time.time()
+    
+    ###########################################################################
+    #functions to export statistics
+    ###########################################################################
+    
+    def to_dataframe(self):
+        """
+        DESCRIPTION:
+        This function is used to export the statistics to a dataframe.
+        
+        OUTPUT/RESULT:
+        The result of this function will be a pandas dataframe of the 
+        statistics, one row for each component.
+        """
+        return pd.DataFrame(self.snapshot(), columns=self.columns)
+    
+    def to_json(self, filename=None):
+        """
+        DESCRIPTION:
+        This function is used to export the statistics as JSON.
+        
+        PARAMETERS:
+        filename (str; optional; default:Nonetype) - A file to write the JSON
+        to.
+        
+        OUTPUT/RESULT:
+        The result of this function will be the statistics as a JSON string,
+        along with the time profiling started.
+        """
+        output = json.dumps({'started':self._started, 'stats':self.snapshot()}, default=str)
+        if filename is not None:
+            with open(filename, 'w') as f:
+                f.write(output)
+        return output
+
+#tracers and error channel used when components are not run by a rule engine
+verbose_tracer = tracer(enabled=True)
+silent_tracer = tracer(enabled=False)
+default_errors = error_channel()
+
+###############################################################################
+#function to get tracer
+###############################################################################
+
+def get_tracer(verbose):
+    """
+    DESCRIPTION:
+    This function is to get the tracer for a verbose parameter, which can be 
+    a tracer or a bool.
+    
+    PARAMETERS:
+    verbose (bool/tracer; required) - The verbose parameter of the component.
+    
+    OUTPUT/RESULT:
+    The result of this function is the tracer, the verbose tracer if verbose
+    is True, or the silent tracer.
+    """
+    if isinstance(verbose, tracer):
+        return verbose
+    if verbose == True:
+        attach_verbose_handler()
+        return verbose_tracer
+    return silent_tracer
+
+###############################################################################
+#function to get error channel
+###############################################################################
+
+def get_errors(errors):
+    """
+    DESCRIPTION:
+    This function is to get the error channel for an errors parameter.
+    
+    PARAMETERS:
+    errors (error channel; required) - The errors parameter of the component.
+    
+    OUTPUT/RESULT:
+    The result of this function is the error channel, or the default error 
+    channel if no error channel was supplied.
+    """
+    return default_errors if errors is None else errors
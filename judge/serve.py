@@ -0,0 +1,619 @@
+# -*- coding: utf-8 -*-
+"""
+Scoring server for rule engines saved with 'save_snapshot' or 'save_object'.
+
+Run with:
+    python -m judge.serve rule_engine.snapshot --port 8080
+    python -m judge.serve rule_engine_object.pkl --port 8080
+    python -m judge.serve rule_engine_object.pkl --unix /tmp/judge.sock
+
+Records are sent as JSON in the body of a POST request to '/score', either a
+single record or a list of records. Concurrent requests are combined into
+micro-batches which are scored on a pool of workers so the event loop is never
+blocked by scoring.
+"""
+#for the server
+import asyncio
+import argparse
+import json
+import os
+import time
+#for scoring batches
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+#rule engine
+from judge import rule_engine
+
+
+###############################################################################
+#function to score batch in worker
+###############################################################################
+
+def score_batch(records):
+    """
+    DESCRIPTION:
+    This function is to score a micro-batch of records with the rule engine
+    loaded by the worker.
+
+    PARAMETERS:
+    records (list; required) - A list of records as dictionaries.
+
+    OUTPUT/RESULT:
+    The result of this function will be a list with the output for each
+    record. Records which fail are returned as Nonetype.
+    """
+    engine = rule_engine.worker_engine
+    if engine._dataframe == True:
+        output = engine.run(rule_engine.pd.DataFrame(records))
+        if output is None:
+            return [None] * len(records)
+        output = output.reindex(range(len(records)))
+        return [{key: value for key, value in row.items() if not rule_engine.is_null(value)}
+                for row in output.to_dict(orient='records')]
+    return list(engine.run_stream(records, batch_size=len(records)))
+
+###############################################################################
+#function to convert output to json
+###############################################################################
+
+def to_json(obj):
+    """
+    DESCRIPTION:
+    This function is to convert rule engine output to JSON. Collection 
+    results are converted to dictionaries, numpy values are converted to 
+    python values and any other value is converted to a string.
+
+    PARAMETERS:
+    obj (varies; required) - The output to convert.
+
+    OUTPUT/RESULT:
+    The result of this function will be the output as JSON encoded bytes.
+    """
+    def default(value):
+        if hasattr(value, 'to_dict'):
+            return value.to_dict()
+        if hasattr(value, 'item'):
+            return value.item()
+        return str(value)
+    return json.dumps(obj, default=default).encode()
+
+###############################################################################
+#micro batcher class
+###############################################################################
+
+class micro_batcher():
+    """
+    DESCRIPTION:
+    This class creates 'micro batcher' objects utilized by the scoring server.
+    Records from concurrent requests are queued and combined into batches of
+    up to max_batch records, waiting no longer than max_wait seconds for a
+    batch to fill. Each batch is scored on the executor.
+
+    ATTRIBUTES:
+    executor (executor; required) - The process or thread pool batches are
+    scored on.
+
+    max_batch (int; optional; default:64) - The maximum number of records in a
+    batch.
+
+    max_wait (float; optional; default:0.005) - The maximum number of seconds
+    to wait for a batch to fill once it has its first record.
+
+    max_in_flight (int; optional; default:1) - The maximum number of batches
+    being scored at the same time.
+
+    stats (dict) - Counts of the requests, records and batches scored.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, executor, max_batch=64, max_wait=0.005, max_in_flight=1):
+        self._executor = executor
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue = asyncio.Queue()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._task = None
+        self._batches = set()
+        self._stats = {'records':0, 'batches':0, 'largest_batch':0, 'errors':0}
+
+    ###########################################################################
+    #function to start batching
+    ###########################################################################
+
+    def start(self):
+        """
+        DESCRIPTION:
+        This function is used to start the task which collects batches.
+
+        OUTPUT/RESULT:
+        The result of this function is a running batching task.
+        """
+        self._task = asyncio.get_running_loop().create_task(self.collect())
+
+    ###########################################################################
+    #function to score record
+    ###########################################################################
+
+    async def score(self, record):
+        """
+        DESCRIPTION:
+        This function is used to queue a record and wait for its output.
+
+        PARAMETERS:
+        record (dict; required) - The record to score.
+
+        OUTPUT/RESULT:
+        The result of this function will be the output of the record.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    ###########################################################################
+    #function to collect batches
+    ###########################################################################
+
+    async def collect(self):
+        """
+        DESCRIPTION:
+        This function is used to collect queued records into batches and
+        score them until the batching task is cancelled.
+
+        OUTPUT/RESULT:
+        The result of this function is every queued record being scored.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._in_flight.acquire()
+            task = loop.create_task(self.run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    ###########################################################################
+    #function to score batch
+    ###########################################################################
+
+    async def run_batch(self, batch):
+        """
+        DESCRIPTION:
+        This function is used to score a batch on the executor and pass the
+        output of each record to the request waiting for it.
+
+        PARAMETERS:
+        batch (list; required) - A list of (record, future) tuples.
+
+        OUTPUT/RESULT:
+        The result of this function is the output of each record set on its
+        future.
+        """
+        try:
+            outputs = await asyncio.get_running_loop().run_in_executor(self._executor, score_batch, [record for record, future in batch])
+            for (record, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+        except Exception as e:
+            self._stats['errors'] = self._stats['errors'] + 1
+            for record, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._in_flight.release()
+            self._stats['records'] = self._stats['records'] + len(batch)
+            self._stats['batches'] = self._stats['batches'] + 1
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+
+###############################################################################
+#scoring server class
+###############################################################################
+
+class scoring_server():
+    """
+    DESCRIPTION:
+    This class creates the 'scoring server' object. The scoring server accepts
+    HTTP requests over TCP or a Unix socket and scores the records with a rule
+    engine using a micro batcher.
+
+    ENDPOINTS:
+    POST /score - Score a record, or a list of records, sent as JSON.
+    GET /health - Check the server is running.
+    GET /stats - Counts of the requests, records and batches scored.
+
+    ATTRIBUTES:
+    engine_file (str; required) - The filename of the rule engine saved with
+    'save_snapshot' or 'save_object'.
+
+    workers (int; optional; default:Nonetype) - The number of workers scoring
+    batches. Defaults to the number of CPUs.
+
+    executor (str; optional; default:'process') - Whether batches are scored
+    on a 'process' or 'thread' pool.
+
+    max_batch (int; optional; default:64) - The maximum number of records in a
+    batch.
+
+    max_wait (float; optional; default:0.005) - The maximum number of seconds
+    to wait for a batch to fill.
+
+    reload_interval (float; optional; default:Nonetype) - The number of 
+    seconds between reloading changed decision tables and configurations in
+    each worker, or Nonetype to not reload them.
+
+    max_body (int; optional; default:10485760) - The maximum size of a 
+    request body in bytes. Larger requests are answered with 413 without 
+    reading their body.
+    """
+    ###########################################################################
+    #initiate self
+    ###########################################################################
+
+    def __init__(self, engine_file, workers=None, executor='process', max_batch=64, max_wait=0.005, reload_interval=None,
+                 max_body=10485760):
+        self._engine_file = engine_file
+        self._workers = workers if workers is not None else (os.cpu_count() or 1)
+        self._executor_type = executor
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._reload_interval = reload_interval
+        self._max_body = max_body
+        self._executor = None
+        self._batcher = None
+        self._servers = []
+        self._requests = 0
+
+    ###########################################################################
+    #function to start server
+    ###########################################################################
+
+    async def start(self, host=None, port=None, unix_path=None):
+        """
+        DESCRIPTION:
+        This function is used to load the rule engine into the workers and
+        start listening for requests.
+
+        PARAMETERS:
+        host (str; optional; default:Nonetype) - The host to listen on.
+
+        port (int; optional; default:Nonetype) - The port to listen on. The
+        port used is available from the 'ports' function when 0 is supplied.
+
+        unix_path (str; optional; default:Nonetype) - The path of a Unix
+        socket to listen on.
+
+        OUTPUT/RESULT:
+        The result of this function is a running scoring server.
+        """
+        #check the rule engine can be loaded before starting workers
+        if rule_engine.is_snapshot(self._engine_file):
+            rule_engine.load_snapshot(self._engine_file)
+            #workers memory map the snapshot so they share its pages
+            engine_snapshot = self._engine_file
+        else:
+            engine_snapshot = rule_engine.dump_snapshot(rule_engine.import_object(self._engine_file))
+        if self._executor_type == 'thread':
+            rule_engine.initialize_worker(engine_snapshot, False, self._reload_interval)
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers,
+                                                 initializer=rule_engine.initialize_worker,
+                                                 initargs=(engine_snapshot, False, self._reload_interval))
+            #start the workers before listening so forked workers do not
+            #inherit the sockets of client connections
+            await asyncio.get_running_loop().run_in_executor(self._executor, os.getpid)
+        self._batcher = micro_batcher(self._executor, self._max_batch, self._max_wait, self._workers)
+        self._batcher.start()
+        if port is not None:
+            self._servers.append(await asyncio.start_server(self.handle, host, port))
+        if unix_path is not None:
+            self._servers.append(await asyncio.start_unix_server(self.handle, unix_path))
+
+    ###########################################################################
+    #function to get ports
+    ###########################################################################
+
+    def ports(self):
+        """
+        DESCRIPTION:
+        This function is used to get the TCP ports the server is listening on.
+
+        OUTPUT/RESULT:
+        The result of this function will be a list of ports.
+        """
+        return [sock.getsockname()[1] for server in self._servers for sock in server.sockets
+                if isinstance(sock.getsockname(), tuple)]
+
+    ###########################################################################
+    #function to stop server
+    ###########################################################################
+
+    async def stop(self):
+        """
+        DESCRIPTION:
+        This function is used to stop listening and shut down the workers.
+
+        OUTPUT/RESULT:
+        The result of this function is a stopped scoring server.
+        """
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        if self._batcher is not None and self._batcher._task is not None:
+            self._batcher._task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._executor_type == 'thread' and rule_engine.worker_engine is not None:
+            rule_engine.worker_engine.stop_watching()
+
+    ###########################################################################
+    #function to handle connection
+    ###########################################################################
+
+    async def handle(self, reader, writer):
+        """
+        DESCRIPTION:
+        This function is used to handle the HTTP requests of a connection.
+        Connections are kept open between requests unless the client asks for
+        them to be closed.
+
+        PARAMETERS:
+        reader (stream reader; required) - The stream the requests are read
+        from.
+
+        writer (stream writer; required) - The stream the responses are
+        written to.
+
+        OUTPUT/RESULT:
+        The result of this function is a response to every request of the
+        connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split(' ', 2)
+                    headers = {}
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        key, value = line.decode('latin-1').split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+                    length = int(headers.get('content-length', 0))
+                    if length < 0:
+                        raise ValueError('invalid content length')
+                except ValueError as e:
+                    #the rest of a malformed request cannot be read reliably
+                    await self.write_response(writer, '400 Bad Request', to_json({'error':'malformed request: ' + str(e)}), False)
+                    break
+                if length > self._max_body:
+                    #the body is not read, so the connection is closed
+                    await self.write_response(writer, '413 Payload Too Large', 
+                                              to_json({'error':'request body larger than ' + str(self._max_body) + ' bytes'}), False)
+                    break
+                body = await reader.readexactly(length)
+                status, response = await self.respond(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self.write_response(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    ###########################################################################
+    #function to write response
+    ###########################################################################
+
+    async def write_response(self, writer, status, response, keep_alive):
+        """
+        DESCRIPTION:
+        This function is used to write a response to a connection.
+
+        PARAMETERS:
+        writer (stream writer; required) - The stream the response is written
+        to.
+
+        status (str; required) - The HTTP status of the response.
+
+        response (bytes; required) - The JSON response.
+
+        keep_alive (bool; required) - Whether or not the connection is kept 
+        open for more requests.
+
+        OUTPUT/RESULT:
+        The result of this function is the response written to the 
+        connection.
+        """
+        writer.write(('HTTP/1.1 ' + status + '\r\n'
+                      'Content-Type: application/json\r\n'
+                      'Content-Length: ' + str(len(response)) + '\r\n'
+                      'Connection: ' + ('keep-alive' if keep_alive else 'close') + '\r\n\r\n').encode('latin-1') + response)
+        await writer.drain()
+
+    ###########################################################################
+    #function to respond to request
+    ###########################################################################
+
+    async def respond(self, method, path, body):
+        """
+        DESCRIPTION:
+        This function is used to create the response to a single request.
+
+        PARAMETERS:
+        method (str; required) - The HTTP method of the request.
+
+        path (str; required) - The path of the request.
+
+        body (bytes; required) - The body of the request.
+
+        OUTPUT/RESULT:
+        The result of this function will be a tuple of the HTTP status and the
+        JSON response.
+        """
+        self._requests = self._requests + 1
+        if method == 'GET' and path == '/health':
+            return '200 OK', to_json({'status':'ok'})
+        if method == 'GET' and path == '/stats':
+            return '200 OK', to_json(dict(self._batcher._stats, requests=self._requests))
+        if method != 'POST' or path != '/score':
+            return '404 Not Found', to_json({'error':'not found'})
+        try:
+            records = json.loads(body)
+        except ValueError as e:
+            return '400 Bad Request', to_json({'error':str(e)})
+        try:
+            if isinstance(records, list):
+                output = await asyncio.gather(*[self._batcher.score(record) for record in records])
+            else:
+                output = await self._batcher.score(records)
+        except Exception as e:
+            return '500 Internal Server Error', to_json({'error':str(e)})
+        return '200 OK', to_json(output)
+
+###############################################################################
+#function to send request to server
+###############################################################################
+
+async def request(record, host='127.0.0.1', port=8080, unix_path=None, path='/score'):
+    """
+    DESCRIPTION:
+    This function is a simple client for the scoring server. It sends a single
+    request on a new connection.
+
+    PARAMETERS:
+    record (dict/list; required) - The record or list of records to score.
+
+    host (str; optional; default:'127.0.0.1') - The host of the server.
+
+    port (int; optional; default:8080) - The port of the server.
+
+    unix_path (str; optional; default:Nonetype) - The path of the Unix socket
+    of the server. Used instead of the host and port when supplied.
+
+    path (str; optional; default:'/score') - The path of the request.
+
+    OUTPUT/RESULT:
+    The result of this function will be the JSON response of the server.
+    """
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(record).encode() if record is not None else b''
+    writer.write(('POST ' if record is not None else 'GET ').encode() + path.encode() + b' HTTP/1.1\r\n'
+                 b'Content-Type: application/json\r\n'
+                 b'Connection: close\r\n'
+                 b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b'\r\n\r\n', 1)[1])
+
+###############################################################################
+#function to load test server
+###############################################################################
+
+async def load_test(records, concurrency=32, host='127.0.0.1', port=8080, unix_path=None):
+    """
+    DESCRIPTION:
+    This function is to load test the scoring server by sending records from
+    many concurrent clients.
+
+    PARAMETERS:
+    records (list; required) - A list of records. Each record is sent as a
+    separate request.
+
+    concurrency (int; optional; default:32) - The number of concurrent
+    clients.
+
+    host (str; optional; default:'127.0.0.1') - The host of the server.
+
+    port (int; optional; default:8080) - The port of the server.
+
+    unix_path (str; optional; default:Nonetype) - The path of the Unix socket
+    of the server.
+
+    OUTPUT/RESULT:
+    The result of this function will be a dictionary of the requests per
+    second and the p50, p99 and maximum latency in milliseconds.
+    """
+    queue = list(reversed(records))
+    latencies = []
+    async def client():
+        while len(queue) > 0:
+            record = queue.pop()
+            start = time.perf_counter()
+            await request(record, host, port, unix_path)
+            latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for i in range(concurrency)])
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1000 if len(latencies) > 0 else None
+    return {'requests':len(latencies),
+            'requests_per_second':len(latencies) / seconds if seconds > 0 else None,
+            'p50_ms':percentile(0.50),
+            'p99_ms':percentile(0.99),
+            'max_ms':percentile(1.0)}
+
+###############################################################################
+#function to run server
+###############################################################################
+
+def main(args=None):
+    """
+    DESCRIPTION:
+    This function is the command line entry point of the scoring server.
+
+    PARAMETERS:
+    args (list; optional; default:Nonetype) - The command line arguments.
+
+    OUTPUT/RESULT:
+    The result of this function is a scoring server running until it is
+    interrupted.
+    """
+    parser = argparse.ArgumentParser(prog='python -m judge.serve', description='Serve a rule engine saved with save_snapshot or save_object.')
+    parser.add_argument('engine_file', help='rule engine snapshot or pickle file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--unix', default=None, help='path of a unix socket to listen on')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0)
+    parser.add_argument('--reload-interval', type=float, default=None, 
+                        help='seconds between reloading changed decision tables and configurations')
+    parser.add_argument('--max-body', type=int, default=10485760, help='maximum size of a request body in bytes')
+    args = parser.parse_args(args)
+    port = args.port if args.port is not None or args.unix is not None else 8080
+    async def serve():
+        server = scoring_server(args.engine_file, args.workers, args.executor, args.max_batch, args.max_wait_ms / 1000,
+                                args.reload_interval, args.max_body)
+        await server.start(args.host, port, args.unix)
+        print('Serving rule engine ' + args.engine_file + (' on port ' + str(port) if port is not None else '')
+              + (' on ' + args.unix if args.unix is not None else ''))
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
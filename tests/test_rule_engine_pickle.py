@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Round trip checks of pickled rule engines.
+"""
+import contextlib
+import io
+import pickle
+
+from judge import rule_engine
+
+
+def test_round_trip_without_decision_tables(tmp_path):
+    #create_rule_engine saves the rule engine before any decision tables are
+    #imported, so the dictionary of decision tables is still Nonetype
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = rule_engine.create_rule_engine(str(tmp_path), name='round_trip')
+    assert engine._decision_table_dict is None
+    restored = pickle.loads(pickle.dumps(engine))
+    assert restored._decision_table_dict is None
+    assert restored._name == 'round_trip'
+    imported = rule_engine.import_object(str(tmp_path / 'rule_engine_object.pkl'))
+    assert imported._decision_table_dict is None